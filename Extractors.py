@@ -2,305 +2,85 @@
 from bs4 import BeautifulSoup
 import pandas as pd
 import re
+
+
+def _as_soup(html) -> BeautifulSoup:
+    """Accept raw HTML or an already parsed document (parse once, extract many)."""
+    if isinstance(html, BeautifulSoup):
+        return html
+    return BeautifulSoup(html, "html.parser")
+
+
+# Row-based tables (natixis … hsbc, jpm, barclays, swissquote) are picked and
+# read by their rule in app_core.fast_extractors.TABLE_SPECS, shared with the
+# lxml engine; `extract_soup` is provided by app_core.extractors when it
+# loads this module.
+
 # =========================
 # Extractor for Natixis
 # =========================
 def extract_natixis(html: str) -> pd.DataFrame | None:
-    soup = BeautifulSoup(html, "html.parser")
-    tables = soup.find_all("table")
-    if not tables:
-        return None
-
-    target_table = tables[0]  # Natixis: first table only
-    rows = []
-    for tr in target_table.find_all("tr"):
-        cells = [td.get_text(" ", strip=True) for td in tr.find_all(["td", "th"])]
-        if cells:
-            rows.append(cells)
-
-    if len(rows) <= 1:
-        return None
-    
-    rows = normalize_html_rows(rows)
-
-    df = pd.DataFrame(rows[1:], columns=rows[0])
-    df.columns = [c.strip().replace("\xa0", " ") for c in df.columns]
-    return df
+    return extract_soup(html, "natixis")
 
 # =========================
 # Extractor for Citi
 # =========================
 def extract_citi(html: str) -> pd.DataFrame | None:
-    soup = BeautifulSoup(html, "html.parser")
-    tables = soup.find_all("table")
-    if not tables:
-        return None
-
-    target_table = None
-    for t in tables:
-        rows = t.find_all("tr")
-        if len(rows) > 1:  # header + data
-            target_table = t
-            break
-
-    if target_table is None:
-        return None
-
-    rows = []
-    for tr in target_table.find_all("tr"):
-        cells = [td.get_text(" ", strip=True) for td in tr.find_all(["td", "th"])]
-        if cells:
-            rows.append(cells)
-
-    if len(rows) <= 1:
-        return None
-
-    df = pd.DataFrame(rows[1:], columns=rows[0])
-    df.columns = [c.strip().replace("\xa0", " ") for c in df.columns]
-    return df
+    return extract_soup(html, "citi")
 
 # =========================
 # Extractor for BofA
 # =========================
 def extract_bofa(html: str) -> pd.DataFrame | None:
-    soup = BeautifulSoup(html, "html.parser")
-    tables = soup.find_all("table")
-    if not tables:
-        return None
-
-    target_table = None
-    for t in tables:
-        rows = t.find_all("tr")
-        if len(rows) > 1:
-            target_table = t
-            break
-
-    if target_table is None:
-        return None
-
-    rows = []
-    for tr in target_table.find_all("tr"):
-        cells = [td.get_text(" ", strip=True) for td in tr.find_all(["td", "th"])]
-        if cells:
-            rows.append(cells)
-
-    if len(rows) <= 1:
-        return None
-
-    rows = normalize_html_rows(rows)
-
-    df = pd.DataFrame(rows[1:], columns=rows[0])
-    df.columns = [c.strip().replace("\xa0", " ") for c in df.columns]
-    return df
+    return extract_soup(html, "bofa")
 
 # =========================
 # Extractor for SocGen
 # =========================
 
 def extract_socgen(html: str) -> pd.DataFrame | None:
-    soup = BeautifulSoup(html, "html.parser")
-    tables = soup.find_all("table")
-    if not tables:
-        return None
-
-    target_table = None
-    for t in tables:
-        rows = t.find_all("tr")
-        if len(rows) > 1:  # header + data
-            target_table = t
-            break
-
-    if target_table is None:
-        return None
-
-    rows = []
-    for tr in target_table.find_all("tr"):
-        cells = [td.get_text(" ", strip=True) for td in tr.find_all(["td", "th"])]
-        if cells:
-            rows.append(cells)
-
-    if len(rows) <= 1:
-        return None
-
-    rows = normalize_html_rows(rows)
-
-    df = pd.DataFrame(rows[1:], columns=rows[0])
-    df.columns = [c.strip().replace("\xa0", " ") for c in df.columns]
-    return df
+    return extract_soup(html, "socgen")
 
 # =========================
 # Extractor for Goldman Sachs
 # =========================
 
 def extract_gs(html: str) -> pd.DataFrame | None:
-    soup = BeautifulSoup(html, "html.parser")
-    tables = soup.find_all("table")
-    if not tables:
-        return None
-
-    # pick table with Product + Currency headers
-    target_table = None
-    for t in tables:
-        headers = [th.get_text(" ", strip=True) for th in t.find_all("th")]
-        if "Product" in headers and "Currency" in headers:
-            target_table = t
-            break
-    if target_table is None:
-        return None
-
-    rows = []
-    for tr in target_table.find_all("tr"):
-        cells = [td.get_text(" ", strip=True) for td in tr.find_all(["td", "th"])]
-        if cells:
-            rows.append(cells)
-
-    if len(rows) <= 1:
-        return None
-    
-    rows = normalize_html_rows(rows)
-
-    df = pd.DataFrame(rows[1:], columns=rows[0])
-    df.columns = [c.strip().replace("\xa0", " ") for c in df.columns]
-    return df
+    return extract_soup(html, "gs")
 
 # =========================
 # Extractor for BNP Paribas
 # =========================
 def extract_bnp(html: str) -> pd.DataFrame | None:
-
-
-    soup = BeautifulSoup(html, "html.parser")
-    tables = soup.find_all("table")
-    if not tables:
-        return None
-
-    target_table = None
-    for t in tables:
-        rows = t.find_all("tr")
-        if len(rows) > 1:
-            headers = [td.get_text(" ", strip=True) for td in rows[0].find_all(["td", "th"])]
-            if any(any(k in h for k in ["Coupon", "Exit Rate"]) for h in headers):
-                target_table = t
-                break  # stop at first match
-
-    if target_table is None:
-        return None
-
-    rows = []
-    for tr in target_table.find_all("tr"):
-        cells = [td.get_text(" ", strip=True) for td in tr.find_all(["td", "th"])]
-        if cells:
-            rows.append(cells)
-
-    if len(rows) <= 1:
-        return None
-    
-    rows = normalize_html_rows(rows)
-
-    df = pd.DataFrame(rows[1:], columns=rows[0])
-    df.columns = (
-        df.columns
-        .str.strip()
-        .str.replace("\xa0", " ", regex=False)
-        .str.replace(r"\s+", " ", regex=True)
-    )
-
-    return df
-
+    return extract_soup(html, "bnp")
 
 # =========================
 # Extractor for LUKB
 # =========================
 
 def extract_lukb(html: str) -> pd.DataFrame | None:
-    soup = BeautifulSoup(html, "html.parser")
-    tables = soup.find_all("table")
-    if not tables:
-        return None
-
-    # always take the FIRST table
-    target_table = tables[0]
-
-    rows = []
-    for tr in target_table.find_all("tr"):
-        cells = [td.get_text(" ", strip=True).replace("\n", " ") for td in tr.find_all("td")]
-        if cells:
-            rows.append(cells)
-
-    if len(rows) <= 1:
-        return None
-    
-    rows = normalize_html_rows(rows)
-
-    # first row is header
-    df = pd.DataFrame(rows[1:], columns=rows[0])
-    df.columns = [c.strip().replace("\xa0", " ").replace("\n", " ") for c in df.columns]
-    return df
+    return extract_soup(html, "lukb")
 
 # =========================
 # Extractor for JB
 # =========================
 
 def extract_jb(html: str) -> pd.DataFrame | None:
-    soup = BeautifulSoup(html, "html.parser")
-    tables = soup.find_all("table")
-    if not tables:
-        return None
-
-    # JB has one main table
-    target_table = tables[0]
-
-    rows = []
-    for tr in target_table.find_all("tr"):
-        cells = [td.get_text(" ", strip=True).replace("\n", " ") for td in tr.find_all(["td", "th"])]
-        if cells:
-            rows.append(cells)
-
-    if len(rows) <= 1:
-        return None
-    
-    rows = normalize_html_rows(rows)
-
-    df = pd.DataFrame(rows[1:], columns=rows[0])
-    df.columns = [c.strip().replace("\xa0", " ").replace("\n", " ") for c in df.columns]
-
-    return df
+    return extract_soup(html, "jb")
 
 # =========================
 # Extractor for HSBC
 # =========================
 
 def extract_hsbc(html: str) -> pd.DataFrame | None:
-    soup = BeautifulSoup(html, "html.parser")
-    tables = soup.find_all("table")
-    if not tables:
-        return None
-
-    # HSBC has one main table
-    target_table = tables[0]
-
-    rows = []
-    for tr in target_table.find_all("tr"):
-        cells = [td.get_text(" ", strip=True).replace("\n", " ") for td in tr.find_all(["td", "th"])]
-        if cells:
-            rows.append(cells)
-
-    if len(rows) <= 1:
-        return None
-
-    rows = normalize_html_rows(rows)
-
-    df = pd.DataFrame(rows[1:], columns=rows[0])
-    df.columns = [c.strip().replace("\xa0", " ").replace("\n", " ") for c in df.columns]
-    
-    return df
+    return extract_soup(html, "hsbc")
 
 # =========================
 # Extractor for Morgan Stanley
 # =========================
 
 def extract_ms(html: str) -> pd.DataFrame | None:
-    soup = BeautifulSoup(html, "html.parser")
+    soup = _as_soup(html)
     tables = soup.find_all("table")
     if not tables:
         return None
@@ -323,32 +103,15 @@ def extract_ms(html: str) -> pd.DataFrame | None:
 # Extractor for JPM
 # =========================
 
-def extract_jpm(html):
-    soup = BeautifulSoup(html, "html.parser")
-    tables = soup.find_all("table")
-    if not tables:
-        return None
-
-    required_headers = {"product", "tenor (m)", "coupon p.a. (%)"}
-
-    for i, t in enumerate(tables):
-        df_list = pd.read_html(str(t))
-        if not df_list: 
-            continue
-        df = df_list[0]
-        headers = [str(c).strip().lower() for c in df.columns]
-
-        if required_headers.issubset(set(headers)):
-            return df
-
-    return None
+def extract_jpm(html: str) -> pd.DataFrame | None:
+    return extract_soup(html, "jpm")
 
 # =========================
 # Extractor for UBS
 # =========================
 
 def extract_ubs(html: str) -> pd.DataFrame | None:
-    soup = BeautifulSoup(html, "html.parser")
+    soup = _as_soup(html)
     tables = soup.find_all("table")
     if not tables:
         return None
@@ -374,7 +137,7 @@ def extract_ubs(html: str) -> pd.DataFrame | None:
 # =========================
 
 def extract_marex(html: str) -> pd.DataFrame | None:
-    soup = BeautifulSoup(html, "html.parser")
+    soup = _as_soup(html)
     tables = soup.find_all("table")
     if not tables:
         return None
@@ -400,7 +163,7 @@ def extract_marex(html: str) -> pd.DataFrame | None:
 # Extractor for BBVA
 # =========================
 def extract_bbva(html: str) -> pd.DataFrame | None:
-    soup = BeautifulSoup(html, "html.parser")
+    soup = _as_soup(html)
     tables = soup.find_all("table")
     if not tables:
         return None
@@ -432,7 +195,7 @@ def extract_bbva(html: str) -> pd.DataFrame | None:
 # =========================
 
 def extract_cibc(html: str) -> pd.DataFrame | None:
-    soup = BeautifulSoup(html, "html.parser")
+    soup = _as_soup(html)
     tables = soup.find_all("table")
     if not tables:
         return None
@@ -467,54 +230,14 @@ def extract_cibc(html: str) -> pd.DataFrame | None:
 # Barclays Extractor
 # =========================
 def extract_barclays(html: str) -> pd.DataFrame | None:
-    soup = BeautifulSoup(html, "html.parser")
-    tables = soup.find_all("table")
-    if not tables:
-        return None
-
-    target_table = None
-    for t in tables:
-        headers = [td.get_text(" ", strip=True) for td in t.find_all("td")]
-        if any("Product" in h for h in headers):
-            target_table = t
-            break
-    if target_table is None:
-        return None
-
-    rows = []
-    for tr in target_table.find_all("tr"):
-        cells = [td.get_text(" ", strip=True) for td in tr.find_all("td")]
-        if cells:
-            rows.append(cells)
-
-    if len(rows) <= 1:
-        return None
-    
-    rows = normalize_html_rows(rows)
-
-    df = pd.DataFrame(rows[1:], columns=rows[0])
-    df.columns = [c.strip().replace("\xa0", " ") for c in df.columns]
-
-    # ⚠️ Do NOT add issuer here (run_parser does it)
-
-    # Meta info (optional)
-    import re
-    text = soup.get_text(" ", strip=True)
-    trace_match = re.search(r"TraceId:\s*([A-Za-z0-9]+)", text)
-    pricing_ref_match = re.search(r"Pricing Reference IDs:\s*([A-Za-z0-9]+)", text)
-    ref_match = re.search(r"Ref\s*:\s*([^\s]+)", text)
-
-    df["trace_id"] = trace_match.group(1) if trace_match else None
-    df["pricing_ref_id"] = pricing_ref_match.group(1) if pricing_ref_match else None
-    df["ref"] = ref_match.group(1) if ref_match else None
-
-    return df
-
+    return extract_soup(html, "barclays")
 
 # =========================
 # Leonteq Extractor
 # =========================
 def extract_leonteq(path: str) -> pd.DataFrame | None:
+    if isinstance(path, BeautifulSoup):
+        path = str(path)
     try:
         dfs = pd.read_html(path, flavor="lxml")
     except Exception as e:
@@ -542,45 +265,4 @@ def extract_leonteq(path: str) -> pd.DataFrame | None:
 # =========================
 
 def extract_swissquote(html: str) -> pd.DataFrame | None:
-    soup = BeautifulSoup(html, "html.parser")
-    tables = soup.find_all("table")
-    if not tables:
-        return None
-
-    target_table = None
-    for t in tables:
-        headers = [th.get_text(" ", strip=True) for th in t.find_all("th")]
-        if "Product Type" in headers and "Currency" in headers:
-            target_table = t
-            break
-
-    if target_table is None:
-        return None
-
-    # --- Extract rows ---
-    rows = []
-    for tr in target_table.find_all("tr"):
-        cells = [td.get_text(" ", strip=True) for td in tr.find_all(["td", "th"])]
-        if cells:
-            rows.append(cells)
-
-    if len(rows) <= 1:
-        return None
-    
-    rows = normalize_html_rows(rows)
-
-    df = pd.DataFrame(rows[1:], columns=rows[0])
-    df.columns = [c.strip().replace("\xa0", " ") for c in df.columns]
-
-    # --- Extract coupon from first cell (each row) ---
-    coupons = []
-    for val in df.iloc[:, 0]:  # first column
-        m = re.search(r"([\d\.,]+)\s*\(coupon p\.a\.\)", val, flags=re.I)
-        coupons.append(m.group(1).replace(",", ".") if m else None)
-
-    df["Coupon Rate (%)"] = coupons
-
-    return df
-
-
-
+    return extract_soup(html, "swissquote")
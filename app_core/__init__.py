@@ -4,8 +4,31 @@ Core package for parsing HTML pricings and normalizing them for the Streamlit ap
 Modules:
 - html_utils: HTML helpers (table extraction, row normalization)
 - extractors: Issuer-specific table extraction (wraps existing Extractors.py if present)
+- preslice: Regex pre-slicing of bodies to their table regions before parsing
+- tables: Streaming lxml table scanner (no document tree)
+- fast_extractors: Declarative per-issuer table specs, run by the bs4 and lxml engines
+- routing: Sender → issuer routing index (sender_routes.json, reloaded on change)
+- headers: Issuer rename tables declared by the normalizers
+- fingerprint: Issuer detection from table headers (forwarded/unknown senders)
 - normalizers: Issuer-specific normalization + universal cleanup
 - cleanup: Universal cleanup applied to all normalized frames
 - email_integration: Optional Outlook helpers (safe to import without Outlook)
+- sources: Mail sources (Outlook folder, local .eml/.html directory)
+- sync_state: Persisted watermark for incremental Outlook syncs
+- cache: Content-addressed on-disk cache of normalized results
+- diagnostics: Per-message error collection for swallowed exceptions
+- missing: NA sentinel canonicalization shared by cleanup and the normalizers
+- columns: Column kernels evaluated once per distinct value
+- numbers: Numeric parsing kernel shared by cleanup and the normalizers
+
+Importing the package switches pandas to copy-on-write: frames handed from
+extraction to normalization, cleanup and the app share their columns until
+one of them writes, so no stage takes defensive copies. Code working on a
+frame it was given rebinds (`df = df.rename(...)`) instead of mutating it
+in place.
 """
 
+import pandas as pd
+
+pd.set_option("mode.copy_on_write", True)
+
@@ -0,0 +1,234 @@
+"""
+Content-addressed on-disk cache for normalized parse results.
+
+Entries are keyed by sha256(code version, issuer, email HTML) and stored as
+Parquet files (one per entry, `.none` marker for "nothing parsed"). The code
+version is a hash of every source file parsing depends on (read by path,
+imported yet or not), so editing any of them invalidates old entries
+automatically.
+
+Several Streamlit processes may share one cache directory: writes go to a
+temporary file that is atomically renamed into place, hits bump the file
+mtime, and eviction (least recently used first, under `max_bytes`) tolerates
+files vanishing underneath it. Parquet needs pyarrow; without it the cache
+is a no-op. Column labels Parquet cannot name columns with (duplicates,
+non-strings) are written as positional names, the labels themselves kept in
+the file's schema metadata and restored on read.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import uuid
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .diagnostics import record_error
+
+DEFAULT_CACHE_DIR = Path.home() / ".email_pricer_parser" / "parse_cache"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_APP_CORE = Path(__file__).resolve().parent
+_ROOT = _APP_CORE.parent
+
+# Sources that define what a cached result looks like, found by path so the
+# version does not depend on which of them happen to be imported yet
+_VERSIONED_FILES = [
+    _ROOT / "Extractors.py",
+    _ROOT / "Normalizers.py",
+    *(_APP_CORE / f"{name}.py" for name in (
+        "cleanup",
+        "columns",
+        "email_integration",
+        "extractors",
+        "fast_extractors",
+        "fingerprint",
+        "headers",
+        "html_utils",
+        "missing",
+        "normalizers",
+        "numbers",
+        "pipeline",
+        "preslice",
+        "routing",
+        "tables",
+    )),
+    _APP_CORE / "sender_routes.json",
+]
+
+
+_LABELS_KEY = b"email_pricer_parser.columns"
+_POSITIONAL = "__column_{}__"
+
+
+def _write_parquet(df: pd.DataFrame, path: Path) -> None:
+    cols = df.columns
+    if cols.is_unique and all(type(c) is str for c in cols):
+        df.to_parquet(path, index=False)
+        return
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    labels = json.dumps([list(c) if isinstance(c, tuple) else c for c in cols]).encode("utf-8")
+    table = pa.Table.from_pandas(
+        df.set_axis([_POSITIONAL.format(i) for i in range(len(cols))], axis=1), preserve_index=False
+    )
+    pq.write_table(table.replace_schema_metadata({**(table.schema.metadata or {}), _LABELS_KEY: labels}), path)
+
+
+def _restore_labels(df: pd.DataFrame, path: Path) -> pd.DataFrame:
+    if not len(df.columns) or df.columns[0] != _POSITIONAL.format(0):
+        return df
+    import pyarrow.parquet as pq
+
+    labels = json.loads(pq.read_schema(path).metadata[_LABELS_KEY])
+    return df.set_axis([tuple(c) if isinstance(c, list) else c for c in labels], axis=1)
+
+
+def _safe_import_pyarrow():
+    try:
+        import pyarrow  # type: ignore  # noqa: F401
+        return True
+    except Exception:
+        return False
+
+
+@lru_cache(maxsize=1)
+def code_version() -> str:
+    """Hash of the parsing code (module sources, issuer plugins, sender routes)."""
+    h = hashlib.sha256()
+    files = [*_VERSIONED_FILES, *sorted((_APP_CORE / "issuers").glob("*.py"))]
+    for p in files:
+        h.update(p.relative_to(_ROOT).as_posix().encode())
+        try:
+            h.update(p.read_bytes())
+        except OSError:
+            pass
+    return h.hexdigest()[:16]
+
+
+class ParseCache:
+    def __init__(self, root: str | os.PathLike | None = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = Path(root) if root else DEFAULT_CACHE_DIR
+        self.max_bytes = max_bytes
+        self.enabled = _safe_import_pyarrow()
+        self._approx_bytes: Optional[int] = None
+
+    def key(self, html: str, issuer: str | None, *extra: str) -> str:
+        h = hashlib.sha256()
+        for part in (code_version(), issuer or "", *extra):
+            h.update(part.encode("utf-8"))
+            h.update(b"\0")
+        h.update((html or "").encode("utf-8", errors="surrogatepass"))
+        return h.hexdigest()
+
+    def _path(self, key: str, suffix: str) -> Path:
+        return self.root / key[:2] / f"{key}{suffix}"
+
+    def get(self, key: str) -> Tuple[bool, Optional[pd.DataFrame]]:
+        """Return (hit, frame); frame is None for a cached "nothing parsed"."""
+        if not self.enabled:
+            return False, None
+        for suffix in (".parquet", ".none"):
+            p = self._path(key, suffix)
+            try:
+                df = pd.read_parquet(p) if suffix == ".parquet" else None
+                os.utime(p)
+            except (FileNotFoundError, PermissionError):
+                continue
+            except Exception as exc:
+                record_error("cache.get", exc)
+                return False, None
+            if df is not None:
+                # Parquet brings back missing strings as None; keep NaN like a fresh parse
+                for col in df.columns[df.dtypes == object]:
+                    df[col] = df[col].where(df[col].notna(), np.nan)
+                try:
+                    df = _restore_labels(df, p)
+                except Exception as exc:
+                    record_error("cache.get", exc)
+                    return False, None
+            return True, df
+        return False, None
+
+    def put(self, key: str, df: Optional[pd.DataFrame]) -> None:
+        if not self.enabled:
+            return
+        suffix = ".none" if df is None or df.empty else ".parquet"
+        final = self._path(key, suffix)
+        tmp = final.with_name(f"{final.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            final.parent.mkdir(parents=True, exist_ok=True)
+            if suffix == ".none":
+                tmp.write_bytes(b"")
+            else:
+                _write_parquet(df, tmp)
+            size = tmp.stat().st_size
+            os.replace(tmp, final)
+        except Exception as exc:
+            record_error("cache.put", exc)
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+            return
+        if self._approx_bytes is None:
+            self._approx_bytes = self._total_bytes()
+        else:
+            self._approx_bytes += size
+        if self._approx_bytes > self.max_bytes:
+            self.evict()
+
+    def _entries(self):
+        out = []
+        for p in self.root.glob("*/*"):
+            if p.suffix not in (".parquet", ".none"):
+                continue
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            out.append((st.st_mtime, st.st_size, p))
+        return out
+
+    def _total_bytes(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self, target: float = 0.9) -> None:
+        """Delete least recently used entries until below target * max_bytes."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        limit = self.max_bytes * target
+        for _, size, p in entries:
+            if total <= limit:
+                break
+            try:
+                p.unlink()
+            except OSError:
+                pass  # already evicted by another process, or in use
+            total -= size
+        self._approx_bytes = total
+
+    def clear(self) -> None:
+        for _, _, p in self._entries():
+            try:
+                p.unlink()
+            except OSError:
+                pass
+        self._approx_bytes = 0
+
+
+_DEFAULT_CACHE: Optional[ParseCache] = None
+
+
+def get_default_cache() -> ParseCache:
+    global _DEFAULT_CACHE
+    if _DEFAULT_CACHE is None:
+        _DEFAULT_CACHE = ParseCache()
+    return _DEFAULT_CACHE
@@ -1,7 +1,15 @@
 from __future__ import annotations
 
+import re
+from typing import Iterable
+
 import numpy as np
 import pandas as pd
+from pandas.api.types import union_categoricals
+
+from .columns import by_distinct
+from .missing import canonical_na, is_na, na_mask
+from .numbers import MONTHS, parse_numbers
 
 
 REQUIRED_COLS = [
@@ -11,122 +19,224 @@ REQUIRED_COLS = [
     "autocall_barrier", "autocall_frequency", "no_call_period",
 ]
 
-
-def universal_cleanup(df: pd.DataFrame, issuer: str | None = None) -> pd.DataFrame:
-    df = df.copy()
-
-    # Ensure required columns exist
-    for col in REQUIRED_COLS:
-        if col not in df.columns:
-            df[col] = np.nan
-
+# Set per mail by `normalizers.NormalizationBatch`
+PROVENANCE_COLS = ["message_id", "sender"]
+# Kept after REQUIRED_COLS when an extractor (or the batch) provides them
+PASSTHROUGH_COLS = ["table_index"] + PROVENANCE_COLS
+
+
+_NUMERIC_COLS = ["coupon", "strike", "barrier", "reoffer", "autocall_barrier"]
+# Units read by `parse_numbers`; a trailing "m" on a no-call period is dropped
+_NUMBER_UNITS = {**{name: None for name in _NUMERIC_COLS}, "tenor": MONTHS}
+_PERIODS = {"m": 1}
+_UNDERLYING_COLS = ["underlying_1", "underlying_2", "underlying_3", "underlying_4", "underlying_5"]
+
+BARRIER_TYPE = pd.CategoricalDtype(["American", "European"])
+
+# Canonical dtypes, see `apply_schema`. Text repeats a few values per column
+# (categorical, closed where the cleanup maps onto a fixed set), month and
+# period counts are small integers. Quotes stay float64: they are shown
+# rounded to two decimals, and float32 rounds some three-decimal quotes
+# ("5.045", "98.765") the other way.
+SCHEMA = {
+    "issuer": "category", "product": "category", "currency": "category",
+    "coupon": "float64", "tenor": "Int16", "strike": "float64", "barrier": "float64", "reoffer": "float64",
+    **{name: "category" for name in _UNDERLYING_COLS},
+    "barrier_type": BARRIER_TYPE, "autocall_barrier": "float64",
+    "autocall_frequency": "category", "no_call_period": "Int16",
+    "table_index": "Int16", "message_id": "category", "sender": "category",
+}
+_INT16_MAX = np.iinfo(np.int16).max
+
+# Frames up to this many rows (one mail's table) are cleaned value by value:
+# factorizing and the string accessors cost a fixed ~0.5 ms per column,
+# more than a Python loop over a thousand cells
+SMALL_FRAME_ROWS = 1000
+
+_FREQ_MAP = {
+    "1": "Monthly", "3": "Quarterly", "6": "Semi-Annual", "12": "Annual",
+    "quarterly": "Quarterly", "semi-annual": "Semi-Annual",
+    "annual": "Annual", "monthly": "Monthly",
+}
+_BARRIER_TYPES = {
+    "continuous": "American", "am": "American", "amer": "American", "american": "American",
+    "eu": "European", "eur": "European", "european": "European",
+}
+
+
+def _as_text(s: pd.Series) -> pd.Series:
+    """Object columns hold strings or NaN only (an all-missing one becomes float).
+
+    Expects `canonical_na` output: only the present values are stringified.
+    """
+    if s.dtype != object:
+        return s
+    missing = s.isna()
+    return s.astype(str).mask(missing, np.nan).infer_objects()
+
+
+def _barrier_type(s: pd.Series) -> pd.Series:
+    if len(s) == 0:
+        return s
+    st = s.astype(str)
+    kind = by_distinct(st, lambda u: u.str.strip().str.lower().map(_BARRIER_TYPES))
+    return kind.mask(s.isna(), np.nan).infer_objects()
+
+
+def _ticker(u: pd.Series) -> pd.Series:
+    st = u.str.strip()
+    code = st.str.replace(r"(?s)[ _.].*", "", regex=True)
+    return code.mask(na_mask(code), np.nan)
+
+
+def _underlying(s: pd.Series) -> pd.Series:
+    """Bloomberg code without exchange/suffix: "SX5E UW Equity" → "SX5E", "NKY.N" → "NKY"."""
+    if len(s) == 0:
+        return s
+    return by_distinct(s.astype(str), _ticker).mask(s.isna(), np.nan).infer_objects()
+
+
+_TICKER_TAIL = re.compile(r"(?s)[ _.].*")
+
+
+def _canonical_values(s: pd.Series) -> pd.Series:
+    """`canonical_na(s)`, value by value."""
+    if s.dtype != object:
+        return s
+    return pd.Series([np.nan if is_na(v) else v for v in s.tolist()], index=s.index, dtype=object).infer_objects()
+
+
+def _ticker_value(text: str):
+    code = _TICKER_TAIL.sub("", text.strip())
+    return np.nan if is_na(code) else code
+
+
+def _clean_values(name: str, s: pd.Series, bofa: bool) -> pd.Series:
+    """`_clean_column` for small frames: the same values, computed with one Python loop per column."""
+    if name == "no_call_period":  # numbers: the shared kernel
+        return _clean_column(name, s, bofa)
+    s = _canonical_values(s)
+    if name == "autocall_frequency":
+        kernel = lambda v: _FREQ_MAP.get(v.strip(), v.strip())  # noqa: E731
+    elif name == "barrier_type":
+        kernel = lambda v: _BARRIER_TYPES.get(v.strip().lower(), np.nan)  # noqa: E731
+    elif name in _UNDERLYING_COLS:
+        kernel = _ticker_value
+    elif s.dtype != object:  # numbers or all missing: `_as_text` keeps them
+        return s
+    else:
+        kernel = str
+    missing = s.isna().tolist()
+    values = [np.nan if m else kernel(v) for m, v in zip(missing, s.astype(str).tolist())]
+    return pd.Series(values, index=s.index, dtype=object)
+
+
+def _merge_duplicates(df: pd.DataFrame, names) -> pd.DataFrame:
     # If issuer-level normalizers created duplicate canonical columns
     # (e.g., multiple variants renamed to the same final name), merge them
     # into a single Series by taking the first non-null across duplicates.
-    if df.columns.duplicated().any():
-        dup_names = set(df.columns[df.columns.duplicated()])
-        for name in dup_names:
-            cols = [c for c in df.columns if c == name]
-            merged = df.loc[:, cols].bfill(axis=1).iloc[:, 0]
-            df = df.drop(columns=cols)
-            df[name] = merged
-
-    # Blank/NA normalization
-    df = df.replace(r"^\s*$", np.nan, regex=True)
-    df = df.replace({pd.NA: np.nan})
-
-    # Numeric cleanup
-    for col in ["coupon", "strike", "barrier", "reoffer", "autocall_barrier"]:
-        if col in df.columns:
-            s = df[col]
-            # Guard in case `s` is a DataFrame due to unexpected duplicates
-            if isinstance(s, pd.DataFrame):
-                s = s.bfill(axis=1).iloc[:, 0]
-            s = s.astype(str).str.replace("%", "", regex=False)
-            df[col] = pd.to_numeric(s, errors="coerce")
-
-    # Tenor to months
-    def _parse_tenor_to_months(x):
-        if pd.isna(x):
-            return np.nan
-        s = str(x).strip().lower()
-        if s == "" or s in {"nan", "none"}:
-            return np.nan
-        if s.endswith("y"):
-            try:
-                return float(s[:-1].strip()) * 12
-            except Exception:
-                return np.nan
-        if s.endswith("m"):
-            s = s[:-1].strip()
-        try:
-            return float(s)
-        except Exception:
-            return np.nan
-
-    df["tenor"] = pd.to_numeric(df["tenor"].apply(_parse_tenor_to_months), errors="coerce")
-
-    # no_call_period cleanup (issuer-specific exceptions possible)
-    if (issuer or "").lower() != "bofa":
-        df["no_call_period"] = df["no_call_period"].astype(str).str.replace("m", "", case=False, regex=False)
-        df["no_call_period"] = pd.to_numeric(df["no_call_period"], errors="coerce")
-
-    # default no_call_period = 1 if 0 or NaN
-    sel = df["no_call_period"].isna() | (df["no_call_period"] == 0)
-    df.loc[sel, "no_call_period"] = 1
-
-    # Normalize autocall_frequency
-    freq_map = {
-        "1": "Monthly", "3": "Quarterly", "6": "Semi-Annual", "12": "Annual",
-        "quarterly": "Quarterly", "semi-annual": "Semi-Annual",
-        "annual": "Annual", "monthly": "Monthly",
+    dup_names = set(df.columns[df.columns.duplicated()]) & set(names)
+    for name in dup_names:
+        cols = [c for c in df.columns if c == name]
+        merged = df.loc[:, cols].bfill(axis=1).iloc[:, 0]
+        df = df.drop(columns=cols)
+        df[name] = merged
+    return df
+
+
+def _clean_column(name: str, s: pd.Series, bofa: bool) -> pd.Series:
+    s = canonical_na(s)
+    if name == "no_call_period":
+        if not bofa:  # issuer-specific exception: BofA periods are kept as given
+            s = parse_numbers(s, _PERIODS)
+        # default no_call_period = 1 if 0 or NaN
+        s = s.mask(s.isna() | (s == 0), 1)
+        if bofa:
+            s = pd.to_numeric(s, errors="coerce")
+        return s
+    if name == "autocall_frequency":
+        freq = by_distinct(s.astype(str), lambda u: u.str.strip().map(lambda v: _FREQ_MAP.get(v, v)))
+        return _as_text(freq.mask(s.isna(), np.nan))
+    if name == "barrier_type":
+        return _as_text(_barrier_type(s))
+    if name in _UNDERLYING_COLS:
+        return _as_text(_underlying(s))
+    return _as_text(s)
+
+
+def _cast(s: pd.Series, dtype) -> pd.Series:
+    if dtype == "float64":
+        return pd.to_numeric(s, errors="coerce").astype("float64")
+    if dtype == "Int16":
+        # Counts are whole: rounded, out of range values are missing
+        n = pd.to_numeric(s, errors="coerce").astype("float64").round()
+        return n.where(n.abs() <= _INT16_MAX).astype("Int16")
+    if s.dtype != object and not isinstance(s.dtype, pd.CategoricalDtype):
+        s = s.astype(object)  # an all-missing float column gets object categories
+    return s.astype(dtype)
+
+
+def apply_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """`df` with the SCHEMA dtype on each of its canonical columns, other columns as they are.
+
+    Run at the end of `universal_cleanup`; concatenate cleaned frames with
+    `concat_cleaned`, which keeps the types.
+    """
+    cols = {
+        name: s if SCHEMA.get(name) is None or s.dtype == SCHEMA[name] else _cast(s, SCHEMA[name])
+        for name, s in df.items()
     }
-    df["autocall_frequency"] = df["autocall_frequency"].astype(str).str.strip().map(lambda s: freq_map.get(s, s))
-
-    # barrier_type normalization
-    def _norm_barrier_type(x):
-        if pd.isna(x):
-            return np.nan
-        s = str(x).strip().lower()
-        alias = {
-            "continuous": "american", "am": "american", "amer": "american",
-            "american": "american", "eu": "european", "eur": "european",
-            "european": "european",
-        }
-        s = alias.get(s, s)
-        return s.title() if s in {"american", "european"} else np.nan
-
-    df["barrier_type"] = df["barrier_type"].apply(_norm_barrier_type)
-
-    # Clean underlyings safely
-    def _clean_underlying(val):
-        if pd.isna(val):
-            return np.nan
-        s = str(val).strip()
-        if s.lower() in {"nan", "none", "", "<na>"}:
-            return np.nan
-        s = s.split(" ", 1)[0]
-        s = s.split("_", 1)[0]
-        s = s.split(".", 1)[0]
-        s = s.replace(" Equity", "")
-        return s if s else np.nan
-
-    for col in ["underlying_1", "underlying_2", "underlying_3", "underlying_4", "underlying_5"]:
-        if col in df.columns:
-            df[col] = df[col].apply(_clean_underlying)
-
-    # Universal NA homogenization
-    na_like = ["", " ", "nan", "NaN", "none", "None", "NULL", "Null", "<NA>", pd.NA, np.nan, None]
-    df = df.replace(na_like, np.nan)
-
-    # Enforce types
-    for col in df.select_dtypes(include="object").columns:
-        df[col] = df[col].astype(str).replace("nan", np.nan)
-
-    for col in ["coupon", "strike", "barrier", "reoffer", "autocall_barrier", "tenor", "no_call_period"]:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors="coerce")
-
-    # Enforce required order (subset safe)
-    cols = [c for c in REQUIRED_COLS if c in df.columns]
-    return df[cols]
+    return pd.DataFrame(cols, index=df.index)
+
+
+def concat_cleaned(frames: Iterable[pd.DataFrame], ignore_index: bool = False) -> pd.DataFrame:
+    """`pd.concat` of cleaned frames, typed per SCHEMA.
+
+    pandas concatenates categoricals with different categories as object:
+    each categorical column gets the union of the categories first, so the
+    rows are never materialized as Python strings.
+    """
+    frames = list(frames)
+    for name in {c for f in frames for c in f.columns if isinstance(f[c].dtype, pd.CategoricalDtype)}:
+        cols = [f[name] for f in frames if name in f.columns]
+        try:
+            dtype = pd.CategoricalDtype(union_categoricals(cols, ignore_order=True).categories)
+        except TypeError:  # categories of different types: object, re-typed below
+            continue
+        frames = [f.assign(**{name: f[name].astype(dtype)}) if name in f.columns else f for f in frames]
+    return apply_schema(pd.concat(frames, ignore_index=ignore_index))
+
+
+def display_frame(df: pd.DataFrame, na: str = "NA") -> pd.DataFrame:
+    """Object copy for display and export, missing cells `na` (also in categorical and Int16 columns)."""
+    cols = {name: s.astype(object).where(s.notna(), na) for name, s in df.items()}
+    return pd.DataFrame(cols, index=df.index)
+
+
+def universal_cleanup(df: pd.DataFrame, issuer: str | None = None) -> pd.DataFrame:
+    """Canonical columns, in REQUIRED_COLS order (+ PASSTHROUGH_COLS present), typed per SCHEMA.
+
+    Works column by column on the kept columns only: up to SMALL_FRAME_ROWS
+    rows with one Python loop per column, above with pandas string
+    accessors and dict lookups over each column's distinct values; numbers
+    are read by `numbers.parse_numbers`. Both paths return the values of the
+    former row-wise implementation (kept as
+    `benchmarks.bench_cleanup.reference_cleanup`, see tests/test_cleanup.py)
+    on parsed numbers, the dtypes those of SCHEMA.
+    """
+    keep = REQUIRED_COLS + [c for c in PASSTHROUGH_COLS if c in df.columns]
+    if df.columns.duplicated().any():
+        df = _merge_duplicates(df, keep)
+    bofa = (issuer or "").lower() == "bofa"
+    small = len(df) <= SMALL_FRAME_ROWS
+    missing = pd.Series(np.nan, index=df.index)
+    out = {}
+    for name in keep:
+        s = df[name] if name in df.columns else missing
+        if name in _NUMBER_UNITS:  # whole column: the parse is shared with the normalizer's
+            out[name] = parse_numbers(s, _NUMBER_UNITS[name])
+        elif small:
+            out[name] = _clean_values(name, s, bofa)
+        else:
+            out[name] = by_distinct(s, lambda v: _clean_column(name, v, bofa))
+    return apply_schema(pd.DataFrame(out, index=df.index))
@@ -0,0 +1,33 @@
+"""
+Per-message error collection.
+
+Extractors and normalizers deliberately swallow exceptions so one bad email
+never breaks a run. They still call `record_error`, and callers that want to
+know what went wrong wrap the work in `collect_errors()`.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Tuple
+
+
+_ERRORS: ContextVar[Optional[List[Tuple[str, str]]]] = ContextVar("parse_errors", default=None)
+
+
+def record_error(stage: str, exc: BaseException) -> None:
+    sink = _ERRORS.get()
+    if sink is not None:
+        sink.append((stage, f"{type(exc).__name__}: {exc}"))
+
+
+@contextmanager
+def collect_errors() -> Iterator[List[Tuple[str, str]]]:
+    """Collect (stage, message) tuples recorded while the block runs."""
+    sink: List[Tuple[str, str]] = []
+    token = _ERRORS.set(sink)
+    try:
+        yield sink
+    finally:
+        _ERRORS.reset(token)
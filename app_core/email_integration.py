@@ -1,7 +1,18 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Iterable, List, Optional, Tuple
 from bs4 import BeautifulSoup
+from .preslice import strip_noise
+
+
+PR_SMTP_ADDRESS = "http://schemas.microsoft.com/mapi/proptag/0x39FE001E"
+PR_INTERNET_MESSAGE_ID = "http://schemas.microsoft.com/mapi/proptag/0x1035001F"
+PR_MESSAGE_CLASS = "http://schemas.microsoft.com/mapi/proptag/0x001A001F"
+PR_SENDER_SMTP_ADDRESS = "http://schemas.microsoft.com/mapi/proptag/0x5D01001F"
+DASL_DATE_RECEIVED = "urn:schemas:httpmail:datereceived"
+DASL_FROM_EMAIL = "urn:schemas:httpmail:fromemail"
 
 
 def _safe_import_outlook():
@@ -29,16 +40,83 @@ def get_outlook_folder(mailbox: str, path: List[str]):
     return folder
 
 
-def newest_mail_items(folder, n: int = 20):
-    """Return newest n MailItems from an Outlook folder (or empty list)."""
+def _dasl_quote(value: str) -> str:
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def build_mail_filter(
+    since: Optional[datetime] = None,
+    message_class: Optional[str] = "IPM.Note",
+    sender_domains: Optional[Iterable[str]] = None,
+) -> str:
+    """Build a DASL `Items.Restrict` filter (date window, message class, senders).
+
+    `since` is a naive local datetime; DASL compares dates in UTC.
+    `sender_domains` are substrings matched against the sender address.
+    """
+    clauses = []
+    if since is not None:
+        utc = since.astimezone(timezone.utc)
+        clauses.append(f'"{DASL_DATE_RECEIVED}" >= {_dasl_quote(utc.strftime("%m/%d/%Y %I:%M %p"))}')
+    if message_class:
+        clauses.append(f'"{PR_MESSAGE_CLASS}" LIKE {_dasl_quote(message_class + "%")}')
+    domains = [d for d in (sender_domains or []) if d]
+    if domains:
+        ors = " OR ".join(f'"{DASL_FROM_EMAIL}" LIKE {_dasl_quote("%" + d + "%")}' for d in domains)
+        clauses.append(f"({ors})")
+    if not clauses:
+        return ""
+    return "@SQL=" + " AND ".join(clauses)
+
+
+def newest_mail_items(
+    folder,
+    n: int = 20,
+    since: Optional[datetime] = None,
+    restrict: bool = False,
+    sender_domains: Optional[Iterable[str]] = None,
+    oldest_first: bool = False,
+):
+    """Return newest n MailItems from an Outlook folder (or empty list).
+
+    If `since` is given, the walk stops at the first item received before it;
+    items received exactly at `since` are still returned so callers can
+    de-duplicate them against already-seen IDs. With `oldest_first=True` the
+    walk goes the other way: the oldest n items received at or after `since`.
+
+    With `restrict=True` the date window, message class and optional sender
+    substrings are pushed to Outlook via `Items.Restrict`, so only matching
+    items are enumerated and no per-item Class/ReceivedTime checks are needed.
+    Falls back to the client-side walk if Outlook rejects the filter.
+    """
     if folder is None:
         return []
     items = folder.Items
-    items.Sort("[ReceivedTime]", True)
+    filtered = False
+    if restrict:
+        flt = build_mail_filter(since=since, sender_domains=sender_domains)
+        if flt:
+            try:
+                items = items.Restrict(flt)
+                filtered = True
+            except Exception:
+                items = folder.Items
+    items.Sort("[ReceivedTime]", not oldest_first)
     out, itm = [], items.GetFirst()
     while itm and len(out) < n:
+        if filtered:
+            out.append(itm)
+            itm = items.GetNext()
+            continue
         try:
             if getattr(itm, "Class", None) == 43:  # MailItem
+                if since is not None:
+                    received = received_time(itm)
+                    if received is not None and received < since:
+                        if not oldest_first:
+                            break
+                        itm = items.GetNext()
+                        continue
                 out.append(itm)
         except Exception:
             pass
@@ -46,19 +124,161 @@ def newest_mail_items(folder, n: int = 20):
     return out
 
 
+def _naive(dt) -> Optional[datetime]:
+    if dt is None:
+        return None
+    # pywintypes returns a tz-labelled datetime subclass; keep wall-clock only
+    try:
+        return datetime(dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second)
+    except Exception:
+        return None
+
+
+def received_time(msg) -> Optional[datetime]:
+    """ReceivedTime of a MailItem as a naive local datetime (or None)."""
+    try:
+        return _naive(msg.ReceivedTime)
+    except Exception:
+        return None
+
+
+def message_ids(msg) -> Tuple[Optional[str], Optional[str]]:
+    """Return (EntryID, InternetMessageID) for a MailItem, best effort."""
+    try:
+        entry_id = str(msg.EntryID) or None
+    except Exception:
+        entry_id = None
+    try:
+        internet_id = msg.PropertyAccessor.GetProperty(PR_INTERNET_MESSAGE_ID)
+        internet_id = str(internet_id).strip() or None
+    except Exception:
+        internet_id = None
+    return entry_id, internet_id
+
+
+@dataclass
+class MailHeader:
+    """Cheap per-message metadata; the MailItem itself is only opened on demand."""
+
+    entry_id: Optional[str]
+    sender: str
+    subject: str
+    received: Optional[datetime]
+    internet_id: Optional[str] = None
+    item: Any = None  # MailItem when already at hand (item-walk fallback)
+
+
+# Columns read in one Table.GetArray call; order matches the unpacking below
+_HEADER_COLUMNS = [
+    "EntryID",
+    "Subject",
+    "ReceivedTime",
+    PR_SENDER_SMTP_ADDRESS,
+    "SenderEmailAddress",
+    PR_INTERNET_MESSAGE_ID,
+]
+
+
+def mail_headers(
+    folder,
+    n: int = 20,
+    since: Optional[datetime] = None,
+    restrict: bool = False,
+    sender_domains: Optional[Iterable[str]] = None,
+    oldest_first: bool = False,
+) -> List[MailHeader]:
+    """Return sender/subject/received/IDs for the newest n mails in one tabular call.
+
+    With `oldest_first=True` these are the oldest n received at or after
+    `since` instead (incremental syncs read forward from their watermark).
+
+    Uses `Folder.GetTable` + `Table.GetArray`, so sender resolution costs no
+    per-message COM calls. Bodies are loaded later with `load_mail_item` for
+    the rows that survive routing. Folders without `GetTable` (or tables that
+    fail) fall back to `newest_mail_items` and per-item property reads.
+    """
+    if folder is None:
+        return []
+    try:
+        flt = build_mail_filter(
+            since=since,
+            sender_domains=sender_domains if restrict else None,
+        )
+        table = folder.GetTable(flt, 0)  # 0 = olUserItems
+        table.Columns.RemoveAll()
+        for col in _HEADER_COLUMNS:
+            table.Columns.Add(col)
+        table.Sort("[ReceivedTime]", not oldest_first)
+        rows = table.GetArray(n) or ()
+    except Exception:
+        return [
+            header_from_item(m)
+            for m in newest_mail_items(
+                folder, n=n, since=since, restrict=restrict, sender_domains=sender_domains, oldest_first=oldest_first
+            )
+        ]
+
+    out = []
+    for entry_id, subject, received, smtp, sender_addr, internet_id in rows:
+        out.append(MailHeader(
+            entry_id=str(entry_id) if entry_id else None,
+            sender=str(smtp or sender_addr or "").lower(),
+            subject=str(subject or ""),
+            received=_naive(received),
+            internet_id=str(internet_id).strip() if internet_id else None,
+        ))
+    return out
+
+
+def header_from_item(msg) -> MailHeader:
+    entry_id, internet_id = message_ids(msg)
+    try:
+        subject = str(msg.Subject or "")
+    except Exception:
+        subject = ""
+    return MailHeader(
+        entry_id=entry_id,
+        sender=resolve_smtp(msg) or "",
+        subject=subject,
+        received=received_time(msg),
+        internet_id=internet_id,
+        item=msg,
+    )
+
+
+def load_mail_item(folder, header: MailHeader):
+    """Open the MailItem behind a header (no-op if it is already loaded)."""
+    if header.item is None and header.entry_id:
+        header.item = folder.Session.GetItemFromID(header.entry_id, folder.StoreID)
+    return header.item
+
+
 def clean_html_from_mail_item(msg) -> str:
-    html = getattr(msg, "HTMLBody", "") or ""
-    soup = BeautifulSoup(html, "html.parser")
+    return clean_html(getattr(msg, "HTMLBody", "") or "")
+
+
+def clean_html(html: str) -> str:
+    """Drop inline data:/CSS/script noise and quoted history (<blockquote>) from an email body."""
+    return str(parse_email_html(strip_noise(html or "")))
+
+
+def parse_email_html(html) -> BeautifulSoup:
+    """Parse an email body once and drop quoted history (<blockquote>).
+
+    The returned document is handed to the extractors as is, so the body is
+    never serialized back to a string and parsed again.
+    """
+    soup = html if isinstance(html, BeautifulSoup) else BeautifulSoup(html or "", "html.parser")
     for q in soup.select("blockquote"):
         q.decompose()
-    return str(soup)
+    return soup
 
 
 def resolve_smtp(msg) -> Optional[str]:
     """Best-effort sender email address resolution for Outlook MailItem."""
     try:
         pa = msg.PropertyAccessor
-        smtp = pa.GetProperty("http://schemas.microsoft.com/mapi/proptag/0x39FE001E")
+        smtp = pa.GetProperty(PR_SMTP_ADDRESS)
         if smtp:
             return str(smtp).lower()
     except Exception:
@@ -3,18 +3,23 @@ from __future__ import annotations
 import importlib
 from typing import Callable, Optional
 import pandas as pd
-from bs4 import BeautifulSoup
 
-from .html_utils import normalize_html_rows
+from .html_utils import HtmlDoc, normalize_html_rows
+from .diagnostics import record_error
+from .fast_extractors import extract_soup
+from .issuers import get_issuer_registry
+from .routing import get_routing_index
 
 
 def _load_existing_extractors_module():
     """Try to import user-provided Extractors.py (if present)."""
     try:
         mod = importlib.import_module("Extractors")
-        # Patch missing helper, if needed
+        # Patch missing helpers, if needed
         if not hasattr(mod, "normalize_html_rows"):
             setattr(mod, "normalize_html_rows", normalize_html_rows)
+        if not hasattr(mod, "extract_soup"):
+            setattr(mod, "extract_soup", extract_soup)
         return mod
     except Exception:
         return None
@@ -23,83 +28,89 @@ def _load_existing_extractors_module():
 _EXT_MOD = _load_existing_extractors_module()
 
 
-def _call_specific(func_name: str, html: str) -> Optional[pd.DataFrame]:
+def _call_specific(issuer: str, html: HtmlDoc) -> Optional[pd.DataFrame]:
     """Call only the issuer-specific extractor if present; no generic fallback."""
-    if _EXT_MOD and hasattr(_EXT_MOD, func_name):
-        try:
-            return getattr(_EXT_MOD, func_name)(html)
-        except Exception:
-            return None
-    return None
+    func = get_issuer_registry().extractor(issuer)
+    if func is None:
+        return None
+    try:
+        return func(html)
+    except Exception as exc:
+        record_error(f"extract_{issuer}", exc)
+        return None
 
 
 # Individual extractors (issuer names kept consistent with run_parser expectations)
-def extract_natixis(html: str) -> Optional[pd.DataFrame]:
-    return _call_specific("extract_natixis", html)
+def extract_natixis(html: HtmlDoc) -> Optional[pd.DataFrame]:
+    return _call_specific("natixis", html)
 
 
-def extract_citi(html: str) -> Optional[pd.DataFrame]:
-    return _call_specific("extract_citi", html)
+def extract_citi(html: HtmlDoc) -> Optional[pd.DataFrame]:
+    return _call_specific("citi", html)
 
 
-def extract_bofa(html: str) -> Optional[pd.DataFrame]:
-    return _call_specific("extract_bofa", html)
+def extract_bofa(html: HtmlDoc) -> Optional[pd.DataFrame]:
+    return _call_specific("bofa", html)
 
 
-def extract_socgen(html: str) -> Optional[pd.DataFrame]:
-    return _call_specific("extract_socgen", html)
+def extract_socgen(html: HtmlDoc) -> Optional[pd.DataFrame]:
+    return _call_specific("socgen", html)
 
 
-def extract_gs(html: str) -> Optional[pd.DataFrame]:
-    return _call_specific("extract_gs", html)
+def extract_gs(html: HtmlDoc) -> Optional[pd.DataFrame]:
+    return _call_specific("gs", html)
 
 
-def extract_bnp(html: str) -> Optional[pd.DataFrame]:
-    return _call_specific("extract_bnp", html)
+def extract_bnp(html: HtmlDoc) -> Optional[pd.DataFrame]:
+    return _call_specific("bnp", html)
 
 
-def extract_lukb(html: str) -> Optional[pd.DataFrame]:
-    return _call_specific("extract_lukb", html)
+def extract_lukb(html: HtmlDoc) -> Optional[pd.DataFrame]:
+    return _call_specific("lukb", html)
 
 
-def extract_jb(html: str) -> Optional[pd.DataFrame]:
-    return _call_specific("extract_jb", html)
+def extract_jb(html: HtmlDoc) -> Optional[pd.DataFrame]:
+    return _call_specific("jb", html)
 
 
-def extract_hsbc(html: str) -> Optional[pd.DataFrame]:
-    return _call_specific("extract_hsbc", html)
+def extract_hsbc(html: HtmlDoc) -> Optional[pd.DataFrame]:
+    return _call_specific("hsbc", html)
 
 
-def extract_ms(html: str) -> Optional[pd.DataFrame]:
-    return _call_specific("extract_ms", html)
+def extract_ms(html: HtmlDoc) -> Optional[pd.DataFrame]:
+    return _call_specific("ms", html)
 
 
-def extract_ubs(html: str) -> Optional[pd.DataFrame]:
-    return _call_specific("extract_ubs", html)
+def extract_jpm(html: HtmlDoc) -> Optional[pd.DataFrame]:
+    return _call_specific("jpm", html)
 
 
-def extract_marex(html: str) -> Optional[pd.DataFrame]:
-    return _call_specific("extract_marex", html)
+def extract_ubs(html: HtmlDoc) -> Optional[pd.DataFrame]:
+    return _call_specific("ubs", html)
 
 
-def extract_bbva(html: str) -> Optional[pd.DataFrame]:
-    return _call_specific("extract_bbva", html)
+def extract_marex(html: HtmlDoc) -> Optional[pd.DataFrame]:
+    return _call_specific("marex", html)
 
 
-def extract_cibc(html: str) -> Optional[pd.DataFrame]:
-    return _call_specific("extract_cibc", html)
+def extract_bbva(html: HtmlDoc) -> Optional[pd.DataFrame]:
+    return _call_specific("bbva", html)
 
 
-def extract_barclays(html: str) -> Optional[pd.DataFrame]:
-    return _call_specific("extract_barclays", html)
+def extract_cibc(html: HtmlDoc) -> Optional[pd.DataFrame]:
+    return _call_specific("cibc", html)
 
 
-def extract_leonteq(html: str) -> Optional[pd.DataFrame]:
-    return _call_specific("extract_leonteq", html)
+def extract_barclays(html: HtmlDoc) -> Optional[pd.DataFrame]:
+    return _call_specific("barclays", html)
 
 
-def extract_swissquote(html: str) -> Optional[pd.DataFrame]:
-    return _call_specific("extract_swissquote", html)
+def extract_leonteq(html: HtmlDoc) -> Optional[pd.DataFrame]:
+    return _call_specific("leonteq", html)
+
+
+def extract_swissquote(html: HtmlDoc) -> Optional[pd.DataFrame]:
+    return _call_specific("swissquote", html)
 
 
 EXTRACTOR_BY_ISSUER = {
@@ -113,6 +124,7 @@ EXTRACTOR_BY_ISSUER = {
     "jb": extract_jb,
     "hsbc": extract_hsbc,
     "ms": extract_ms,
+    "jpm": extract_jpm,
     "ubs": extract_ubs,
     "marex": extract_marex,
     "bbva": extract_bbva,
@@ -123,35 +135,28 @@ EXTRACTOR_BY_ISSUER = {
 }
 
 
-def extract_for_sender(html: str, sender: str) -> tuple[pd.DataFrame | None, str | None]:
-    s = (sender or "").lower()
-    # Heuristic mapping by domain substring
-    mapping = [
-        ("jpmorgan", "jpm"), ("jpm_autopricer", "jpm"), ("autopricer", "jpm"),
-        ("natixis.com", "natixis"),
-        ("citi.com", "citi"),
-        ("bofa.com", "bofa"), ("bankofamerica.com", "bofa"),
-        ("socgen.com", "socgen"), ("societegenerale.com", "socgen"), ("sgcib.com", "socgen"),
-        ("gs.com", "gs"), ("gs-marquee-space", "gs"),
-        ("bnpparibas.com", "bnp"), ("quotation.emea", "bnp"),
-        ("lukb.ch", "lukb"),
-        ("juliusbaer.com", "jb"), ("jbx.epricer@juliusbaer.com", "jb"),
-        ("hsbc.com", "hsbc"), ("wmssp@hsbc.com", "hsbc"), ("hsbc.fr", "hsbc"),
-        ("morganstanley.com", "ms"), ("morgan.stanley.swiss", "ms"),
-        ("ubs.com", "ubs"), ("ol-rmp-marketaccess-ep@ubs.com", "ubs"),
-        ("marex", "marex"), ("agile@marexfp.com", "marex"),
-        ("bbva.com", "bbva"),
-        ("cibc.com", "cibc"),
-        ("barclays.com", "barclays"),
-        ("leonteq.com", "leonteq"),
-        ("swissquote.ch", "swissquote"), ("swissquote.com", "swissquote"),
-    ]
-
-    for needle, issuer in mapping:
-        if needle in s:
-            func = EXTRACTOR_BY_ISSUER.get(issuer)
-            if func:
-                return func(html), issuer
-            return None, issuer
+def known_sender_needles() -> list[str]:
+    """Sender substrings that route to an issuer with an extractor (deduplicated)."""
+    out: list[str] = []
+    for needle, issuer in get_routing_index().needles():
+        if issuer in EXTRACTOR_BY_ISSUER and needle not in out:
+            out.append(needle)
+    return out
+
+
+def route_sender(sender: str) -> str | None:
+    """Issuer key for a sender address (metadata only, no body needed)."""
+    return get_routing_index().route(sender)
+
+
+def extract_for_issuer(html: HtmlDoc, issuer: str | None) -> pd.DataFrame | None:
+    func = EXTRACTOR_BY_ISSUER.get(issuer or "")
+    return func(html) if func else None
+
+
+def extract_for_sender(html: HtmlDoc, sender: str) -> tuple[pd.DataFrame | None, str | None]:
+    issuer = route_sender(sender)
     # Unknown sender → do not fallback to generic
-    return None, None
+    if issuer is None:
+        return None, None
+    return extract_for_issuer(html, issuer), issuer
@@ -0,0 +1,242 @@
+"""
+Declarative issuer table specs, run by both table engines.
+
+Most issuers' pricing is "the first table / the first table with more than
+one row / the first table whose headers contain X, read from its td(+th)
+cells". That rule is data: a `TableSpec` per issuer. The lxml engine
+evaluates it in the streaming scanner (`tables.scan_tables`), which stops
+parsing as soon as the matching table is complete; the bs4 engine
+(`extract_soup`, which the Extractors.py functions of these issuers call)
+evaluates it on the parsed document (`tables.scan_soup`). Adding an issuer
+with a row-based table is one `TABLE_SPECS` entry.
+
+Issuers whose extractor relies on `pd.read_html` (ms, ubs, marex, bbva,
+cibc, leonteq) have no spec and always use their Extractors.py function.
+
+`extract_tables` is the multi-table mode: every qualifying table of the
+mail instead of the first one, from one pass and with either engine, each
+row tagged with its `table_index`.
+
+Well-formed bodies (Outlook closes its cells and rows) give identical
+frames with both engines, `python -m benchmarks.bench_engines` checks this per
+issuer. Unclosed <td>/<tr> are closed the browser way by lxml, whereas
+html.parser nests them, so broken markup can differ.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from .diagnostics import record_error
+from .email_integration import parse_email_html
+from .html_utils import RowBuilder, HtmlDoc, as_soup
+
+from .tables import HAVE_LXML, ScanResult, Table, scan_soup, scan_tables
+
+
+ENGINES = ("bs4", "lxml")
+DEFAULT_ENGINE = "bs4"
+
+
+@dataclass(frozen=True)
+class TableSpec:
+    """Which table an issuer's pricing lives in and how to read it.
+
+    The selected table is the first one (document order) meeting every set
+    criterion; with none set that is simply the first table.
+    """
+
+    min_rows: int = 0  # at least this many <tr>, empty ones included
+    th_all: Tuple[str, ...] = ()  # each must equal the text of some <th>
+    first_row_any: Tuple[str, ...] = ()  # substring of a first-row cell
+    td_any: Tuple[str, ...] = ()  # substring of some <td>
+    header_all: Tuple[str, ...] = ()  # each must equal a lowercased first-row cell
+    leaf: bool = False  # skip tables wrapping other tables
+    cells: Tuple[str, ...] = ("td", "th")  # cells read into the rows
+    pad_rows: bool = True  # pad/trim rows to the header (else None-fill, reject long rows)
+    newlines: bool = False  # "\n" → " " in cells and headers
+    collapse_ws: bool = False  # collapse whitespace runs in headers
+    post: Optional[Callable[[pd.DataFrame, "ScanResult"], pd.DataFrame]] = None
+    needs_text: bool = False  # `post` reads the whole document text
+
+    @property
+    def discriminating(self) -> bool:
+        """Whether the criteria look at content (not only the first/multi-row rule)."""
+        return bool(self.th_all or self.first_row_any or self.td_any or self.header_all)
+
+    def matches(self, table: "Table") -> bool:
+        if len(table.rows) < self.min_rows:
+            return False
+        if self.leaf and table.has_nested:
+            return False
+        if self.header_all:
+            header = {h.lower() for h in table.header()}
+            if not all(h in header for h in self.header_all):
+                return False
+        if self.th_all:
+            headers = table.texts("th")
+            if not all(h in headers for h in self.th_all):
+                return False
+        if self.first_row_any:
+            if not table.rows:
+                return False
+            first = table.rows[0].texts()
+            if not any(k in h for h in first for k in self.first_row_any):
+                return False
+        if self.td_any:
+            if not any(k in h for h in table.texts("td") for k in self.td_any):
+                return False
+        return True
+
+    def frame(self, table: "Table") -> Optional[pd.DataFrame]:
+        builder = RowBuilder(newlines=self.newlines, collapse_ws=self.collapse_ws, pad=self.pad_rows)
+        for r in table.rows:
+            if r.spanned:
+                cells = r.spans(self.cells)
+                if cells:
+                    builder.add_cells(cells)
+            else:
+                texts = r.texts(self.cells)
+                if texts:
+                    builder.add(texts)
+        return builder.frame()
+
+    def extract(self, table: "Table", scan: "ScanResult") -> Optional[pd.DataFrame]:
+        """The issuer frame of a selected table (`post` applied)."""
+        df = self.frame(table)
+        if df is not None and self.post is not None:
+            df = self.post(df, scan)
+        return df
+
+
+def _barclays_meta(df: pd.DataFrame, scan: "ScanResult") -> pd.DataFrame:
+    text = scan.text or ""
+    trace_match = re.search(r"TraceId:\s*([A-Za-z0-9]+)", text)
+    pricing_ref_match = re.search(r"Pricing Reference IDs:\s*([A-Za-z0-9]+)", text)
+    ref_match = re.search(r"Ref\s*:\s*([^\s]+)", text)
+    df["trace_id"] = trace_match.group(1) if trace_match else None
+    df["pricing_ref_id"] = pricing_ref_match.group(1) if pricing_ref_match else None
+    df["ref"] = ref_match.group(1) if ref_match else None
+    return df
+
+
+def _swissquote_coupon(df: pd.DataFrame, scan: "ScanResult") -> pd.DataFrame:
+    coupons = df.iloc[:, 0].str.extract(r"([\d\.,]+)\s*\(coupon p\.a\.\)", flags=re.I, expand=False)
+    df["Coupon Rate (%)"] = coupons.str.replace(",", ".", regex=False).astype(object).where(coupons.notna(), None)
+    return df
+
+
+_MULTIROW = TableSpec(min_rows=2)
+
+TABLE_SPECS: Dict[str, TableSpec] = {
+    "natixis": TableSpec(),
+    "citi": TableSpec(min_rows=2, pad_rows=False),
+    "bofa": _MULTIROW,
+    "socgen": _MULTIROW,
+    "gs": TableSpec(th_all=("Product", "Currency")),
+    "bnp": TableSpec(min_rows=2, first_row_any=("Coupon", "Exit Rate"), collapse_ws=True),
+    "lukb": TableSpec(cells=("td",), newlines=True),
+    "jb": TableSpec(newlines=True),
+    "hsbc": TableSpec(newlines=True),
+    "barclays": TableSpec(td_any=("Product",), cells=("td",), post=_barclays_meta, needs_text=True),
+    "jpm": TableSpec(header_all=("product", "tenor (m)", "coupon p.a. (%)"), leaf=True, min_rows=2),
+    "swissquote": TableSpec(th_all=("Product Type", "Currency"), post=_swissquote_coupon),
+}
+
+
+def has_fast_path(issuer: str | None, engine: str = DEFAULT_ENGINE) -> bool:
+    return engine == "lxml" and HAVE_LXML and (issuer or "") in TABLE_SPECS
+
+
+def extract_fast(html: str, issuer: str, clean: bool = False) -> Optional[pd.DataFrame]:
+    """Extract `issuer`'s table from raw HTML with the lxml engine.
+
+    `clean=True` skips <blockquote> content while streaming, which matches
+    running the bs4 extractor on `parse_email_html(html)`.
+    """
+    spec = TABLE_SPECS[issuer]
+    try:
+        scan = scan_tables(html, skip_blockquotes=clean, collect_text=spec.needs_text, select=spec.matches)
+        if scan.match is None:
+            return None
+        return spec.extract(scan.match, scan)
+    except Exception as exc:
+        record_error(f"extract_{issuer}[lxml]", exc)
+        return None
+
+
+def extract_soup(html: HtmlDoc, issuer: str) -> Optional[pd.DataFrame]:
+    """Extract `issuer`'s table with the bs4 engine (raw HTML or a parsed document).
+
+    Errors propagate: the caller (`extractors._call_specific`) records them.
+    """
+    spec = TABLE_SPECS[issuer]
+    scan = scan_soup(as_soup(html), collect_text=spec.needs_text, select=spec.matches)
+    if scan.match is None:
+        return None
+    return spec.extract(scan.match, scan)
+
+
+def _qualifying(spec: TableSpec, matches: List["Table"]) -> List["Table"]:
+    """Tables kept in multi-table mode.
+
+    Tables inside an already kept table are skipped (their rows are part of
+    it, as in single-table mode). Without content criteria ("first table",
+    "first table with rows") later tables must repeat the first one's header
+    layout, so layout tables do not come along.
+    """
+    kept: List["Table"] = []
+    for t in matches:
+        p, inside = t.parent, False
+        while p is not None and not inside:
+            inside = p in kept
+            p = p.parent
+        if inside:
+            continue
+        if kept and not spec.discriminating and t.header() != kept[0].header():
+            continue
+        kept.append(t)
+    return kept
+
+
+def _concat_tagged(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    try:
+        return pd.concat(frames, ignore_index=True)
+    except pd.errors.InvalidIndexError:
+        # Duplicate header names only align between identical layouts
+        first = frames[0].columns
+        return pd.concat([f for f in frames if f.columns.equals(first)], ignore_index=True)
+
+
+def extract_tables(
+    html: HtmlDoc, issuer: str, clean: bool = False, engine: str = DEFAULT_ENGINE
+) -> Optional[pd.DataFrame]:
+    """Every table of the mail qualifying for `issuer`, stacked, with a `table_index` column.
+
+    Uses the lxml scanner for raw HTML with `engine="lxml"`, otherwise the
+    BeautifulSoup document (parsed once here if a string is passed).
+    """
+    spec = TABLE_SPECS[issuer]
+    try:
+        if has_fast_path(issuer, engine) and isinstance(html, str):
+            scan = scan_tables(
+                html, skip_blockquotes=clean, collect_text=spec.needs_text, select=spec.matches, multi=True
+            )
+        else:
+            soup = parse_email_html(html) if clean else as_soup(html)
+            scan = scan_soup(soup, collect_text=spec.needs_text, select=spec.matches, multi=True)
+        frames = []
+        for t in _qualifying(spec, scan.matches):
+            df = spec.extract(t, scan)
+            if df is None:
+                continue
+            df["table_index"] = t.index
+            frames.append(df)
+        return _concat_tagged(frames) if frames else None
+    except Exception as exc:
+        record_error(f"extract_{issuer}[tables]", exc)
+        return None
@@ -0,0 +1,121 @@
+"""
+Issuer detection from table headers, for mail whose sender does not route.
+
+Forwarded pricings arrive from a colleague's address, so sender routing
+cannot place them. The headers of the pricing table still identify the
+issuer: every header variant known to an issuer's normalizer (see
+`headers.rename_tables`) goes into an inverted index, built once, mapping
+the folded header text to the issuers that rename from it.
+
+A table's score for an issuer sums the weights of its headers that issuer
+knows, each header weighing 1 / (number of issuers knowing it), so rare
+headers decide and common ones ("Currency") barely count. The confidence
+is the margin over the runner-up (1 - second / best score), scaled down
+while the lead is less than `EVIDENCE` (about two issuer-specific headers)
+and by the fraction of the table's headers that are known at all. A layout
+shared by several issuers' pricers thus scores 0 rather than a coin flip.
+Header layouts are memoized, a recurring layout costs one dict lookup.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from .headers import fold_header, rename_tables
+from .html_utils import HtmlDoc, as_soup
+
+from .tables import HAVE_LXML, scan_tables
+
+
+# Below this confidence a detection is reported but not used for routing
+MIN_CONFIDENCE = 0.4
+# Tables need at least this many known headers to be considered
+MIN_KNOWN = 3
+# Score lead over the runner-up needed for full confidence
+EVIDENCE = 2.0
+
+
+@dataclass(frozen=True)
+class Detection:
+    issuer: Optional[str]
+    confidence: float
+    table_index: Optional[int] = None
+
+
+_NONE = Detection(None, 0.0)
+
+
+@lru_cache(maxsize=1)
+def header_index() -> Dict[str, FrozenSet[str]]:
+    """Folded header text → issuers whose normalizer knows it."""
+    index: Dict[str, set] = {}
+    for issuer, table in rename_tables().items():
+        for variant in table:
+            index.setdefault(fold_header(variant), set()).add(issuer)
+    return {h: frozenset(issuers) for h, issuers in index.items()}
+
+
+@lru_cache(maxsize=4096)
+def score_headers(headers: Tuple[str, ...]) -> Tuple[Optional[str], float]:
+    """(issuer, confidence) for one table's folded header tuple."""
+    index = header_index()
+    cells = {h for h in headers if h}
+    if not cells:
+        return None, 0.0
+    scores: Dict[str, float] = {}
+    known = 0
+    for h in cells:
+        issuers = index.get(h)
+        if not issuers:
+            continue
+        known += 1
+        w = 1.0 / len(issuers)
+        for issuer in issuers:
+            scores[issuer] = scores.get(issuer, 0.0) + w
+    if known < MIN_KNOWN:
+        return None, 0.0
+    ranked = sorted(scores.items(), key=lambda kv: (-kv[1], kv[0]))
+    best, top = ranked[0]
+    second = ranked[1][1] if len(ranked) > 1 else 0.0
+    lead = top - second
+    return best, round((lead / top) * min(1.0, lead / EVIDENCE) * known / len(cells), 3)
+
+
+def _candidate_headers(rows: List[List[str]]) -> Iterable[Tuple[str, ...]]:
+    if not rows:
+        return
+    # Row-oriented tables carry headers in the first row, transposed ones
+    # (field names down the first column, e.g. BBVA) in the first column
+    yield tuple(fold_header(c) for c in rows[0])
+    if len(rows) > 1:
+        yield tuple(fold_header(r[0]) for r in rows if r)
+
+
+def _table_rows(html: HtmlDoc, clean: bool) -> List[List[List[str]]]:
+    if HAVE_LXML and isinstance(html, str):
+        return [t.row_texts() for t in scan_tables(html, skip_blockquotes=clean).tables]
+    soup = as_soup(html)
+    out = []
+    for t in soup.find_all("table"):
+        if clean and t.find_parent("blockquote") is not None:
+            continue
+        rows = []
+        for tr in t.find_all("tr"):
+            cells = [td.get_text(" ", strip=True) for td in tr.find_all(["td", "th"])]
+            if cells:
+                rows.append(cells)
+        out.append(rows)
+    return out
+
+
+def detect_issuer(html: HtmlDoc, clean: bool = True) -> Detection:
+    """Best issuer over all tables of a body, with its confidence (0..1)."""
+    best = _NONE
+    for i, rows in enumerate(_table_rows(html, clean)):
+        for headers in _candidate_headers(rows):
+            issuer, conf = score_headers(headers)
+            if issuer is not None and conf > best.confidence:
+                best = Detection(issuer, conf, i)
+    return best
@@ -0,0 +1,149 @@
+"""
+Issuer column rename tables, shared by the normalizers and the components that reuse them.
+
+Each normalizer module declares its header variants as module-level
+constants: Normalizers.py one table per issuer, listed by issuer in its
+`HEADER_TABLES`, and a local issuer module (app_core/issuers/<issuer>.py)
+its table as `HEADERS`. A table is either `{canonical: [variants]}` (best
+variant first) or `{variant: canonical}`. `rename_tables()` merges them so
+other components can reuse the same knowledge without duplicating it.
+
+`header_renames(issuer, df.columns)` is what the normalizers rename with:
+the tables compiled once into a `HeaderRegistry` keyed by (issuer, folded
+header), so "Coupon p.a.\xa0(%)" and "coupon  p.a. (%)" resolve like the
+declared variant, and the rename map of each distinct header tuple memoized
+(a recurring layout costs one dict lookup).
+"""
+
+from __future__ import annotations
+
+import pkgutil
+import re
+from functools import lru_cache
+from importlib import import_module
+from typing import Dict, Hashable, Iterable, Mapping, Optional, Tuple
+
+from . import issuers
+
+
+_WS = re.compile(r"\s+")
+# Distinct (issuer, header tuple) rename maps kept by the registry
+_MEMO_LIMIT = 4096
+
+# variant → (canonical, rank of the variant among its canonical's variants)
+_Entries = Dict[str, Tuple[str, int]]
+
+
+def fold_header(text) -> str:
+    """Comparison form of a header: nbsp → space, whitespace collapsed, casefolded."""
+    return _WS.sub(" ", str(text).replace("\xa0", " ")).strip().casefold()
+
+
+def _entries(table: Mapping) -> _Entries:
+    out: _Entries = {}
+    for pos, (key, value) in enumerate(table.items()):
+        if isinstance(value, (list, tuple)):  # canonical → variants
+            for rank, variant in enumerate(value):
+                out[str(variant)] = (str(key), rank)
+        elif isinstance(value, str):  # variant → canonical
+            out[str(key)] = (value, pos)
+        else:
+            raise TypeError(f"header table entry {key!r}: expected a canonical name or a list of variants")
+    return out
+
+
+def _local_tables() -> Dict[str, Mapping]:
+    out = {}
+    for info in pkgutil.iter_modules(issuers.__path__):
+        if info.name.startswith("_"):
+            continue
+        table = getattr(import_module(f"{issuers.__name__}.{info.name}"), "HEADERS", None)
+        if table:
+            out[info.name] = table
+    return out
+
+
+@lru_cache(maxsize=1)
+def _source_tables() -> Dict[str, _Entries]:
+    try:
+        legacy = import_module("Normalizers")
+    except ImportError:
+        legacy = None
+    tables = {issuer: _entries(table) for issuer, table in getattr(legacy, "HEADER_TABLES", {}).items()}
+    for issuer, table in _local_tables().items():
+        merged = tables.setdefault(issuer, {})
+        for variant, entry in _entries(table).items():
+            merged.setdefault(variant, entry)
+    return tables
+
+
+def rename_tables() -> Dict[str, Dict[str, str]]:
+    """{issuer: {header variant: canonical column}} over legacy and local normalizers.
+
+    Legacy Normalizers.py wins on conflicting variants, like in `normalize`.
+    """
+    return {
+        issuer: {variant: canonical for variant, (canonical, _) in table.items()}
+        for issuer, table in _source_tables().items()
+    }
+
+
+class HeaderRegistry:
+    """(issuer, folded header) → canonical column, with per-layout memoization."""
+
+    def __init__(self, tables: Dict[str, _Entries]):
+        self._tables: Dict[str, _Entries] = {}
+        for issuer, table in tables.items():
+            folded = self._tables.setdefault(issuer, {})
+            for variant, entry in table.items():
+                folded.setdefault(fold_header(variant), entry)
+        self._memo: Dict[Tuple[str, Tuple[Hashable, ...], bool], Dict[Hashable, str]] = {}
+
+    def issuers(self) -> Tuple[str, ...]:
+        return tuple(sorted(self._tables))
+
+    def canonical(self, issuer: str, header) -> Optional[str]:
+        entry = self._tables.get(issuer, {}).get(fold_header(header))
+        return entry[0] if entry else None
+
+    def renames(self, issuer: str, columns: Iterable[Hashable], first_only: bool = True) -> Dict[Hashable, str]:
+        """{column: canonical} for the known columns of a frame.
+
+        With `first_only` a canonical column is taken from the best ranked
+        variant present only (first in the normalizer's variant list), the
+        other variants keep their header; otherwise every known variant is
+        renamed. The returned dict is shared between calls: do not modify.
+        """
+        key = (issuer, tuple(columns), first_only)
+        hit = self._memo.get(key)
+        if hit is not None:
+            return hit
+        table = self._tables.get(issuer, {})
+        out: Dict[Hashable, str] = {}
+        best: Dict[str, Tuple[int, Hashable]] = {}
+        for col in key[1]:
+            entry = table.get(fold_header(col))
+            if entry is None:
+                continue
+            canonical, rank = entry
+            if not first_only:
+                out[col] = canonical
+            elif canonical not in best or rank < best[canonical][0]:
+                best[canonical] = (rank, col)
+        for canonical, (_, col) in best.items():
+            out[col] = canonical
+        if len(self._memo) >= _MEMO_LIMIT:
+            self._memo.clear()
+        self._memo[key] = out
+        return out
+
+
+@lru_cache(maxsize=1)
+def header_registry() -> HeaderRegistry:
+    """The registry over all normalizer tables, compiled on first use."""
+    return HeaderRegistry(_source_tables())
+
+
+def header_renames(issuer: str, columns: Iterable[Hashable], first_only: bool = True) -> Dict[Hashable, str]:
+    """Rename map for `df.rename(columns=...)`; see `HeaderRegistry.renames`."""
+    return header_registry().renames(issuer, columns, first_only)
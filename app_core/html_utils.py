@@ -1,8 +1,24 @@
 from __future__ import annotations
 
+import re
+
 from bs4 import BeautifulSoup
 import pandas as pd
-from typing import List
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+
+# Extractors accept raw HTML or a document parsed once upstream
+HtmlDoc = Union[str, BeautifulSoup]
+# A cell as (text, colspan, rowspan), or just its text when it spans nothing
+CellSpec = Union[str, Tuple[str, int, int]]
+
+_WS = re.compile(r"\s+")
+
+
+def as_soup(html: HtmlDoc) -> BeautifulSoup:
+    if isinstance(html, BeautifulSoup):
+        return html
+    return BeautifulSoup(html or "", "html.parser")
 
 
 def normalize_html_rows(rows: List[List[str]]) -> List[List[str]]:
@@ -25,6 +41,139 @@ def normalize_html_rows(rows: List[List[str]]) -> List[List[str]]:
     return normalized
 
 
+def cell_span(attrs, name: str) -> int:
+    """colspan/rowspan attribute value, 1 when missing or malformed."""
+    try:
+        return max(1, int(str(attrs.get(name, "1")).strip() or 1))
+    except ValueError:
+        return 1
+
+
+class RowBuilder:
+    """Table rows → DataFrame in one pass: spans, ragged rows and header clean-up.
+
+    The first row added is the header and fixes the width; its cells are
+    cleaned once (strip, nbsp → space, optionally newlines and whitespace
+    runs) when the frame is built. Spans follow `pd.read_html`: a colspan
+    repeats the cell in every column it covers, a rowspan carries it into
+    the rows below. Header cells spanning several rows make the rows they
+    cover header rows too, their texts joined per column ("Underlying 1").
+
+    Short rows are padded with "" and long ones trimmed (`pad=True`, what
+    `normalize_html_rows` did), or padded with None and rejected with a
+    ValueError (`pad=False`, like `pd.DataFrame(rows, columns=header)`).
+    Rows that already fit are kept as passed, so the frame is built from
+    them by a single DataFrame construction.
+    """
+
+    __slots__ = ("newlines", "collapse_ws", "pad", "_names", "_rows", "_carry", "_header_left")
+
+    def __init__(self, newlines: bool = False, collapse_ws: bool = False, pad: bool = True):
+        self.newlines = newlines
+        self.collapse_ws = collapse_ws
+        self.pad = pad
+        self._names: Optional[List[str]] = None
+        self._rows: List[list] = []
+        self._carry: Dict[int, Tuple[str, int]] = {}  # column → (text, rows left)
+        self._header_left = 0
+
+    def _place(self, cells: Iterable[CellSpec], width: int, put) -> int:
+        """Lay one row's cells out over columns 0..width-1; returns the columns filled."""
+        carry = self._carry
+        col = 0
+        for cell in cells:
+            while col in carry:
+                col = self._take_carried(col, put)
+            if type(cell) is str:
+                text, colspan, rowspan = cell, 1, 1
+            else:
+                text, colspan, rowspan = cell
+            if self.newlines:
+                text = text.replace("\n", " ")
+            for _ in range(colspan):
+                if col >= width:
+                    if not self.pad:
+                        raise ValueError(f"{width} columns passed, row has more cells")
+                    return col
+                put(col, text)
+                if rowspan > 1:
+                    carry[col] = (text, rowspan - 1)
+                col += 1
+        while col < width and col in carry:
+            col = self._take_carried(col, put)
+        return col
+
+    def _take_carried(self, col: int, put) -> int:
+        text, left = self._carry[col]
+        if left > 1:
+            self._carry[col] = (text, left - 1)
+        else:
+            del self._carry[col]
+        put(col, text)
+        return col + 1
+
+    def add(self, texts: List[str]) -> None:
+        """Append one row of unspanned cell texts (the first row is the header)."""
+        if self._names is None or self._header_left or self._carry:
+            self.add_cells(texts)
+            return
+        width = len(self._names)
+        row = [t.replace("\n", " ") for t in texts] if self.newlines else texts
+        n = len(row)
+        if n < width:
+            row = row + ["" if self.pad else None] * (width - n)
+        elif n > width:
+            if not self.pad:
+                raise ValueError(f"{width} columns passed, row has {n} cells")
+            row = row[:width]
+        self._rows.append(row)
+
+    def add_cells(self, cells: List[CellSpec]) -> None:
+        """Append one row whose cells may span columns or rows."""
+        if self._names is None:
+            names: List[str] = []
+            # The header defines the width: place without a limit
+            self._place(cells, 1 << 30, lambda col, text: names.append(text))
+            self._names = names
+            self._header_left = max((left for _, left in self._carry.values()), default=0)
+            return
+        names = self._names
+        width = len(names)
+        if self._header_left:
+            self._header_left -= 1
+
+            def put_header(col, text):
+                if text and text != names[col]:
+                    names[col] = f"{names[col]} {text}" if names[col] else text
+
+            self._place(cells, width, put_header)
+            return
+        row = ["" if self.pad else None] * width
+        filled = self._place(cells, width, row.__setitem__)
+        for col in range(filled, width):
+            if col in self._carry:
+                self._take_carried(col, row.__setitem__)
+        self._rows.append(row)
+
+    def header(self) -> List[str]:
+        """Cleaned column names."""
+        out = []
+        for name in self._names or []:
+            name = name.strip().replace("\xa0", " ")
+            if self.newlines:
+                name = name.replace("\n", " ")
+            if self.collapse_ws:
+                name = _WS.sub(" ", name)
+            out.append(name)
+        return out
+
+    def frame(self) -> Optional[pd.DataFrame]:
+        """The data rows as a DataFrame; None without any."""
+        if not self._rows:
+            return None
+        return pd.DataFrame(self._rows, columns=self.header())
+
+
 def soup_tables_to_rows(soup: BeautifulSoup) -> list[list[list[str]]]:
     """Return list of tables, each table is list of rows, each row is list of cell texts."""
     tables = []
@@ -39,12 +188,12 @@ def soup_tables_to_rows(soup: BeautifulSoup) -> list[list[list[str]]]:
     return tables
 
 
-def extract_best_table(html: str) -> pd.DataFrame | None:
+def extract_best_table(html: HtmlDoc) -> pd.DataFrame | None:
     """
     Heuristic: pick the table with the largest number of data rows (> 1).
     Normalize row lengths before building DataFrame.
     """
-    soup = BeautifulSoup(html or "", "html.parser")
+    soup = as_soup(html)
     all_tables = soup_tables_to_rows(soup)
     if not all_tables:
         return None
@@ -3,40 +3,133 @@ Issuer-specific normalizers live here.
 
 Add a module per issuer (e.g., `citi.py`, `bofa.py`) exporting a
 `normalize(df: pandas.DataFrame) -> pandas.DataFrame` function that maps
-issuer-specific columns into the canonical schema. The pipeline will then
-run the universal cleanup for final harmonization.
+issuer-specific columns into the canonical schema, and optionally its
+header variants as a module-level `HEADERS` table (see `app_core.headers`).
+The pipeline will then run the universal cleanup for final harmonization.
 
 Discovery order when normalizing:
-- app_core.issuers.<issuer>.normalize (preferred, local to this app)
-- top-level Normalizers.normalize_<issuer> (backward compatibility)
+- top-level Normalizers.normalize_<issuer> (richer mappings today)
+- app_core.issuers.<issuer>.normalize (local to this app)
 
-Where <issuer> is the lowercase issuer key detected by extractors
-(`app_core.extractors.EXTRACTOR_BY_ISSUER`).
+and likewise for extraction (Extractors.extract_<issuer>, then an optional
+`extract(html)` in the issuer module). Where <issuer> is the lowercase
+issuer key detected by extractors (`app_core.extractors.EXTRACTOR_BY_ISSUER`).
+
+`get_issuer_registry()` resolves each (kind, issuer) once: modules are
+imported on first use, misses are cached too (an issuer without a local
+module is not re-imported per frame), `invalidate()` reloads the code and
+drops the resolutions, and `report()` shows which implementation serves
+each issuer.
 """
 
 from __future__ import annotations
 
-from importlib import import_module
-from typing import Callable, Optional
+import importlib
+import sys
+from types import ModuleType
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+import pandas as pd
+
+
+LEGACY = "legacy"
+LOCAL = "local"
+
+# kind → (legacy module, legacy function template, local function name)
+_KINDS = {
+    "extractor": ("Extractors", "extract_{}", "extract"),
+    "normalizer": ("Normalizers", "normalize_{}", "normalize"),
+}
+
+
+class IssuerRegistry:
+    """Extractor/normalizer callables per issuer, resolved lazily and once."""
+
+    def __init__(self) -> None:
+        self._resolved: Dict[Tuple[str, str], Tuple[Optional[Callable], Optional[str]]] = {}
+        self._modules: Dict[str, Optional[ModuleType]] = {}
+
+    def _module(self, name: str) -> Optional[ModuleType]:
+        if name not in self._modules:
+            try:
+                self._modules[name] = importlib.import_module(name)
+            except Exception:
+                self._modules[name] = None
+        return self._modules[name]
+
+    def resolve(self, kind: str, issuer: str) -> Tuple[Optional[Callable], Optional[str]]:
+        """(callable, LEGACY | LOCAL) for `issuer`, (None, None) if neither exists."""
+        key = (kind, issuer)
+        hit = self._resolved.get(key)
+        if hit is not None:
+            return hit
+        legacy_name, legacy_attr, local_attr = _KINDS[kind]
+        func, source = None, None
+        if issuer.isidentifier():
+            mod = self._module(legacy_name)
+            cand = getattr(mod, legacy_attr.format(issuer), None) if mod is not None else None
+            if callable(cand):
+                func, source = cand, LEGACY
+            else:
+                mod = self._module(f"{__name__}.{issuer}")
+                cand = getattr(mod, local_attr, None) if mod is not None else None
+                if callable(cand):
+                    func, source = cand, LOCAL
+        self._resolved[key] = (func, source)
+        return func, source
+
+    def normalizer(self, issuer: str) -> Optional[Callable]:
+        return self.resolve("normalizer", issuer)[0]
+
+    def extractor(self, issuer: str) -> Optional[Callable]:
+        return self.resolve("extractor", issuer)[0]
+
+    def _reload(self, name: str) -> None:
+        # In place, so attributes set on the module from outside (the helpers
+        # app_core.extractors gives Extractors.py) survive; a module that no
+        # longer imports resolves to nothing, as on a first import
+        self._modules.pop(name, None)
+        mod = sys.modules.get(name)
+        if mod is None:
+            return
+        try:
+            importlib.reload(mod)
+        except Exception:
+            self._modules[name] = None
+
+    def invalidate(self, issuer: Optional[str] = None) -> None:
+        """Reload edited or added code and forget the resolutions using it.
+
+        With an issuer, its local module; without, the legacy modules (shared
+        by every issuer) and every local module too.
+        """
+        importlib.invalidate_caches()
+        if issuer is None:
+            names = [legacy for legacy, _, _ in _KINDS.values()] + [
+                name for name in sys.modules if name.startswith(f"{__name__}.")
+            ]
+            self._resolved.clear()
+        else:
+            names = [f"{__name__}.{issuer}"]
+            for kind in _KINDS:
+                self._resolved.pop((kind, issuer), None)
+        for name in names:
+            self._reload(name)
 
+    def report(self, issuers: Iterable[str]) -> pd.DataFrame:
+        """Which implementation (legacy/local/None) serves each issuer's extraction and normalization."""
+        rows = [
+            {"issuer": i, "extractor": self.resolve("extractor", i)[1], "normalizer": self.resolve("normalizer", i)[1]}
+            for i in issuers
+        ]
+        return pd.DataFrame(rows, columns=["issuer", "extractor", "normalizer"])
 
-def load_local_normalizer(issuer: str) -> Optional[Callable]:
-    """Return `normalize(df)` from `app_core.issuers.<issuer>` if available."""
-    mod_name = f"app_core.issuers.{issuer}"
-    try:
-        mod = import_module(mod_name)
-    except Exception:
-        return None
-    func = getattr(mod, "normalize", None)
-    return func if callable(func) else None
 
+_DEFAULT_REGISTRY: Optional[IssuerRegistry] = None
 
-def load_legacy_normalizer(issuer: str) -> Optional[Callable]:
-    """Return `normalize_<issuer>(df)` from top-level Normalizers.py if available."""
-    try:
-        legacy = import_module("Normalizers")
-    except Exception:
-        return None
-    func = getattr(legacy, f"normalize_{issuer}", None)
-    return func if callable(func) else None
 
+def get_issuer_registry() -> IssuerRegistry:
+    global _DEFAULT_REGISTRY
+    if _DEFAULT_REGISTRY is None:
+        _DEFAULT_REGISTRY = IssuerRegistry()
+    return _DEFAULT_REGISTRY
@@ -3,11 +3,20 @@ from __future__ import annotations
 import pandas as pd
 
 
+# Optional header variant → canonical column table (or canonical → [variants],
+# best first), renamed with `header_renames("<issuer>", df.columns)`; see
+# app_core.headers
+HEADERS = {}
+
+
 def normalize(df: pd.DataFrame) -> pd.DataFrame:
-    """Template normalizer: copy df and map issuer-specific columns to canonical ones.
+    """Template normalizer: map issuer-specific columns to canonical ones.
 
     Implement issuer-specific renames/parsing only here, keep logic minimal.
     Universal cleanup will run afterwards to harmonize types and fill gaps.
+    pandas runs with copy-on-write (see `app_core`), so no defensive copy is
+    needed: rebind (`df = df.rename(...)`) instead of renaming or setting
+    `df.columns` in place, which would change the caller's frame.
     """
-    return df.copy()
+    return df
 
@@ -4,5 +4,5 @@ import pandas as pd
 
 
 def normalize(df: pd.DataFrame) -> pd.DataFrame:
-    return df.copy()
+    return df
 
@@ -0,0 +1,54 @@
+"""
+One NA canonicalization kernel for cleanup and the issuer normalizers.
+
+Extracted cells spell "missing" many ways: None, NaN, pd.NA, empty or
+whitespace-only strings, and the text left behind by an earlier
+`astype(str)` ("nan", "None", "<NA>", "NULL"). `canonical_na` turns every one
+of them into NaN in a single pass over a column:
+
+- the decision is made once per distinct value (factorized codes), so a
+  100k-row column of a few dozen values costs one hash pass
+- real values are left as they are (no str round trip), only an object
+  column's dtype is re-inferred once its blanks are gone, so numbers with
+  blanks come out as float
+- a column without anything to replace is returned as is, not copied
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+
+# Compared against str cells stripped and casefolded
+NA_STRINGS = frozenset({"", "nan", "none", "null", "<na>"})
+
+
+def _is_na_string(value) -> bool:
+    return isinstance(value, str) and value.strip().casefold() in NA_STRINGS
+
+
+def is_na(value) -> bool:
+    """`na_mask` of a single cell."""
+    return _is_na_string(value) or (not isinstance(value, str) and bool(pd.isna(value)))
+
+
+def na_mask(s: pd.Series) -> np.ndarray:
+    """Boolean array: which cells of `s` are missing or an NA sentinel string."""
+    if s.dtype != object:
+        return s.isna().to_numpy()
+    # Strings never compare equal to numbers, so factorizing keeps them apart
+    codes, uniques = pd.factorize(s)
+    sentinel = np.fromiter((_is_na_string(u) for u in uniques), dtype=bool, count=len(uniques))
+    # code -1 (None/NaN/pd.NA) picks the appended True
+    return np.append(sentinel, True)[codes]
+
+
+def canonical_na(s: pd.Series) -> pd.Series:
+    """`s` with every missing cell as NaN and an object dtype re-inferred."""
+    if s.dtype != object:
+        return s
+    mask = na_mask(s)
+    if mask.any():
+        s = s.mask(mask, np.nan)
+    return s.infer_objects()
@@ -1,55 +1,126 @@
 from __future__ import annotations
 
-import importlib
-from typing import Optional
+from typing import Dict, Hashable, List, Optional, Tuple
+import numpy as np
 import pandas as pd
 
-from .cleanup import universal_cleanup
-from .issuers import load_local_normalizer, load_legacy_normalizer
+from .cleanup import PROVENANCE_COLS, concat_cleaned, universal_cleanup
+from .issuers import get_issuer_registry
+from .diagnostics import collect_errors, record_error
+from .numbers import number_pass
 
 
-def _load_existing_normalizers_module():
-    try:
-        return importlib.import_module("Normalizers")
-    except Exception:
+def normalize_issuer(df: pd.DataFrame, issuer: str | None) -> Optional[pd.DataFrame]:
+    """Issuer-specific half of `normalize`: normalizer + issuer column, no cleanup."""
+    issuer_key = (issuer or "").lower()
+    if not issuer_key:
         return None
 
+    func = get_issuer_registry().normalizer(issuer_key)
+    if not func:
+        return None
 
-_NORM_MOD = _load_existing_normalizers_module()
-
+    try:
+        with number_pass():
+            cand = func(df)
+    except Exception as exc:
+        record_error(f"normalize_{issuer_key}", exc)
+        return None
+    if cand is None:
+        record_error(f"normalize_{issuer_key}", TypeError("normalizer returned None"))
+        return None
 
-# Removed generic normalizer: enforce issuer-specific normalizers only
+    # `assign` leaves `cand` (possibly the caller's frame) alone; copy-on-write
+    # shares the other columns instead of copying them
+    if "issuer" not in cand.columns:
+        return cand.assign(issuer=issuer if issuer is not None else pd.NA)
+    if issuer is not None:
+        return cand.assign(issuer=cand["issuer"].fillna(issuer))
+    return cand
 
 
 def normalize(df: pd.DataFrame, issuer: str | None) -> Optional[pd.DataFrame]:
     """Run issuer-specific normalizer then universal cleanup.
 
-    Resolution order:
-    1) app_core.issuers.<issuer>.normalize(df)
-    2) Normalizers.normalize_<issuer>(df)  [legacy/toplevel]
+    Resolution order (resolved once per issuer, see `IssuerRegistry`):
+    1) Normalizers.normalize_<issuer>(df)  [legacy/toplevel, richer mappings today]
+    2) app_core.issuers.<issuer>.normalize(df)  [local, customizable stubs]
     """
-    issuer_key = (issuer or "").lower()
-    if not issuer_key:
-        return None
+    # One number pass: the cleanup reuses the normalizer's parses of the raw columns
+    with number_pass():
+        dfn = normalize_issuer(df, issuer)
+        if dfn is None:
+            return None
+        return universal_cleanup(dfn, (issuer or "").lower())
 
-    # Prefer legacy Normalizers.py first (has richer mappings today)
-    func = load_legacy_normalizer(issuer_key)
-    if not func:
-        # Fallback to local per-issuer module (customizable stubs)
-        func = load_local_normalizer(issuer_key)
-    if not func:
-        return None
 
-    try:
-        cand = func(df)
-    except Exception:
-        return None
+class NormalizationBatch:
+    """Raw extractor frames of a whole fetch, normalized per issuer.
+
+    Frames are grouped by (issuer, header layout). Each group is
+    concatenated, tagged with the PROVENANCE_COLS of its mails and goes
+    through the issuer normalizer once; the groups of an issuer are then
+    cleaned up together (the cleanup is issuer dependent), so the fixed
+    cost of both is paid per issuer instead of per email. Every frame gets
+    a slice of one running row index, which the normalizers and the
+    cleanup keep, so `run` returns the rows in the order they were added.
+
+    A group whose normalizer fails is retried mail by mail, so a bad email
+    only loses its own rows and its errors stay attributed to it.
+    """
+
+    def __init__(self) -> None:
+        self._groups: Dict[Tuple[str, Tuple[Hashable, ...]], List[tuple]] = {}
+        self._rows = 0
+
+    def __len__(self) -> int:
+        return sum(len(g) for g in self._groups.values())
+
+    def add(self, df: pd.DataFrame, issuer: str, message_id=None, sender: Optional[str] = None) -> None:
+        """Queue the raw frame of one mail."""
+        df = df.set_axis(pd.RangeIndex(self._rows, self._rows + len(df)), axis=0)
+        self._rows += len(df)
+        self._groups.setdefault((issuer, tuple(df.columns)), []).append((message_id, sender, df))
+
+    @staticmethod
+    def _tagged(mails: List[tuple]) -> pd.DataFrame:
+        # `add` gave every frame its own index, so tagging never touches the caller's frame
+        raw = pd.concat([df for _, _, df in mails]) if len(mails) > 1 else mails[0][2]
+        sizes = [len(df) for _, _, df in mails]
+        for pos, col in enumerate(PROVENANCE_COLS):
+            raw[col] = np.repeat(np.array([m[pos] for m in mails], dtype=object), sizes)
+        return raw
 
-    dfn = cand.copy()
-    if "issuer" not in dfn.columns:
-        dfn["issuer"] = issuer if issuer is not None else pd.NA
-    else:
-        if issuer is not None:
-            dfn["issuer"] = dfn["issuer"].fillna(issuer)
+    def run(self) -> Tuple[Optional[pd.DataFrame], List[tuple]]:
+        """(rows of all mails or None, failures).
 
-    return universal_cleanup(dfn, issuer_key)
+        `failures` lists (message_id, sender, issuer, errors) for every mail
+        that produced no rows, `errors` being (stage, message) tuples.
+        """
+        normalized: Dict[str, List[pd.DataFrame]] = {}
+        failures: List[tuple] = []
+        for (issuer, _), mails in self._groups.items():
+            with collect_errors() as errs:
+                dfn = normalize_issuer(self._tagged(mails), issuer)
+            if dfn is not None:
+                normalized.setdefault(issuer, []).append(dfn)
+                continue
+            if len(mails) == 1:
+                failures.append((mails[0][0], mails[0][1], issuer, errs))
+                continue
+            for mail in mails:
+                with collect_errors() as errs:
+                    dfn = normalize_issuer(self._tagged([mail]), issuer)
+                if dfn is None:
+                    failures.append((mail[0], mail[1], issuer, errs))
+                else:
+                    normalized.setdefault(issuer, []).append(dfn)
+        frames = [
+            universal_cleanup(pd.concat(parts) if len(parts) > 1 else parts[0], issuer.lower())
+            for issuer, parts in normalized.items()
+        ]
+        self._groups.clear()
+        if not frames:
+            return None, failures
+        out = concat_cleaned(frames) if len(frames) > 1 else frames[0]
+        return out.sort_index(kind="stable").reset_index(drop=True), failures
@@ -0,0 +1,170 @@
+"""
+One numeric parsing kernel for cleanup and the issuer normalizers.
+
+Quoted numbers come in many spellings: "12.5%", " 9 % ", "12,5", "1,250.00",
+"1.250,00", "1'250", "−3" (unicode minus), "12M"/"1Y" for periods.
+`parse_numbers` reads all of them in one pass over a column:
+
+- the parse runs once per distinct value (see `columns.by_distinct`)
+- "%", blanks and apostrophes are dropped, unicode minus signs read as "-"
+- a single comma without a dot is a decimal comma ("12,5" → 12.5);
+  grouped thousands are recognised either way round ("1,250.5",
+  "1.250,5", "1,250,000", "1.250.000")
+- unit suffixes are optional and per call (`MONTHS`: "1y" → 12, "18m" → 18)
+- whatever `to_numeric` cannot read goes through `float()` ("1_000",
+  other digits), anything else is NaN
+
+Inside `number_pass()` a column is parsed once: the result is kept by
+column identity (its buffer, not its labels) until the pass ends, so a
+normalizer and the cleanup after it reading the same raw column share the
+work.
+"""
+
+from __future__ import annotations
+
+import re
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import infer_dtype, is_bool_dtype, is_numeric_dtype
+
+from .columns import by_distinct
+
+
+# Period suffixes, matched case-insensitively at the end of a value
+MONTHS = {"y": 12, "m": 1}
+
+_DROP = {ord(c): None for c in "% \t\u00a0\u2009\u202f'\u2019"}
+_MINUS = {ord(c): "-" for c in "\u2212\u2012\u2013\ufe63\uff0d"}
+_TRANSLATE = {**_DROP, **_MINUS}
+
+# Thousands groups: at least two, or one followed by the other separator
+_COMMA_GROUPS = re.compile(r"[+-]?\d{1,3}(?:(?:,\d{3}){2,}(?:\.\d*)?|,\d{3}\.\d*)")
+_DOT_GROUPS = re.compile(r"[+-]?\d{1,3}(?:(?:\.\d{3}){2,}(?:,\d*)?|\.\d{3},\d*)")
+
+_PASS: ContextVar[Optional[Dict[tuple, Tuple[pd.Series, pd.Series]]]] = ContextVar("number_pass", default=None)
+
+
+def _py_float(x) -> float:
+    try:
+        return float(x)
+    except Exception:
+        return np.nan
+
+
+_ODD = re.compile(r",|\..*\.")
+
+
+def _separators(v: str) -> str:
+    if _COMMA_GROUPS.fullmatch(v):
+        return v.replace(",", "")
+    if _DOT_GROUPS.fullmatch(v):
+        return v.replace(".", "").replace(",", ".")
+    if v.count(",") == 1 and "." not in v:
+        return v.replace(",", ".")
+    return v
+
+
+def _spelled(values: list, units: Optional[Mapping[str, float]]) -> np.ndarray:
+    """Numbers of the values a plain `to_numeric` does not read."""
+    values = [v.translate(_TRANSLATE) for v in values]
+    factor = None
+    if units:
+        factor = np.ones(len(values), dtype=np.asarray(list(units.values())).dtype)
+        for i, v in enumerate(values):
+            lower = v.lower()
+            for suffix, scale in units.items():
+                if factor[i] == 1 and lower.endswith(suffix):
+                    factor[i] = scale
+                    v = v[: -len(suffix)]
+            values[i] = v
+    st = np.array([_separators(v) if _ODD.search(v) else v for v in values], dtype=object)
+    num = pd.to_numeric(st, errors="coerce")
+    left = pd.isna(num) & (st != "")
+    if left.any():
+        num = num.astype("float64")
+        num[left] = [_py_float(v) for v in st[left]]
+    if factor is not None and (factor != 1).any():
+        num = num * factor
+    return num
+
+
+def _fill(num: np.ndarray, left: np.ndarray, rest: np.ndarray) -> np.ndarray:
+    if num.dtype != rest.dtype:
+        num = num.astype(np.result_type(num.dtype, rest.dtype))
+    num[left] = rest
+    return num
+
+
+def _parse(u: pd.Series, units: Optional[Mapping[str, float]]) -> pd.Series:
+    # Each step reads what the one before left: most quotes are plain
+    # numbers once their percent sign is gone, most others decimal commas.
+    # Missing cells (the NaN `by_distinct` appends) read as blanks. The
+    # steps loop over plain lists: on a mail's few values the string
+    # accessors' per-call cost would outweigh the work
+    st = np.array([v.replace("%", "") if isinstance(v, str) else "" for v in u.tolist()], dtype=object)
+    num = pd.to_numeric(st, errors="coerce")
+    left = pd.isna(num) & (st != "")
+    if left.any():
+        st = st[left]
+        # A comma swap that reads had a single comma and no dot: a decimal comma
+        rest = pd.to_numeric(np.array([v.replace(",", ".") for v in st], dtype=object), errors="coerce")
+        still = pd.isna(rest)
+        if still.any():
+            rest = _fill(rest, still, _spelled(st[still].tolist(), units))
+        num = _fill(num, left, rest)
+    return pd.Series(num, index=u.index, name=u.name)
+
+
+def _identity(s: pd.Series, units: Optional[Mapping[str, float]]) -> tuple:
+    arr = s.to_numpy()
+    return (
+        arr.__array_interface__["data"][0], arr.strides, len(arr), arr.dtype.str,
+        tuple(units.items()) if units else None,
+    )
+
+
+def parse_numbers(s: pd.Series, units: Optional[Mapping[str, float]] = None) -> pd.Series:
+    """Numbers of `s` (float64, or int64 when every value is a whole number); unreadable cells are NaN.
+
+    `units` maps lower-case suffixes to factors, e.g. `MONTHS`. Numeric
+    columns are returned as they are.
+    """
+    if is_numeric_dtype(s.dtype) and not is_bool_dtype(s.dtype):
+        return s
+    if s.dtype != object:
+        s = s.astype(object)
+
+    cache = _PASS.get()
+    key = None
+    if cache is not None:
+        key = _identity(s, units)
+        hit = cache.get(key)
+        if hit is not None:
+            return hit[1].set_axis(s.index).rename(s.name)
+
+    if len(s) == 0:
+        out = pd.to_numeric(s, errors="coerce")
+    else:
+        text = s if infer_dtype(s, skipna=True) in ("string", "empty") else s.astype(str)
+        out = by_distinct(text, lambda u: _parse(u, units)).rename(s.name)
+    if key is not None:
+        # Holding `s` keeps its buffer (and so the key) from being reused
+        cache[key] = (s, out)
+    return out
+
+
+@contextmanager
+def number_pass() -> Iterator[None]:
+    """Parse each column once while the block runs (nested passes share the outer one)."""
+    if _PASS.get() is not None:
+        yield
+        return
+    token = _PASS.set({})
+    try:
+        yield
+    finally:
+        _PASS.reset(token)
@@ -1,27 +1,380 @@
 from __future__ import annotations
 
+import os
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from typing import Optional, List
 import pandas as pd
 
-from .extractors import extract_for_sender
-from .normalizers import normalize
-from .email_integration import (
-    get_outlook_folder,
-    newest_mail_items,
-    clean_html_from_mail_item,
-    resolve_smtp,
+from .extractors import (
+    EXTRACTOR_BY_ISSUER,
+    extract_for_issuer,
+    extract_for_sender,
+    known_sender_needles,
+    route_sender,
 )
+from .normalizers import NormalizationBatch, normalize
+from .cleanup import concat_cleaned
+from .issuers import get_issuer_registry
+from .email_integration import get_outlook_folder, parse_email_html
+from .html_utils import HtmlDoc, as_soup
+from .sources import MailSource, OutlookSource, DirectorySource
+from .sync_state import SyncState
+from .cache import ParseCache, get_default_cache
+from .diagnostics import collect_errors, record_error
+from .preslice import DEFAULT_BUDGET, Preslicer
+from .fingerprint import MIN_CONFIDENCE, detect_issuer
+from .fast_extractors import DEFAULT_ENGINE, ENGINES, TABLE_SPECS, extract_fast, extract_tables, has_fast_path
 
 
-def run_on_html(html: str, sender: Optional[str] = None, issuer_override: Optional[str] = None) -> pd.DataFrame | None:
-    df_raw, detected_issuer = extract_for_sender(html, sender or "")
-    issuer = issuer_override or detected_issuer
+def run_on_html(
+    html: HtmlDoc,
+    sender: Optional[str] = None,
+    issuer_override: Optional[str] = None,
+    cache: Optional[ParseCache] = None,
+    clean: bool = False,
+    engine: str = DEFAULT_ENGINE,
+    multi_table: bool = False,
+    raw: bool = False,
+) -> pd.DataFrame | None:
+    """Extract + normalize one email body.
+
+    `html` may be a string or an already parsed document; a string is parsed
+    exactly once and that document goes to the extractor. With `clean=True`
+    quoted history is dropped from the parsed document first (see
+    `parse_email_html`). With a `cache`, results are looked up by (HTML,
+    issuer, code version) before anything is parsed and stored afterwards.
+
+    With `engine="lxml"` issuers that have a streaming extractor (see
+    `fast_extractors`) skip the BeautifulSoup parse entirely; the others
+    fall back to the bs4 engine.
+
+    With `multi_table=True` every qualifying table of the body is extracted
+    (see `fast_extractors.extract_tables`) and normalized as one frame, rows
+    tagged with their `table_index`. Issuers without a table spec extract
+    their single table as usual.
+
+    With `raw=True` the extractor frame is returned as is, without
+    normalization (see `NormalizationBatch`).
+    """
+    if cache is not None:
+        issuer = issuer_override or route_sender(sender or "")
+        extra = ("clean" if clean else "", engine) + (("multi",) if multi_table else ()) + (("raw",) if raw else ())
+        key = cache.key(html if isinstance(html, str) else str(html), issuer, *extra)
+        hit, df = cache.get(key)
+        if hit:
+            return df
+        df = run_on_html(
+            html, sender, issuer_override=issuer, clean=clean, engine=engine, multi_table=multi_table, raw=raw
+        )
+        cache.put(key, df)
+        return df
+    finish = (lambda df, _: df) if raw else normalize
+    if multi_table:
+        issuer = issuer_override or route_sender(sender or "")
+        if issuer in TABLE_SPECS:
+            df_raw = extract_tables(html, issuer, clean=clean, engine=engine)
+            if df_raw is None or df_raw.empty:
+                return None
+            return finish(df_raw, issuer)
+    if isinstance(html, str):
+        issuer = issuer_override or route_sender(sender or "")
+        if has_fast_path(issuer, engine):
+            df_raw = extract_fast(html, issuer, clean=clean)
+            if df_raw is None or df_raw.empty:
+                return None
+            return finish(df_raw, issuer)
+    doc = parse_email_html(html) if clean else as_soup(html)
+    if issuer_override:
+        df_raw, issuer = extract_for_issuer(doc, issuer_override), issuer_override
+    else:
+        df_raw, issuer = extract_for_sender(doc, sender or "")
     if df_raw is None or df_raw.empty:
         return None
-    return normalize(df_raw, issuer)
+    return finish(df_raw, issuer)
+
+
+def default_workers() -> int:
+    """Parse workers to use by default (1 in frozen builds without a spawn guard)."""
+    if getattr(sys, "frozen", False):
+        return 1
+    return max(1, min(4, (os.cpu_count() or 2) - 1))
+
+
+def _parse_payload(payload: tuple) -> tuple:
+    """Process-pool worker: (sender, issuer, raw html, cache, options) → (frame, errors, detection).
+
+    `options` are the `run_on_html` keyword arguments (engine, multi_table, raw).
+
+    An issuer of None means the sender did not route: the issuer is then
+    detected from the table headers (see `fingerprint`) and the body is only
+    parsed if the detection is confident enough.
+    """
+    sender, issuer, html, cache, options = payload
+    detection = None
+    with collect_errors() as errors:
+        try:
+            if issuer is None:
+                detection = detect_issuer(html)
+                if detection.issuer is None or detection.confidence < MIN_CONFIDENCE:
+                    return None, errors, detection
+                issuer = detection.issuer
+            df = run_on_html(html, sender, issuer_override=issuer, cache=cache, clean=True, **options)
+        except Exception as exc:
+            record_error("parse", exc)
+            df = None
+    return df, errors, detection
+
+
+_POOL: Optional[ProcessPoolExecutor] = None
+_POOL_SIZE = 0
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    global _POOL, _POOL_SIZE
+    if _POOL is None or _POOL_SIZE != workers:
+        if _POOL is not None:
+            _POOL.shutdown(wait=False, cancel_futures=True)
+        _POOL, _POOL_SIZE = ProcessPoolExecutor(max_workers=workers), workers
+    return _POOL
+
+
+def _drop_pool() -> None:
+    global _POOL, _POOL_SIZE
+    if _POOL is not None:
+        _POOL.shutdown(wait=False, cancel_futures=True)
+    _POOL, _POOL_SIZE = None, 0
+
+
+def _parse_batch(payloads: List[tuple], workers: int) -> List[tuple]:
+    """Parse payloads in order; process pool when workers > 1, else serially.
+
+    Falls back to serial parsing if the pool cannot be started or breaks.
+    """
+    if workers > 1 and len(payloads) > 1:
+        try:
+            pool = _get_pool(workers)
+            chunk = max(1, len(payloads) // (workers * 4))
+            return list(pool.map(_parse_payload, payloads, chunksize=chunk))
+        except Exception:
+            _drop_pool()
+    return [_parse_payload(p) for p in payloads]
+
+
+def run_source(
+    source: MailSource,
+    issuer_override: Optional[str] = None,
+    report: Optional[dict] = None,
+    cache: Optional[ParseCache] = None,
+    workers: int = 1,
+    batch_size: int = 64,
+    engine: str = DEFAULT_ENGINE,
+    detect_unknown: bool = False,
+    preslicer: Optional[Preslicer] = None,
+    multi_table: bool = False,
+    batch_normalize: bool = False,
+) -> pd.DataFrame | None:
+    """Run any mail source through routing → extract → normalize.
+
+    Two stages: messages are routed and their bodies fetched on the calling
+    thread (the COM/STA thread for Outlook), then the plain (sender, html)
+    payloads are parsed, in a process pool when `workers` > 1. Payloads are
+    handed over in batches of `batch_size`, results keep message order.
+    `engine` selects the table engine ("bs4" or "lxml") and `multi_table`
+    extracts every qualifying table per mail (see `run_on_html`).
+
+    With `batch_normalize=True` the workers only extract: the raw frames of
+    the whole fetch are normalized once per issuer and header layout at the
+    end (see `NormalizationBatch`) and the rows carry their `message_id`
+    and `sender`.
+
+    Senders are routed to an issuer from the message metadata first; only
+    messages routed to an issuer with an extractor have their body loaded.
+    With `detect_unknown=True` messages from senders that do not route (e.g.
+    forwarded by a colleague) are loaded too and their issuer is detected
+    from the table headers.
+
+    Each message is reported back with `source.processed` only once it has
+    been parsed (and batch-normalized), so a message whose body could not be
+    fetched or parsed is not marked seen by an incremental sync.
+
+    With a `preslicer` each body is reduced to its table regions (see
+    `preslice`) right after loading, before it is cached or sent to a worker.
 
+    If a `report` dict is passed, `report["skipped"]` receives a Counter of
+    skipped messages per reason, `report["errors"]` a list of per-message
+    errors (message, sender, issuer, stage, error), `report["detected"]`
+    the header detections (message, sender, issuer, confidence, used),
+    `report["preslice"]` the bytes saved per issuer and
+    `report["implementations"]` whether the legacy or local extractor and
+    normalizer served each issuer parsed.
+    """
+    skipped: Counter = Counter()
+    errors: List[dict] = []
+    detected: List[dict] = []
+    if report is not None:
+        report["skipped"] = skipped
+        report["errors"] = errors
+        report["detected"] = detected
+    frames = []
+    pending = NormalizationBatch() if batch_normalize else None
+    seen: set = set()
+    options = {"engine": engine, "multi_table": multi_table, "raw": batch_normalize}
 
-def run_outlook(mailbox: str, folder_path: List[str], max_emails: int = 40) -> pd.DataFrame | None:
+    # (message, ok) outcomes, reported to the source once final: after each
+    # parse batch, or after the batch normalization at the end
+    outcomes: List[tuple] = []
+
+    def settle() -> None:
+        for msg, ok in outcomes:
+            source.processed(msg, ok)
+        outcomes.clear()
+
+    def flush(batch: List[tuple], metas: List[tuple]) -> None:
+        for (msg, issuer), (df, errs, det) in zip(metas, _parse_batch(batch, workers)):
+            msg_id, sender = msg.message_id, msg.sender
+            outcomes.append((msg, not any(stage == "parse" for stage, _ in errs)))
+            if det is not None:
+                used = det.issuer is not None and det.confidence >= MIN_CONFIDENCE
+                detected.append({
+                    "message": msg_id, "sender": sender, "issuer": det.issuer,
+                    "confidence": det.confidence, "used": used,
+                })
+                if not used:
+                    skipped["unknown sender"] += 1
+                    continue
+                issuer = det.issuer
+            seen.add(issuer)
+            for stage, err in errs:
+                errors.append({"message": msg_id, "sender": sender, "issuer": issuer, "stage": stage, "error": err})
+            if df is not None and not df.empty:
+                if pending is not None:
+                    pending.add(df, issuer, msg_id, sender)
+                else:
+                    frames.append(df)
+            else:
+                skipped[f"no rows parsed ({issuer})"] += 1
+
+    batch: List[tuple] = []
+    metas: List[tuple] = []
+    try:
+        for msg in source.messages():
+            issuer = issuer_override or route_sender(msg.sender)
+            if issuer is None and not detect_unknown:
+                skipped["unknown sender"] += 1
+                outcomes.append((msg, True))
+                continue
+            if issuer is not None and issuer not in EXTRACTOR_BY_ISSUER:
+                skipped[f"no extractor ({issuer})"] += 1
+                outcomes.append((msg, True))
+                continue
+            try:
+                html = msg.html
+            except Exception as exc:
+                skipped["body not loaded"] += 1
+                outcomes.append((msg, False))
+                errors.append({
+                    "message": msg.message_id, "sender": msg.sender, "issuer": issuer,
+                    "stage": "fetch", "error": f"{type(exc).__name__}: {exc}",
+                })
+                continue
+            if preslicer is not None:
+                html = preslicer.slice(html, issuer)
+            batch.append((msg.sender, issuer, html, cache, options))
+            metas.append((msg, issuer))
+            if len(batch) >= batch_size:
+                flush(batch, metas)
+                batch, metas = [], []
+                if pending is None:
+                    settle()
+        if batch:
+            flush(batch, metas)
+            batch, metas = [], []
+        if pending is not None:
+            df, failures = pending.run()
+            if df is not None:
+                frames.append(df)
+            for msg_id, sender, issuer, errs in failures:
+                for stage, err in errs:
+                    errors.append({"message": msg_id, "sender": sender, "issuer": issuer, "stage": stage, "error": err})
+                skipped[f"no rows parsed ({issuer})"] += 1
+        settle()
+    finally:
+        # Anything not settled when the run stops is fetched again next time
+        for msg, _ in outcomes + metas:
+            source.processed(msg, False)
+        source.close()
+        skipped.update(source.skipped)
+        if report is not None and preslicer is not None:
+            report["preslice"] = preslicer.report()
+        if report is not None:
+            report["implementations"] = get_issuer_registry().report(sorted(seen))
+    if frames:
+        return concat_cleaned(frames, ignore_index=True)
+    return None
+
+
+def run_directory(
+    path: str,
+    default_sender: str = "",
+    issuer_override: Optional[str] = None,
+    report: Optional[dict] = None,
+    cache: Optional[ParseCache] = None,
+    workers: int = 1,
+    engine: str = DEFAULT_ENGINE,
+    detect_unknown: bool = False,
+    preslicer: Optional[Preslicer] = None,
+    multi_table: bool = False,
+    batch_normalize: bool = False,
+) -> pd.DataFrame | None:
+    """Reprocess archived .eml/.html files from a local directory (no Outlook needed)."""
+    source = DirectorySource(path, default_sender=default_sender)
+    return run_source(
+        source,
+        issuer_override=issuer_override,
+        report=report,
+        cache=cache,
+        workers=workers,
+        engine=engine,
+        detect_unknown=detect_unknown,
+        preslicer=preslicer,
+        multi_table=multi_table,
+        batch_normalize=batch_normalize,
+    )
+
+
+def run_outlook(
+    mailbox: str,
+    folder_path: List[str],
+    max_emails: int = 40,
+    incremental: bool = False,
+    existing: Optional[pd.DataFrame] = None,
+    state_path: Optional[str] = None,
+    server_filter: bool = False,
+    report: Optional[dict] = None,
+    cache: Optional[ParseCache] = None,
+    workers: int = 1,
+    engine: str = DEFAULT_ENGINE,
+    detect_unknown: bool = False,
+    preslicer: Optional[Preslicer] = None,
+    multi_table: bool = False,
+    batch_normalize: bool = False,
+) -> pd.DataFrame | None:
+    """Parse the newest `max_emails` mails of an Outlook folder.
+
+    With `incremental=True` a sync state file (see `app_core.sync_state`) is
+    kept. When `existing` results are passed in, only mail received since the
+    last sync is fetched, all of it: oldest first, `max_emails` headers per
+    read. Messages already seen (here or in another folder) are skipped, and
+    the new rows are appended to `existing`. Without
+    `existing` a full fetch runs and the state is refreshed.
+
+    With `server_filter=True` Outlook only returns mail items from known
+    issuer senders (and inside the sync window), see `newest_mail_items`;
+    forwarded pricings are then filtered out before `detect_unknown` can
+    look at them. See `run_source` for routing and the `report` dict.
+    """
     # Ensure COM is initialized for this thread during Outlook access
     try:
         import pythoncom  # type: ignore
@@ -33,21 +386,32 @@ def run_outlook(mailbox: str, folder_path: List[str], max_emails: int = 40) -> p
         folder = get_outlook_folder(mailbox, folder_path)
         if folder is None:
             return None
-        msgs = newest_mail_items(folder, n=max_emails)
-        if not msgs:
-            return None
-        frames = []
-        for m in msgs:
-            try:
-                sender = resolve_smtp(m) or ""
-                html = clean_html_from_mail_item(m)
-            except Exception:
-                continue
-            df = run_on_html(html, sender)
-            if df is not None and not df.empty:
-                frames.append(df)
+        state = SyncState.load(state_path) if incremental else None
+        merge = state is not None and existing is not None
+        source = OutlookSource.for_mailbox(
+            folder,
+            mailbox,
+            folder_path,
+            max_emails=max_emails,
+            state=state,
+            merge=merge,
+            restrict=server_filter,
+            sender_domains=known_sender_needles() if server_filter else None,
+        )
+        df_new = run_source(
+            source,
+            report=report,
+            cache=cache,
+            workers=workers,
+            engine=engine,
+            detect_unknown=detect_unknown,
+            preslicer=preslicer,
+            multi_table=multi_table,
+            batch_normalize=batch_normalize,
+        )
+        frames = [f for f in (existing if merge else None, df_new) if f is not None and not f.empty]
         if frames:
-            return pd.concat(frames, ignore_index=True)
+            return concat_cleaned(frames, ignore_index=True)
         return None
     finally:
         try:
@@ -55,3 +419,59 @@ def run_outlook(mailbox: str, folder_path: List[str], max_emails: int = 40) -> p
                 pythoncom.CoUninitialize()
         except Exception:
             pass
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Offline reprocessing: `python -m app_core.pipeline DIR [-o out.csv]`."""
+    import argparse
+
+    ap = argparse.ArgumentParser(description="Parse archived pricing emails from a directory")
+    ap.add_argument("path", help="directory with .eml/.html files (searched recursively)")
+    ap.add_argument("-o", "--output", help="write the parsed rows to this CSV file")
+    ap.add_argument("--sender", default="", help="sender used for .html files without headers")
+    ap.add_argument("--issuer", default=None, help="force this issuer's extractor/normalizer")
+    ap.add_argument("--no-cache", action="store_true", help="do not use the on-disk parse cache")
+    ap.add_argument(
+        "-j", "--workers", type=int, default=default_workers(), help="parallel parse processes (default: %(default)s)"
+    )
+    ap.add_argument("--detect", action="store_true", help="detect the issuer of unknown senders from table headers")
+    ap.add_argument("--no-preslice", action="store_true", help="hand whole bodies to the parser")
+    ap.add_argument("--budget-kb", type=int, default=DEFAULT_BUDGET // 1024, help="max KB of table HTML per email")
+    ap.add_argument("--engine", choices=ENGINES, default=DEFAULT_ENGINE, help="table extraction engine")
+    ap.add_argument("--multi-table", action="store_true", help="extract every qualifying table of an email")
+    ap.add_argument("--batch-normalize", action="store_true", help="normalize once per issuer across all emails")
+    args = ap.parse_args(argv)
+
+    run_report: dict = {}
+    df = run_directory(
+        args.path,
+        default_sender=args.sender,
+        issuer_override=args.issuer,
+        report=run_report,
+        cache=None if args.no_cache else get_default_cache(),
+        workers=args.workers,
+        engine=args.engine,
+        detect_unknown=args.detect,
+        preslicer=None if args.no_preslice else Preslicer(budget=args.budget_kb * 1024),
+        multi_table=args.multi_table,
+        batch_normalize=args.batch_normalize,
+    )
+    rows = 0 if df is None else len(df)
+    print(f"Parsed {rows} rows; skipped: {dict(run_report.get('skipped') or {})}")
+    preslice_report = run_report.get("preslice")
+    if preslice_report is not None and not preslice_report.empty:
+        print(preslice_report.to_string(index=False))
+    impl = run_report.get("implementations")
+    if impl is not None and not impl.empty:
+        print(impl.to_string(index=False))
+    for det in run_report.get("detected") or []:
+        print(f"  {det['message']}: detected {det['issuer']} ({det['confidence']:.2f}{'' if det['used'] else ', not used'})")
+    for err in run_report.get("errors") or []:
+        print(f"  {err['message']} [{err['issuer']}] {err['stage']}: {err['error']}")
+    if df is not None and args.output:
+        df.to_csv(args.output, index=False)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
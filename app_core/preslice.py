@@ -0,0 +1,156 @@
+"""
+Cheap pre-slicing of email bodies before any HTML parser sees them.
+
+Pricing mails often carry megabytes of inline base64 logos, CSS and quoted
+history around a pricing table of a few KB. `Preslicer.slice` works on the
+raw string with a handful of compiled regexes:
+
+1. drop `data:` URI payloads (img src, CSS url()), <style>/<script> blocks
+   and Outlook conditional comments
+2. cut at the first reply/forward marker (Outlook separators, "Original
+   Message", Gmail quote) and drop <blockquote> regions, like the cleaning
+   step does after parsing
+3. keep only the top-level <table> regions, in document order, unless the
+   issuer's extractor also reads the text around the table (Barclays)
+4. enforce a size budget: whole tables are kept until it is exhausted
+
+Sizes in/out per issuer are accumulated in `Preslicer.stats` (string
+lengths, which for the mostly ASCII HTML of these mails are ~bytes).
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+
+DEFAULT_BUDGET = 1024 * 1024
+
+_DATA_SRC = re.compile(r"""(\bsrc\s*=\s*["']?)data:[^"'\s>]*""", re.I)
+_DATA_URL = re.compile(r"""url\(\s*["']?data:[^)]*\)""", re.I)
+_BLOCKS = re.compile(r"<(style|script)\b[^>]*>.*?</\1\s*>", re.I | re.S)
+_COND_COMMENT = re.compile(r"<!--\[if\b.*?<!\[endif\]-->", re.I | re.S)
+_REPLY_MARKER = re.compile(
+    r"<div\b[^>]*\bid\s*=\s*[\"']?(?:divRplyFwdMsg|appendonsend)"
+    r"|<div\b[^>]*border-top:\s*solid\s+#(?:E1E1E1|B5C4DF)"
+    r"|<div\b[^>]*\bclass\s*=\s*[\"']?gmail_quote"
+    r"|-----\s*Original Message\s*-----",
+    re.I,
+)
+_QUOTE_TAG = re.compile(r"<(/?)blockquote\b[^>]*>", re.I)
+_TABLE_TAG = re.compile(r"<(/?)table\b[^>]*>", re.I)
+
+# Issuers whose extractor reads document text outside the pricing table
+TEXT_ISSUERS = {"barclays"}
+
+
+def strip_noise(html: str) -> str:
+    """Drop data: payloads, <style>/<script> blocks and conditional comments."""
+    html = _DATA_SRC.sub(r"\1", html)
+    html = _DATA_URL.sub("url()", html)
+    html = _BLOCKS.sub("", html)
+    return _COND_COMMENT.sub("", html)
+
+
+def cut_replies(html: str) -> str:
+    """Everything before the first reply/forward marker."""
+    m = _REPLY_MARKER.search(html)
+    return html[:m.start()] if m else html
+
+
+def _regions(html: str, tag: re.Pattern) -> List[Tuple[int, int]]:
+    """(start, end) spans of the outermost `tag` elements; unclosed ones run to the end."""
+    spans = []
+    depth, start = 0, 0
+    for m in tag.finditer(html):
+        if not m.group(1):
+            if depth == 0:
+                start = m.start()
+            depth += 1
+        elif depth:
+            depth -= 1
+            if depth == 0:
+                spans.append((start, m.end()))
+    if depth:
+        spans.append((start, len(html)))
+    return spans
+
+
+def drop_quotes(html: str) -> str:
+    if not _QUOTE_TAG.search(html):
+        return html
+    out, pos = [], 0
+    for start, end in _regions(html, _QUOTE_TAG):
+        out.append(html[pos:start])
+        pos = end
+    out.append(html[pos:])
+    return "".join(out)
+
+
+def table_slices(html: str, budget: Optional[int] = None) -> Tuple[str, bool]:
+    """Top-level <table> regions joined, and whether the budget cut some off."""
+    parts, size = [], 0
+    for start, end in _regions(html, _TABLE_TAG):
+        if budget is not None and parts and size + (end - start) > budget:
+            return "".join(parts), True
+        parts.append(html[start:end])
+        size += end - start
+    return "".join(parts), False
+
+
+@dataclass
+class _IssuerStats:
+    emails: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    over_budget: int = 0
+
+
+class Preslicer:
+    """Configurable pre-slicing stage; one instance per run collects stats."""
+
+    def __init__(self, budget: Optional[int] = DEFAULT_BUDGET, cut_replies: bool = True):
+        self.budget = budget
+        self.cut_replies = cut_replies
+        self.stats: Dict[str, _IssuerStats] = {}
+
+    def slice(self, html: str, issuer: Optional[str]) -> str:
+        """Reduce `html` to what `issuer`'s extractor needs.
+
+        With no issuer (detection from headers pending) only the noise is
+        stripped: forwarded pricings sit below the forward marker.
+        """
+        before = len(html or "")
+        out = strip_noise(html or "")
+        over = False
+        if issuer is not None:
+            if self.cut_replies:
+                out = cut_replies(out)
+            out = drop_quotes(out)
+            if issuer not in TEXT_ISSUERS:
+                out, over = table_slices(out, self.budget)
+        if self.budget is not None and len(out) > self.budget and (issuer is None or issuer in TEXT_ISSUERS):
+            out, over = out[:self.budget], True
+        st = self.stats.setdefault(issuer or "(unknown)", _IssuerStats())
+        st.emails += 1
+        st.bytes_in += before
+        st.bytes_out += len(out)
+        st.over_budget += int(over)
+        return out
+
+    def report(self) -> pd.DataFrame:
+        """Per-issuer emails, KB in/out, % saved and how often the budget cut tables off."""
+        rows = []
+        for issuer, st in sorted(self.stats.items()):
+            rows.append({
+                "issuer": issuer,
+                "emails": st.emails,
+                "kb_in": round(st.bytes_in / 1024, 1),
+                "kb_out": round(st.bytes_out / 1024, 1),
+                "saved_%": round(100 * (1 - st.bytes_out / st.bytes_in), 1) if st.bytes_in else 0.0,
+                "over_budget": st.over_budget,
+            })
+        return pd.DataFrame(rows, columns=["issuer", "emails", "kb_in", "kb_out", "saved_%", "over_budget"])
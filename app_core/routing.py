@@ -0,0 +1,132 @@
+"""
+Sender → issuer routing index.
+
+Routes live in a JSON file (`sender_routes.json` next to this module, or a
+user copy at ~/.email_pricer_parser/sender_routes.json which takes
+precedence):
+
+- "domains": {"citi.com": "citi", ...} matched against the address domain
+  and its parent domains (so "am.natixis.com" routes to natixis)
+- "substrings": [["autopricer", "jpm"], ...] for senders not identified by
+  their domain (mailbox names, Exchange display names); compiled into one
+  regex, the leftmost hit wins
+
+The domain lookup runs first. The file is re-read when its mtime changes
+(checked at most every `RELOAD_INTERVAL` seconds) and results are memoized
+per sender, so routing a large archive costs one dict lookup per message.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+BUNDLED_ROUTES_PATH = Path(__file__).with_name("sender_routes.json")
+USER_ROUTES_PATH = Path.home() / ".email_pricer_parser" / "sender_routes.json"
+RELOAD_INTERVAL = 2.0
+_MEMO_MAX = 100_000
+
+_DOMAIN = re.compile(r"@([a-z0-9.\-]+)")
+
+
+def routes_path() -> Path:
+    return USER_ROUTES_PATH if USER_ROUTES_PATH.exists() else BUNDLED_ROUTES_PATH
+
+
+class RoutingIndex:
+    """Compiled routes of one config file; see module docstring."""
+
+    def __init__(self, path: str | os.PathLike | None = None):
+        self._fixed_path = Path(path) if path else None
+        self.path: Optional[Path] = None
+        self.domains: Dict[str, str] = {}
+        self.substrings: List[Tuple[str, str]] = []
+        self._pattern: Optional[re.Pattern] = None
+        self._by_needle: Dict[str, str] = {}
+        self._mtime: Optional[float] = None
+        self._checked = 0.0
+        self._memo: Dict[str, Optional[str]] = {}
+        self.reload()
+
+    def reload(self, force: bool = False) -> None:
+        """Re-read the config if it changed; a broken file keeps the current routes."""
+        path = self._fixed_path or routes_path()
+        try:
+            mtime = path.stat().st_mtime
+        except OSError:
+            mtime = None
+        self._checked = time.monotonic()
+        if not force and path == self.path and mtime == self._mtime:
+            return
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            domains = {str(d).strip().lower().lstrip("@."): str(i) for d, i in (data.get("domains") or {}).items()}
+            substrings = [(str(n).strip().lower(), str(i)) for n, i in (data.get("substrings") or [])]
+        except Exception:
+            if self.path is not None:
+                return
+            domains, substrings = {}, []
+        substrings = [(n, i) for n, i in substrings if n]
+        self.path, self._mtime = path, mtime
+        self.domains = domains
+        self.substrings = substrings
+        self._by_needle = {}
+        for needle, issuer in substrings:
+            self._by_needle.setdefault(needle, issuer)
+        self._pattern = (
+            re.compile("|".join(re.escape(n) for n, _ in substrings)) if substrings else None
+        )
+        self._memo = {}
+
+    def _maybe_reload(self) -> None:
+        if time.monotonic() - self._checked >= RELOAD_INTERVAL:
+            self.reload()
+
+    def _lookup(self, s: str) -> Optional[str]:
+        for m in reversed(_DOMAIN.findall(s)):
+            labels = m.strip(".").split(".")
+            for k in range(len(labels) - 1):
+                issuer = self.domains.get(".".join(labels[k:]))
+                if issuer:
+                    return issuer
+        if self._pattern is not None:
+            hit = self._pattern.search(s)
+            if hit:
+                return self._by_needle[hit.group(0)]
+        return None
+
+    def route(self, sender: str) -> Optional[str]:
+        self._maybe_reload()
+        try:
+            return self._memo[sender]
+        except KeyError:
+            pass
+        issuer = self._lookup((sender or "").lower())
+        if len(self._memo) >= _MEMO_MAX:
+            self._memo.clear()
+        self._memo[sender] = issuer
+        return issuer
+
+    def issuers(self) -> set:
+        self._maybe_reload()
+        return set(self.domains.values()) | {i for _, i in self.substrings}
+
+    def needles(self) -> List[Tuple[str, str]]:
+        """(sender substring, issuer) pairs, e.g. for a server-side LIKE filter."""
+        self._maybe_reload()
+        return list(self.domains.items()) + list(self.substrings)
+
+
+_DEFAULT_INDEX: Optional[RoutingIndex] = None
+
+
+def get_routing_index() -> RoutingIndex:
+    global _DEFAULT_INDEX
+    if _DEFAULT_INDEX is None:
+        _DEFAULT_INDEX = RoutingIndex()
+    return _DEFAULT_INDEX
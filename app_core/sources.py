@@ -0,0 +1,258 @@
+"""
+Mail sources feeding the extract → normalize pipeline.
+
+A source yields `MailMessage` objects lazily. Sender/subject are available
+up front; the HTML body is only loaded when `MailMessage.html` is accessed,
+so messages that are not routed to an issuer never cost a body download.
+
+- OutlookSource: an Outlook folder (win32com), with optional incremental sync
+- DirectorySource: a local directory of archived .eml / .html files
+"""
+
+from __future__ import annotations
+
+import email
+import email.parser
+import email.policy
+import email.utils
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from html import escape
+from pathlib import Path
+from typing import Any, Callable, Iterator, List, Optional
+
+from .email_integration import load_mail_item, mail_headers
+from .sync_state import SyncState, folder_key
+
+
+@dataclass
+class MailMessage:
+    sender: str
+    subject: str = ""
+    received: Optional[datetime] = None
+    message_id: Optional[str] = None
+    loader: Optional[Callable[[], str]] = field(default=None, repr=False)
+    # Source-specific handle for `MailSource.processed` (the Outlook header)
+    handle: Any = field(default=None, repr=False)
+    _html: Optional[str] = field(default=None, repr=False)
+
+    @property
+    def html(self) -> str:
+        if self._html is None:
+            self._html = (self.loader() if self.loader else "") or ""
+        return self._html
+
+
+class MailSource:
+    """Base class: iterate messages, report each outcome with `processed()`, then `close()` to persist any state."""
+
+    def __init__(self) -> None:
+        self.skipped: Counter = Counter()
+
+    def messages(self) -> Iterator[MailMessage]:
+        raise NotImplementedError
+
+    def processed(self, msg: MailMessage, ok: bool = True) -> None:
+        """Called once `msg` has gone through the pipeline; `ok=False` if its body could not be fetched or parsed."""
+
+    def close(self) -> None:
+        pass
+
+
+class OutlookSource(MailSource):
+    """Newest mails of an Outlook folder, or all mail since the watermark when merging; see `pipeline.run_outlook`."""
+
+    def __init__(
+        self,
+        folder,
+        key: str,
+        max_emails: int = 40,
+        state: Optional[SyncState] = None,
+        merge: bool = False,
+        restrict: bool = False,
+        sender_domains: Optional[List[str]] = None,
+    ):
+        super().__init__()
+        self.folder = folder
+        self.key = key
+        self.max_emails = max_emails
+        self.state = state
+        self.merge = merge and state is not None
+        self.restrict = restrict
+        self.sender_domains = sender_domains
+        self._retry = None  # oldest ReceivedTime of a message to fetch again
+
+    @classmethod
+    def for_mailbox(cls, folder, mailbox: str, folder_path: List[str], **kwargs) -> "OutlookSource":
+        return cls(folder, folder_key(mailbox, folder_path), **kwargs)
+
+    def _loader(self, header) -> Callable[[], str]:
+        return lambda: getattr(load_mail_item(self.folder, header), "HTMLBody", "") or ""
+
+    def _headers(self) -> Iterator:
+        since = self.state.watermark(self.key) if self.merge else None
+        if since is None:
+            yield from mail_headers(
+                self.folder, n=self.max_emails, restrict=self.restrict, sender_domains=self.sender_domains
+            )
+            return
+        # Incremental: forward from the watermark in windows of max_emails
+        # until one comes back short. Only the newest N after the watermark
+        # would lose the older ones, as marking those seen moves it past them.
+        # Windows overlap at their boundary time; IDs already yielded are
+        # dropped (they are only marked seen once processed).
+        yielded: set = set()
+        while True:
+            headers = mail_headers(
+                self.folder,
+                n=self.max_emails,
+                since=since,
+                restrict=self.restrict,
+                sender_domains=self.sender_domains,
+                oldest_first=True,
+            )
+            for h in headers:
+                ident = (h.entry_id, h.internet_id)
+                if ident not in yielded:
+                    yielded.add(ident)
+                    yield h
+            newest = max((h.received for h in headers if h.received is not None), default=None)
+            if len(headers) < self.max_emails or newest is None or newest <= since:
+                return
+            since = newest
+
+    def messages(self) -> Iterator[MailMessage]:
+        for h in self._headers():
+            if self.merge and self.state.is_seen(self.key, h.entry_id, h.internet_id):
+                self.skipped["already seen"] += 1
+                continue
+            yield MailMessage(
+                sender=h.sender,
+                subject=h.subject,
+                received=h.received,
+                message_id=h.internet_id or h.entry_id,
+                loader=self._loader(h),
+                handle=h,
+            )
+
+    def processed(self, msg: MailMessage, ok: bool = True) -> None:
+        # Seen (and the watermark moved) only once the pipeline is done with the
+        # message; a failed one stays unseen and holds the watermark back
+        if self.state is None:
+            return
+        h = msg.handle
+        if ok:
+            self.state.mark_seen(self.key, h.entry_id, h.internet_id, h.received)
+        elif h.received is not None and (self._retry is None or h.received < self._retry):
+            self._retry = h.received
+
+    def close(self) -> None:
+        if self.state is not None:
+            if self._retry is not None:
+                self.state.hold(self.key, self._retry)
+            try:
+                self.state.save()
+            except Exception:
+                pass
+
+
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?([A-Za-z0-9_\-]+)""", re.I)
+
+
+def decode_html_bytes(data: bytes, default: str = "utf-8") -> str:
+    """Decode HTML using the charset declared in a <meta> tag (first 4 KB)."""
+    m = _META_CHARSET.search(data[:4096])
+    for enc in ([m.group(1).decode("ascii")] if m else []) + [default, "cp1252"]:
+        try:
+            return data.decode(enc)
+        except (LookupError, UnicodeDecodeError):
+            continue
+    return data.decode(default, errors="replace")
+
+
+def _eml_body(msg) -> str:
+    part = msg.get_body(preferencelist=("html", "plain"))
+    if part is None:
+        return ""
+    try:
+        content = part.get_content()
+    except Exception:
+        payload = part.get_payload(decode=True) or b""
+        content = payload.decode(part.get_content_charset() or "utf-8", errors="replace")
+    if part.get_content_type() == "text/plain":
+        return f"<pre>{escape(content)}</pre>"
+    return content
+
+
+class DirectorySource(MailSource):
+    """Archived mails from a directory of .eml / .html(.htm) files.
+
+    .eml files carry their own sender/subject/date headers and charsets.
+    Bare .html files have no headers, so `default_sender` is used for them
+    (pair it with an issuer override when the archive is per-issuer).
+    Files are visited in sorted path order and read lazily, one at a time.
+    """
+
+    PATTERNS = ("*.eml", "*.html", "*.htm")
+
+    def __init__(self, path: str | Path, recursive: bool = True, default_sender: str = ""):
+        super().__init__()
+        self.path = Path(path)
+        self.recursive = recursive
+        self.default_sender = default_sender
+
+    def _files(self) -> List[Path]:
+        files = set()
+        for pattern in self.PATTERNS:
+            found = self.path.rglob(pattern) if self.recursive else self.path.glob(pattern)
+            files.update(p for p in found if p.is_file())
+        return sorted(files)
+
+    def messages(self) -> Iterator[MailMessage]:
+        for p in self._files():
+            if p.suffix.lower() == ".eml":
+                try:
+                    msg = self._read_eml_headers(p)
+                except Exception:
+                    self.skipped["unreadable file"] += 1
+                    continue
+                yield msg
+            else:
+                yield MailMessage(
+                    sender=self.default_sender,
+                    subject=p.stem,
+                    received=datetime.fromtimestamp(p.stat().st_mtime),
+                    message_id=str(p),
+                    loader=lambda p=p: decode_html_bytes(p.read_bytes()),
+                )
+
+    @staticmethod
+    def _read_eml_headers(p: Path) -> MailMessage:
+        # Only read up to the blank line ending the header block
+        head = []
+        with p.open("rb") as fh:
+            for line in fh:
+                if not line.strip():
+                    break
+                head.append(line)
+        headers = email.parser.BytesHeaderParser(policy=email.policy.default).parsebytes(b"".join(head))
+        _, addr = email.utils.parseaddr(str(headers.get("From", "")))
+        try:
+            received = email.utils.parsedate_to_datetime(str(headers.get("Date")))
+            received = received.replace(tzinfo=None)
+        except Exception:
+            received = None
+
+        def load(p=p) -> str:
+            with p.open("rb") as fh:
+                return _eml_body(email.message_from_binary_file(fh, policy=email.policy.default))
+
+        return MailMessage(
+            sender=addr.lower(),
+            subject=str(headers.get("Subject", "")),
+            received=received,
+            message_id=str(headers.get("Message-ID", "")).strip() or str(p),
+            loader=load,
+        )
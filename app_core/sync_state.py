@@ -0,0 +1,99 @@
+"""
+Persisted watermark for incremental Outlook syncs.
+
+The state file remembers, per mailbox/folder, the newest ReceivedTime that was
+processed and the EntryIDs seen at or shortly before it. A message that
+failed to load or parse is not marked seen and holds the watermark at its
+ReceivedTime, so the next sync fetches it again. InternetMessageIDs are
+tracked across folders so the same message filed in several folders is only
+parsed once.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+DEFAULT_STATE_PATH = Path.home() / ".email_pricer_parser" / "sync_state.json"
+
+# Seen IDs older than watermark - retention are dropped on save; the watermark
+# alone already excludes them from the next sync.
+SEEN_RETENTION = timedelta(days=2)
+
+
+def folder_key(mailbox: str, path: List[str]) -> str:
+    return f"{mailbox.strip().lower()}/{'/'.join(p.strip() for p in path)}"
+
+
+class SyncState:
+    """Small JSON-backed sync state; load with `SyncState.load()`."""
+
+    def __init__(self, path: Path, folders: Dict[str, dict] | None = None, message_ids: Dict[str, str] | None = None):
+        self.path = Path(path)
+        self.folders: Dict[str, dict] = folders or {}
+        self.message_ids: Dict[str, str] = message_ids or {}
+
+    @classmethod
+    def load(cls, path: str | os.PathLike | None = None) -> "SyncState":
+        p = Path(path) if path else DEFAULT_STATE_PATH
+        try:
+            data = json.loads(p.read_text(encoding="utf-8"))
+        except Exception:
+            data = {}
+        return cls(p, data.get("folders") or {}, data.get("message_ids") or {})
+
+    def watermark(self, key: str) -> Optional[datetime]:
+        raw = (self.folders.get(key) or {}).get("last_received")
+        try:
+            return datetime.fromisoformat(raw) if raw else None
+        except ValueError:
+            return None
+
+    def is_seen(self, key: str, entry_id: Optional[str], internet_id: Optional[str]) -> bool:
+        if internet_id and internet_id in self.message_ids:
+            return True
+        entries = (self.folders.get(key) or {}).get("entry_ids") or {}
+        return bool(entry_id) and entry_id in entries
+
+    def mark_seen(self, key: str, entry_id: Optional[str], internet_id: Optional[str], received: Optional[datetime]) -> None:
+        stamp = (received or datetime.now()).isoformat()
+        folder = self.folders.setdefault(key, {"last_received": None, "entry_ids": {}})
+        if entry_id:
+            folder["entry_ids"][entry_id] = stamp
+        if internet_id:
+            self.message_ids[internet_id] = stamp
+        if received is not None:
+            current = self.watermark(key)
+            if current is None or received > current:
+                folder["last_received"] = received.isoformat()
+
+    def hold(self, key: str, received: datetime) -> None:
+        """Keep the watermark at or before `received`, so that message is fetched again next sync."""
+        current = self.watermark(key)
+        if current is not None and received < current:
+            self.folders[key]["last_received"] = received.isoformat()
+
+    def _trim(self) -> None:
+        newest = None
+        for key, folder in self.folders.items():
+            mark = self.watermark(key)
+            if mark is None:
+                continue
+            cutoff = (mark - SEEN_RETENTION).isoformat()
+            folder["entry_ids"] = {k: v for k, v in folder.get("entry_ids", {}).items() if v >= cutoff}
+            newest = mark if newest is None or mark > newest else newest
+        if newest is not None:
+            cutoff = (newest - SEEN_RETENTION).isoformat()
+            self.message_ids = {k: v for k, v in self.message_ids.items() if v >= cutoff}
+
+    def save(self) -> None:
+        """Write the state atomically (temp file + replace)."""
+        self._trim()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"folders": self.folders, "message_ids": self.message_ids}, indent=1), encoding="utf-8")
+        os.replace(tmp, self.path)
@@ -0,0 +1,313 @@
+"""
+Streaming table extraction on lxml (C parser), without building a tree.
+
+`scan_tables(html)` feeds the document through an lxml parser target and
+only keeps tables, rows and cell texts. The result mirrors what the
+BeautifulSoup extractors see:
+
+- `Table.rows` ~ `table.find_all("tr")` (nested rows included, document order)
+- `Row.cells` ~ `tr.find_all(["td", "th"])` (nested cells included)
+- `Cell.text` ~ `cell.get_text(" ", strip=True)`
+- `Table.cells` ~ `table.find_all(["td", "th"])`
+
+Text inside <script>/<style>/comments is ignored like `get_text` does, and
+<blockquote> content (quoted history) can be skipped while streaming, which
+replaces the separate cleaning parse.
+
+With a `select` predicate the scan also picks the target table: tables are
+tested in document order as soon as they (and every table opened before
+them) are complete, and feeding stops at the first match. With
+`multi=True` every accepted table is kept and the whole document is read.
+
+`scan_soup(soup)` builds the same model, with the same selection, from an
+already parsed BeautifulSoup document (the bs4 engine).
+"""
+
+from __future__ import annotations
+
+from typing import Callable, List, Optional, Tuple
+
+from .html_utils import cell_span as _span
+
+try:
+    from lxml import etree
+except ImportError:  # only the BeautifulSoup adapter is usable
+    etree = None
+
+HAVE_LXML = etree is not None
+
+
+_CELL_TAGS = ("td", "th")
+_CHUNK = 32 * 1024
+_SKIP_TEXT_TAGS = ("script", "style", "template")
+
+
+class Cell:
+    __slots__ = ("tag", "parts", "colspan", "rowspan")
+
+    def __init__(self, tag: str, colspan: int = 1, rowspan: int = 1):
+        self.tag = tag
+        self.parts: List[str] = []
+        self.colspan = colspan
+        self.rowspan = rowspan
+
+    @property
+    def text(self) -> str:
+        return " ".join(self.parts)
+
+    def __repr__(self) -> str:
+        return f"<{self.tag} {self.text!r}>"
+
+
+class Row:
+    __slots__ = ("cells", "spanned")
+
+    def __init__(self) -> None:
+        self.cells: List[Cell] = []
+        self.spanned = False  # some cell has a colspan/rowspan > 1
+
+    def add(self, cell: Cell) -> None:
+        self.cells.append(cell)
+        if cell.colspan > 1 or cell.rowspan > 1:
+            self.spanned = True
+
+    def texts(self, tags=_CELL_TAGS) -> List[str]:
+        return [c.text for c in self.cells if c.tag in tags]
+
+    def spans(self, tags=_CELL_TAGS) -> List[Tuple[str, int, int]]:
+        """(text, colspan, rowspan) of the cells, for `RowBuilder.add_cells`."""
+        return [(c.text, c.colspan, c.rowspan) for c in self.cells if c.tag in tags]
+
+
+class Table:
+    __slots__ = ("index", "parent", "rows", "cells", "closed", "has_nested")
+
+    def __init__(self, index: int, parent: Optional["Table"] = None):
+        self.index = index
+        self.parent = parent  # innermost enclosing table
+        self.rows: List[Row] = []
+        self.cells: List[Cell] = []
+        self.closed = False
+        self.has_nested = False  # contains another <table> (layout wrapper)
+
+    def header(self) -> List[str]:
+        """Cell texts of the first row that has cells."""
+        for r in self.rows:
+            if r.cells:
+                return r.texts()
+        return []
+
+    def texts(self, tag: str) -> List[str]:
+        """Texts of all `tag` cells in the table (~ find_all(tag) + get_text)."""
+        return [c.text for c in self.cells if c.tag == tag]
+
+    def row_texts(self, tags=_CELL_TAGS) -> List[List[str]]:
+        """Non-empty rows as lists of cell texts, restricted to `tags`."""
+        out = []
+        for r in self.rows:
+            cells = r.texts(tags)
+            if cells:
+                out.append(cells)
+        return out
+
+
+def _soup_table(index: int, t, parent: Optional[Table]) -> Table:
+    # One walk over the table's elements: a cell joins every row around it
+    # (nested rows included, as `tr.find_all` sees them)
+    table = Table(index, parent)
+    table.closed = True
+    rows = {}
+    for el in t.descendants:
+        name = el.name
+        if name is None:
+            continue
+        if name == "table":
+            table.has_nested = True
+        elif name == "tr":
+            rows[id(el)] = row = Row()
+            table.rows.append(row)
+        elif name in _CELL_TAGS:
+            cell = Cell(name, _span(el.attrs, "colspan"), _span(el.attrs, "rowspan"))
+            text = el.get_text(" ", strip=True)
+            if text:
+                cell.parts.append(text)
+            table.cells.append(cell)
+            p = el.parent
+            while p is not t:
+                if p.name == "tr":
+                    rows[id(p)].add(cell)
+                p = p.parent
+    return table
+
+
+def scan_soup(
+    soup,
+    collect_text: bool = False,
+    select: Optional[Callable[[Table], bool]] = None,
+    multi: bool = False,
+) -> "ScanResult":
+    """`scan_tables` on an already parsed BeautifulSoup document.
+
+    Tables are built in document order; with `select` and without `multi`
+    the ones after the first match are not read.
+    """
+    out: List[Table] = []
+    matches: List[Table] = []
+    by_id = {}
+    for i, t in enumerate(soup.find_all("table")):
+        parent = t.find_parent("table")
+        table = _soup_table(i, t, by_id.get(id(parent)) if parent is not None else None)
+        by_id[id(t)] = table
+        out.append(table)
+        if select is not None and select(table):
+            matches.append(table)
+            if not multi:
+                break
+    return ScanResult(out, soup.get_text(" ", strip=True) if collect_text else None, matches)
+
+
+class _TableTarget:
+    """lxml parser target collecting tables; see module docstring."""
+
+    def __init__(
+        self,
+        skip_blockquotes: bool = True,
+        collect_text: bool = False,
+        select: Optional[Callable[[Table], bool]] = None,
+        multi: bool = False,
+    ):
+        self.skip_blockquotes = skip_blockquotes
+        self.collect_text = collect_text
+        self.select = select
+        self.multi = multi
+        self.matches: List[Table] = []
+        self._next = 0  # first table not tested by `select` yet
+        self.tables: List[Table] = []
+        self.text_parts: List[str] = []
+        self._open_tables: List[Table] = []
+        self._open_rows: List[Row] = []
+        self._open_cells: List[Cell] = []
+        self._buf: List[str] = []
+        self._skip_text = 0
+        self._quote = 0
+
+    def _flush(self) -> None:
+        if not self._buf:
+            return
+        text = "".join(self._buf).strip()
+        self._buf = []
+        if not text:
+            return
+        for cell in self._open_cells:
+            cell.parts.append(text)
+        if self.collect_text:
+            self.text_parts.append(text)
+
+    def start(self, tag, attrib) -> None:
+        self._flush()
+        if tag in _SKIP_TEXT_TAGS:
+            self._skip_text += 1
+        if self._quote or (tag == "blockquote" and self.skip_blockquotes):
+            if tag == "blockquote":
+                self._quote += 1
+            return
+        if tag == "table":
+            for t in self._open_tables:
+                t.has_nested = True
+            t = Table(len(self.tables), self._open_tables[-1] if self._open_tables else None)
+            self.tables.append(t)
+            self._open_tables.append(t)
+        elif tag == "tr":
+            row = Row()
+            for t in self._open_tables:
+                t.rows.append(row)
+            self._open_rows.append(row)
+        elif tag in _CELL_TAGS:
+            cell = Cell(tag, _span(attrib, "colspan"), _span(attrib, "rowspan"))
+            for r in self._open_rows:
+                r.add(cell)
+            for t in self._open_tables:
+                t.cells.append(cell)
+            self._open_cells.append(cell)
+
+    def end(self, tag) -> None:
+        self._flush()
+        if tag in _SKIP_TEXT_TAGS and self._skip_text:
+            self._skip_text -= 1
+        if self._quote:
+            if tag == "blockquote":
+                self._quote -= 1
+            return
+        if tag == "table" and self._open_tables:
+            self._open_tables.pop().closed = True
+            if self.select is not None:
+                self._test_closed()
+        elif tag == "tr" and self._open_rows:
+            self._open_rows.pop()
+        elif tag in _CELL_TAGS and self._open_cells:
+            self._open_cells.pop()
+
+    def _test_closed(self) -> None:
+        # Document order: a nested table closes before its parent, which is
+        # tested first once it completes.
+        while self._next < len(self.tables) and self.tables[self._next].closed:
+            if self.matches and not self.multi:
+                return
+            t = self.tables[self._next]
+            self._next += 1
+            if self.select(t):
+                self.matches.append(t)
+
+    def data(self, data) -> None:
+        if not self._skip_text and not self._quote:
+            self._buf.append(data)
+
+    def comment(self, text) -> None:
+        self._flush()
+
+    def close(self):
+        self._flush()
+        if self.select is not None:
+            # Tables left open at the end of the document count as complete
+            for t in self.tables:
+                t.closed = True
+            self._test_closed()
+        return self.tables
+
+
+def scan_tables(
+    html: str,
+    skip_blockquotes: bool = True,
+    collect_text: bool = False,
+    select: Optional[Callable[[Table], bool]] = None,
+    multi: bool = False,
+) -> "ScanResult":
+    """Stream `html` through lxml and return its tables (and optionally all text).
+
+    With `select`, `ScanResult.match` is the first table it accepts and the
+    rest of the document is not parsed, unless `collect_text` needs it.
+    With `multi=True`, `ScanResult.matches` holds every accepted table.
+    """
+    target = _TableTarget(skip_blockquotes=skip_blockquotes, collect_text=collect_text, select=select, multi=multi)
+    parser = etree.HTMLParser(target=target, remove_comments=False)
+    stop_early = select is not None and not collect_text and not multi
+    for pos in range(0, len(html or ""), _CHUNK):
+        parser.feed(html[pos:pos + _CHUNK])
+        if stop_early and target.matches:
+            break
+    parser.close()
+    return ScanResult(target.tables, " ".join(target.text_parts) if collect_text else None, target.matches)
+
+
+class ScanResult:
+    __slots__ = ("tables", "text", "matches")
+
+    def __init__(self, tables: List[Table], text: Optional[str], matches: Optional[List[Table]] = None):
+        self.tables = tables
+        self.text = text
+        self.matches = matches or []
+
+    @property
+    def match(self) -> Optional[Table]:
+        """First accepted table."""
+        return self.matches[0] if self.matches else None
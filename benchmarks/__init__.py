@@ -0,0 +1,4 @@
+"""
+Equivalence checks and timings of the parsing code, run from the repository
+root as `python -m benchmarks.<module>`; not part of the app.
+"""
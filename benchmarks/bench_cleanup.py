@@ -0,0 +1,355 @@
+"""
+Equivalence check and benchmark of `universal_cleanup`: `python -m benchmarks.bench_cleanup`.
+
+`reference_cleanup` is the former row-wise implementation (per-cell
+`apply`, whole-frame regex replaces), kept verbatim as the specification.
+`cleanup.universal_cleanup` must return the same frame for every case
+(values, dtypes, column order and index) on both of its paths, value by
+value up to `cleanup.SMALL_FRAME_ROWS` rows and vectorized above. The
+checks run in tests/test_cleanup.py; here synthetic normalizer outputs from
+a mail's few rows up to 100k are timed, on both paths.
+
+The reference sees its input through `missing.canonical_na` first: NA
+spellings the old pipeline missed in places (" None ", "NULL" before the
+BofA no_call_period default) are missing everywhere now, by design. Its
+number columns are read by `numbers.parse_numbers` first too: comma
+decimals, thousands separators, unicode minus and "1 Y"-style tenors that
+the old steps turned into NaN are numbers now, also by design. Its output
+goes through `cleanup.apply_schema`, the step that now types the canonical
+columns (categoricals, Int16). Float cells are no longer sent through
+`astype(str)` and `to_numeric`, which reads 17-digit decimals only to within
+an ulp: the cases in `ROUND_TRIP_CASES` agree to 1e-15, the others exactly.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from app_core import cleanup
+from app_core.cleanup import PASSTHROUGH_COLS, REQUIRED_COLS, apply_schema, universal_cleanup
+from app_core.cleanup import _NUMBER_UNITS, _PERIODS, _merge_duplicates  # the cleanup's reading of numbers
+from app_core.missing import canonical_na
+from app_core.numbers import parse_numbers
+
+
+def reference_cleanup(df: pd.DataFrame, issuer: str | None = None) -> pd.DataFrame:
+    df = df.copy()
+
+    # Ensure required columns exist
+    for col in REQUIRED_COLS:
+        if col not in df.columns:
+            df[col] = np.nan
+
+    # If issuer-level normalizers created duplicate canonical columns
+    # (e.g., multiple variants renamed to the same final name), merge them
+    # into a single Series by taking the first non-null across duplicates.
+    if df.columns.duplicated().any():
+        dup_names = set(df.columns[df.columns.duplicated()])
+        for name in dup_names:
+            cols = [c for c in df.columns if c == name]
+            merged = df.loc[:, cols].bfill(axis=1).iloc[:, 0]
+            df = df.drop(columns=cols)
+            df[name] = merged
+
+    # Blank/NA normalization
+    df = df.replace(r"^\s*$", np.nan, regex=True)
+    df = df.replace({pd.NA: np.nan})
+
+    # Numeric cleanup
+    for col in ["coupon", "strike", "barrier", "reoffer", "autocall_barrier"]:
+        if col in df.columns:
+            s = df[col]
+            # Guard in case `s` is a DataFrame due to unexpected duplicates
+            if isinstance(s, pd.DataFrame):
+                s = s.bfill(axis=1).iloc[:, 0]
+            s = s.astype(str).str.replace("%", "", regex=False)
+            df[col] = pd.to_numeric(s, errors="coerce")
+
+    # Tenor to months
+    def _parse_tenor_to_months(x):
+        if pd.isna(x):
+            return np.nan
+        s = str(x).strip().lower()
+        if s == "" or s in {"nan", "none"}:
+            return np.nan
+        if s.endswith("y"):
+            try:
+                return float(s[:-1].strip()) * 12
+            except Exception:
+                return np.nan
+        if s.endswith("m"):
+            s = s[:-1].strip()
+        try:
+            return float(s)
+        except Exception:
+            return np.nan
+
+    df["tenor"] = pd.to_numeric(df["tenor"].apply(_parse_tenor_to_months), errors="coerce")
+
+    # no_call_period cleanup (issuer-specific exceptions possible)
+    if (issuer or "").lower() != "bofa":
+        df["no_call_period"] = df["no_call_period"].astype(str).str.replace("m", "", case=False, regex=False)
+        df["no_call_period"] = pd.to_numeric(df["no_call_period"], errors="coerce")
+
+    # default no_call_period = 1 if 0 or NaN
+    sel = df["no_call_period"].isna() | (df["no_call_period"] == 0)
+    df.loc[sel, "no_call_period"] = 1
+
+    # Normalize autocall_frequency
+    freq_map = {
+        "1": "Monthly", "3": "Quarterly", "6": "Semi-Annual", "12": "Annual",
+        "quarterly": "Quarterly", "semi-annual": "Semi-Annual",
+        "annual": "Annual", "monthly": "Monthly",
+    }
+    df["autocall_frequency"] = df["autocall_frequency"].astype(str).str.strip().map(lambda s: freq_map.get(s, s))
+
+    # barrier_type normalization
+    def _norm_barrier_type(x):
+        if pd.isna(x):
+            return np.nan
+        s = str(x).strip().lower()
+        alias = {
+            "continuous": "american", "am": "american", "amer": "american",
+            "american": "american", "eu": "european", "eur": "european",
+            "european": "european",
+        }
+        s = alias.get(s, s)
+        return s.title() if s in {"american", "european"} else np.nan
+
+    df["barrier_type"] = df["barrier_type"].apply(_norm_barrier_type)
+
+    # Clean underlyings safely
+    def _clean_underlying(val):
+        if pd.isna(val):
+            return np.nan
+        s = str(val).strip()
+        if s.lower() in {"nan", "none", "", "<na>"}:
+            return np.nan
+        s = s.split(" ", 1)[0]
+        s = s.split("_", 1)[0]
+        s = s.split(".", 1)[0]
+        s = s.replace(" Equity", "")
+        return s if s else np.nan
+
+    for col in ["underlying_1", "underlying_2", "underlying_3", "underlying_4", "underlying_5"]:
+        if col in df.columns:
+            df[col] = df[col].apply(_clean_underlying)
+
+    # Universal NA homogenization
+    na_like = ["", " ", "nan", "NaN", "none", "None", "NULL", "Null", "<NA>", pd.NA, np.nan, None]
+    df = df.replace(na_like, np.nan)
+
+    # Enforce types
+    for col in df.select_dtypes(include="object").columns:
+        df[col] = df[col].astype(str).replace("nan", np.nan)
+
+    for col in ["coupon", "strike", "barrier", "reoffer", "autocall_barrier", "tenor", "no_call_period"]:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+
+    # Enforce required order (subset safe)
+    cols = [c for c in REQUIRED_COLS + PASSTHROUGH_COLS if c in df.columns]
+    return df[cols]
+
+
+# Cell values as normalizers hand them over: extracted strings, read_html
+# numbers, blanks and the various spellings of "missing"
+_MISSING = [np.nan, None, pd.NA, "", " ", "\xa0", "nan", "NaN", "None", "NULL", "Null", "<NA>"]
+_POOLS: Dict[str, list] = {
+    "issuer": ["GS", "BNP", "Citi"],
+    "product": ["Phoenix Autocall", "Reverse Convertible", "  Express  ", 1234, "None"],
+    "coupon": ["8.5%", "10.25", 7.5, "12,5%", "n/a", " 9 % "],
+    "currency": ["EUR", "USD", "CHF ", "eur"],
+    "tenor": ["12m", "1y", "18", 24, "2 Y", "6 M", "1_0", "abc", "1.5y", "m", "inf"],
+    "strike": ["100%", 100, "95.5", "-", 98.0],
+    "barrier": ["60%", "0.6", 55, "", "NA"],
+    "reoffer": ["99.5", 98.75, "100 %"],
+    "underlying_1": ["SX5E UW Equity", "NKY.N", "SPX_Index", "AAPL", " MSFT US ", "NONE", ".X", "<na>", "NULL", 1234],
+    "underlying_2": ["RTY Index", "TSLA UQ Equity", "NaN.x"],
+    "underlying_3": ["ABC\nDEF", "Null x", "x_y.z w"],
+    "barrier_type": ["Continuous", "EU", " european ", "AMER", "daily", "American"],
+    "autocall_barrier": ["100%", 95, "85.5 %"],
+    "autocall_frequency": ["3", "quarterly", " 1 ", "12", "Monthly", "weekly", 6, 3.0],
+    "no_call_period": ["12m", "6M", 0, "0", 3, "none"],
+    "wrapper": ["Note", "Certificate"],
+}
+
+
+def synthetic_frame(rows: int, seed: int = 0, missing: float = 0.15, mixed: bool = True) -> pd.DataFrame:
+    """Frame shaped like a normalizer's output (extra columns included).
+
+    `mixed=False` gives the all-string cells of an HTML table extraction,
+    otherwise numbers from `read_html` are mixed in.
+    """
+    rng = np.random.default_rng(seed)
+    data = {}
+    for col, pool in _POOLS.items():
+        if not mixed:
+            pool = [str(v) for v in pool]
+        values = np.empty(rows, dtype=object)
+        picks = rng.integers(0, len(pool), rows)
+        for i, p in enumerate(picks):
+            values[i] = pool[p]
+        blank = rng.random(rows) < missing
+        for i in np.flatnonzero(blank):
+            values[i] = _MISSING[rng.integers(0, len(_MISSING))]
+        data[col] = values
+    return pd.DataFrame(data)
+
+
+def edge_cases() -> List[tuple]:
+    """(name, frame, issuer) covering the dtype corners of the old pipeline."""
+    n = 4
+    idx = pd.Index([10, 11, 12, 13])
+    cases = [
+        ("empty", pd.DataFrame(), None),
+        ("no rows", pd.DataFrame(columns=["product", "tenor"]), None),
+        ("all missing", pd.DataFrame({c: [None, "", " ", "nan"] for c in _POOLS}, index=idx), None),
+        ("ints as objects", pd.DataFrame({
+            "product": pd.Series([1, 2, 3, 4], dtype=object),
+            "tenor": pd.Series([12, 24, 6, 1], dtype=object),
+            "currency": pd.Series([1.5, "x", None, 2], dtype=object),
+            "underlying_1": pd.Series([1, " ", 2, 3], dtype=object),
+            "autocall_frequency": ["nan", "None", "", None],
+        }), None),
+        ("numeric dtypes", pd.DataFrame({
+            "coupon": [8.5, 9.0, np.nan, 10.0],
+            "tenor": [12, 24, 6, 18],
+            "strike": pd.array([100, None, 95, 90], dtype="Int64"),
+            "no_call_period": [0, 3, 6, 0],
+            "barrier_type": [1.0, np.nan, 2.0, 3.0],
+            "underlying_1": [np.nan] * n,
+            "product": [True, False, True, np.nan],
+            "table_index": [0, 0, 1, 1],
+        }), None),
+        ("long decimals", pd.DataFrame({
+            "reoffer": 100 - (100 - np.array([90.0, 98.5, 99.9, np.nan])) / 1.08,
+            "coupon": np.array([1, 2, 3, 7]) / 3,
+            "tenor": np.array([12, 18, 24, 36]) / 7,
+            "no_call_period": np.array([0, 1, 2, 5]) / 9,
+        }), None),
+        ("bools", pd.DataFrame({"product": [True, " ", False, True], "tenor": [True, False, True, None]}), None),
+    ]
+    bofa = synthetic_frame(200, seed=3)
+    cases.append(("bofa", bofa, "bofa"))
+    cases.append(("bofa ints", pd.DataFrame({"no_call_period": [0, 2, None, 3]}), "BofA"))
+    dup = synthetic_frame(50, seed=4)[["product", "coupon", "tenor"]]
+    dup.columns = ["product", "coupon", "coupon"]
+    cases.append(("duplicates", dup, None))
+    for seed in range(5):
+        cases.append((f"synthetic {seed}", synthetic_frame(500, seed=seed, missing=0.1 * seed), "gs"))
+        cases.append((f"strings {seed}", synthetic_frame(500, seed=seed, missing=0.1 * seed, mixed=False), "gs"))
+    return cases
+
+
+def canonical_input(df: pd.DataFrame, issuer: str | None = None) -> pd.DataFrame:
+    """`df` with each column through `canonical_na` and its number columns parsed (other duplicate names kept)."""
+    units = dict(_NUMBER_UNITS)
+    if (issuer or "").lower() != "bofa":
+        units["no_call_period"] = _PERIODS
+    # Duplicate number columns are merged before they are read, as in the cleanup
+    dup = set(df.columns[df.columns.duplicated()]) & set(units)
+    out = _merge_duplicates(df, dup) if dup else df.copy()
+    for i, name in enumerate(out.columns):
+        s = canonical_na(out.iloc[:, i])
+        out.isetitem(i, parse_numbers(s, units[name]) if name in units else s)
+    return out
+
+
+# Edge cases whose floats the reference reads back from their str
+ROUND_TRIP_CASES = {"long decimals"}
+
+
+def assert_same(a: pd.DataFrame, b: pd.DataFrame, exact: bool = True) -> None:
+    if exact:
+        pd.testing.assert_frame_equal(a, b, check_exact=True)
+    else:
+        pd.testing.assert_frame_equal(a, b, check_exact=False, rtol=1e-15, atol=0)
+
+
+def _same(a: pd.DataFrame, b: pd.DataFrame, exact: bool = True) -> Optional[str]:
+    try:
+        assert_same(a, b, exact)
+    except AssertionError as exc:
+        return str(exc).strip().splitlines()[0]
+    return None
+
+
+def check(cases: Optional[List[tuple]] = None) -> Dict[str, Optional[str]]:
+    """Case name → None when both implementations agree, else the first difference."""
+    return {
+        name: _same(
+            apply_schema(reference_cleanup(canonical_input(df, issuer), issuer)),
+            universal_cleanup(df, issuer),
+            exact=name not in ROUND_TRIP_CASES,
+        )
+        for name, df, issuer in (cases if cases is not None else edge_cases())
+    }
+
+
+def _time(func: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _on_path(small: bool, func: Callable[[], object]) -> Callable[[], object]:
+    """`func` with the cleanup forced onto its per-value (`small`) or its vectorized path."""
+    def run():
+        limit = cleanup.SMALL_FRAME_ROWS
+        cleanup.SMALL_FRAME_ROWS = 2**62 if small else -1
+        try:
+            return func()
+        finally:
+            cleanup.SMALL_FRAME_ROWS = limit
+    return run
+
+
+def run(sizes: List[int], repeat: int = 3) -> pd.DataFrame:
+    out = []
+    for rows, mixed in [(r, m) for r in sizes for m in (False, True)]:
+        df = synthetic_frame(rows, mixed=mixed)
+        expected = apply_schema(reference_cleanup(canonical_input(df, "gs"), "gs"))
+        diffs = [_same(expected, _on_path(small, lambda: universal_cleanup(df, "gs"))()) for small in (True, False)]
+        ref_s = _time(lambda: reference_cleanup(df, "gs"), repeat)
+        small_s = _time(_on_path(True, lambda: universal_cleanup(df, "gs")), repeat)
+        vec_s = _time(_on_path(False, lambda: universal_cleanup(df, "gs")), repeat)
+        new_s = small_s if rows <= cleanup.SMALL_FRAME_ROWS else vec_s
+        out.append({
+            "rows": rows,
+            "cells": "mixed" if mixed else "strings",
+            "reference ms": round(ref_s * 1000, 2),
+            "per-value ms": round(small_s * 1000, 2),
+            "vectorized ms": round(vec_s * 1000, 2),
+            "speed-up": round(ref_s / new_s, 1) if new_s else None,
+            "equal": all(d is None for d in diffs),
+        })
+    return pd.DataFrame(out)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Check and time universal_cleanup against the former implementation")
+    ap.add_argument("--rows", type=int, nargs="+", default=[10, 20, 50, 1_000, 10_000, 100_000],
+                    help="benchmark frame sizes")
+    ap.add_argument("--repeat", type=int, default=3, help="timing runs per size (best is kept)")
+    args = ap.parse_args(argv)
+
+    failures = {name: diff for name, diff in check().items() if diff is not None}
+    for name, diff in failures.items():
+        print(f"DIFF {name}: {diff}")
+    res = run(args.rows, repeat=args.repeat)
+    print(f"speed-up: reference against the path taken (per-value up to {cleanup.SMALL_FRAME_ROWS} rows)")
+    print(res.to_string(index=False))
+    return 0 if not failures and res["equal"].all() else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,127 @@
+"""
+Benchmark of the table engines per issuer: `python -m benchmarks.bench_engines`.
+
+For every issuer with an lxml extractor, one email body is parsed with the
+bs4 engine (`parse_email_html` + Extractors.py) and with the lxml engine
+(`fast_extractors.extract_fast`), both with quoted history dropped as in a
+real run. Both results must be equal; the table shows ms per email.
+
+Sample bodies are synthetic by default (an Outlook-style mail with a style
+block, the pricing table, a disclaimer and a quoted older pricing). Pass
+`--samples DIR` to use real ones instead: files named `<issuer>*.html`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+from app_core.email_integration import parse_email_html
+from app_core.extractors import extract_for_issuer
+from app_core.fast_extractors import TABLE_SPECS, extract_fast
+from app_core.sources import decode_html_bytes
+
+
+_GENERIC = ["Product", "Currency", "Underlying", "Tenor (m)", "Strike (%)", "Barrier (%)", "Coupon p.a. (%)"]
+
+_HEADERS: Dict[str, List[str]] = {
+    "gs": _GENERIC,
+    "bnp": ["Product", "Currency", "Underlying", "Tenor", "Coupon", "Exit Rate"],
+    "swissquote": ["Product Type", "Currency", "Underlying", "Tenor", "Strike"],
+}
+
+# Issuers whose extractor only reads <td> cells
+_TD_ONLY = {"barclays", "lukb"}
+
+
+def _cell(tag: str, text: str) -> str:
+    return f'<{tag} style="border:1px solid #ccc;padding:2px 6px"><span style="font-family:Arial">{text}</span></{tag}>'
+
+
+def synthetic_html(issuer: str, rows: int = 40) -> str:
+    headers = _HEADERS.get(issuer, _GENERIC)
+    head_tag = "td" if issuer in _TD_ONLY else "th"
+    body = ["<tr>" + "".join(_cell(head_tag, h) for h in headers) + "</tr>"]
+    for i in range(rows):
+        vals = [f"Val {i}-{j} &amp; more" for j in range(len(headers))]
+        if issuer == "swissquote":
+            vals[0] = f"{3 + i % 7}.25 (coupon p.a.) Reverse Convertible"
+        body.append("<tr>" + "".join(_cell("td", v) for v in vals) + "</tr>")
+    table = '<table cellpadding="0" cellspacing="0">' + "".join(body) + "</table>"
+    style = "<style>" + "p.MsoNormal{margin:0cm;font-size:11pt}" * 40 + "</style>"
+    meta = "<p>TraceId: ABC123 Pricing Reference IDs: PR42 Ref : X-9</p>" if issuer == "barclays" else ""
+    disclaimer = "<p class=MsoNormal>" + "This message is confidential. " * 60 + "</p>"
+    quoted = f"<blockquote><p>Older pricing</p>{table}</blockquote>"
+    return (
+        f"<html><head><meta charset='utf-8'>{style}</head><body>"
+        f"<div><p class=MsoNormal>Dear client, please find our prices below.</p>{meta}{table}"
+        f"{disclaimer}{quoted}</div></body></html>"
+    )
+
+
+def load_samples(directory: Optional[str]) -> Dict[str, List[str]]:
+    samples: Dict[str, List[str]] = {}
+    for issuer in TABLE_SPECS:
+        if directory:
+            files = sorted(Path(directory).glob(f"{issuer}*.htm*"))
+            if files:
+                samples[issuer] = [decode_html_bytes(p.read_bytes()) for p in files]
+        else:
+            samples[issuer] = [synthetic_html(issuer)]
+    return samples
+
+
+def _time(func: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _same(a: Optional[pd.DataFrame], b: Optional[pd.DataFrame]) -> bool:
+    if a is None or b is None:
+        return a is None and b is None
+    return a.equals(b) and list(a.columns) == list(b.columns)
+
+
+def run(samples: Dict[str, List[str]], repeat: int = 5) -> pd.DataFrame:
+    out = []
+    for issuer, bodies in samples.items():
+        bs4_s = lxml_s = 0.0
+        same = True
+        for html in bodies:
+            same &= _same(extract_for_issuer(parse_email_html(html), issuer), extract_fast(html, issuer, clean=True))
+            bs4_s += _time(lambda: extract_for_issuer(parse_email_html(html), issuer), repeat)
+            lxml_s += _time(lambda: extract_fast(html, issuer, clean=True), repeat)
+        n = len(bodies)
+        out.append({
+            "issuer": issuer,
+            "emails": n,
+            "kb/email": round(sum(len(h) for h in bodies) / n / 1024, 1),
+            "bs4 ms": round(bs4_s / n * 1000, 2),
+            "lxml ms": round(lxml_s / n * 1000, 2),
+            "speed-up": round(bs4_s / lxml_s, 1) if lxml_s else None,
+            "equal": same,
+        })
+    return pd.DataFrame(out)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Compare the bs4 and lxml table engines per issuer")
+    ap.add_argument("--samples", help="directory with <issuer>*.html sample bodies (default: synthetic)")
+    ap.add_argument("--repeat", type=int, default=5, help="timing runs per email (best is kept)")
+    args = ap.parse_args(argv)
+
+    res = run(load_samples(args.samples), repeat=args.repeat)
+    print(res.to_string(index=False))
+    return 0 if res["equal"].all() else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
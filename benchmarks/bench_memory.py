@@ -0,0 +1,183 @@
+"""
+Peak memory of an analyst session, with and without copy-on-write: `python -m benchmarks.bench_memory`.
+
+A session is replayed on synthetic raw tables (`bench_normalizers`), 50k
+rows by default spread over its issuers: normalize every table, concatenate
+the results into `df_all`, then take the app's views of it (version key,
+issuer filter, confirmed selection with abbreviated issuers).
+
+Two modes, each measured in a fresh interpreter so their peaks do not mix:
+
+- "copies": pandas without copy-on-write and the defensive copies the
+  pipeline used to take (normalizer input, normalizer output, cleanup input,
+  three `df_all.copy()`s in the app)
+- "cow": the current code, copy-on-write and no defensive copies
+
+Reported per mode: peak RSS of the process (where the platform exposes it,
+not on Windows), its increase over the RSS before the session, and the
+peak of memory allocated during the session (`tracemalloc`, which sees the
+numpy buffers too). Both modes must produce the same confirmed rows.
+
+A second table compares the session's `df_all` with the canonical schema
+(`cleanup.SCHEMA`) against the same frame untyped (object text, float64
+numbers, as cleanup returned it before): bytes per row and the time of
+the app's per-issuer best value and per-version aggregation groupbys.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, List, Optional
+
+import pandas as pd
+
+from benchmarks.bench_normalizers import _RAW_HEADERS, synthetic_table
+from app_core.cleanup import SCHEMA, concat_cleaned, universal_cleanup
+from app_core.normalizers import normalize, normalize_issuer
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+MODES = ("copies", "cow")
+
+
+def _peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def _normalize(df: pd.DataFrame, issuer: str, copies: bool) -> Optional[pd.DataFrame]:
+    if not copies:
+        return normalize(df, issuer)
+    # Without copy-on-write `assign` in normalize_issuer is the former cand.copy()
+    dfn = normalize_issuer(df.copy(), issuer)
+    return None if dfn is None else universal_cleanup(dfn.copy(), issuer)
+
+
+def session_frame(tables: List[tuple], copies: bool = False) -> pd.DataFrame:
+    """`df_all` of a session: `tables` ((issuer, raw frame) pairs) normalized and concatenated."""
+    frames = [_normalize(df, issuer, copies) for issuer, df in tables]
+    return concat_cleaned([f for f in frames if f is not None], ignore_index=True)
+
+
+def session(tables: List[tuple], copies: bool) -> pd.DataFrame:
+    """Normalize `tables` ((issuer, raw frame) pairs) and take the app's views; the confirmed rows."""
+    df_all = session_frame(tables, copies)
+
+    key = df_all["currency"].astype(str) + "_" + df_all["product"].astype(str)
+    versions = (df_all.copy() if copies else df_all).assign(_version_key=key)
+    selected = versions["_version_key"].value_counts().index[:2]
+    df_view = (df_all.copy() if copies else df_all).assign(_version_key=key)
+    out = df_view[df_view["_version_key"].isin(selected)]
+    if copies:
+        out = out.copy()
+    out = out.sort_values(by=["coupon"], kind="stable")
+    out["issuer"] = out["issuer"].str.upper()
+    return out
+
+
+def measure(mode: str, rows: int) -> dict:
+    """Run one session in this process; `mode` must be set before anything else allocates."""
+    pd.set_option("mode.copy_on_write", mode == "cow")
+    issuers = sorted(_RAW_HEADERS)
+    tables = [(issuer, synthetic_table(issuer, rows // len(issuers), seed=i)) for i, issuer in enumerate(issuers)]
+    rss_before = _peak_rss_mb()
+    tracemalloc.start()
+    out = session(tables, copies=mode == "copies")
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_peak = _peak_rss_mb()
+    return {
+        "mode": mode,
+        "rows": sum(len(df) for _, df in tables),
+        "peak RSS MB": None if rss_peak is None else round(rss_peak, 1),
+        "RSS increase MB": None if rss_peak is None else round(rss_peak - rss_before, 1),
+        "peak allocated MB": round(peak / 2**20, 1),
+        "confirmed rows": len(out),
+        "digest": int(pd.util.hash_pandas_object(out.drop(columns="_version_key"), index=False).sum()),
+    }
+
+
+def _untyped(df: pd.DataFrame) -> pd.DataFrame:
+    types = {
+        name: object if str(dtype) == "category" or isinstance(dtype, pd.CategoricalDtype) else "float64"
+        for name, dtype in SCHEMA.items()
+        if name in df.columns
+    }
+    return df.astype(types)
+
+
+def _time(func: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def schema_report(rows: int, repeat: int = 5) -> pd.DataFrame:
+    """Bytes per row and groupby ms of a session frame, untyped and with SCHEMA."""
+    issuers = sorted(_RAW_HEADERS)
+    tables = [(issuer, synthetic_table(issuer, rows // len(issuers), seed=i)) for i, issuer in enumerate(issuers)]
+    df_all = session_frame(tables)
+    keys = ["currency", "product", "underlying_1", "barrier_type", "autocall_frequency"]
+    out = []
+    for name, df in (("untyped", _untyped(df_all)), ("schema", df_all)):
+        out.append({
+            "frame": name,
+            "bytes/row": round(df.memory_usage(deep=True).sum() / len(df), 1),
+            "best per issuer ms": round(1000 * _time(
+                lambda: df.groupby("issuer", observed=True)["coupon"].max(), repeat), 2),
+            "per version ms": round(1000 * _time(
+                lambda: df.groupby(keys, observed=True, dropna=False).agg(
+                    rows=("coupon", "size"), metric=("coupon", "mean"), tenor=("tenor", "max")), repeat), 2),
+        })
+    return pd.DataFrame(out)
+
+
+def run(rows: int) -> pd.DataFrame:
+    """Measure every mode in a child interpreter."""
+    out = []
+    for mode in MODES:
+        proc = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_memory", "--child", mode, "--rows", str(rows)],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        out.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+    res = pd.DataFrame(out)
+    res["equal"] = res["digest"] == res["digest"].iloc[0]
+    return res.drop(columns="digest")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Peak memory of a session with and without copy-on-write")
+    ap.add_argument("--rows", type=int, default=50_000, help="rows of the session")
+    ap.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    args = ap.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(measure(args.child, args.rows)))
+        return 0
+    res = run(args.rows)
+    print(res.to_string(index=False))
+    print()
+    print(schema_report(args.rows).to_string(index=False))
+    return 0 if res["equal"].all() else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,294 @@
+"""
+Equivalence check and benchmark of the vectorized legacy normalizer steps:
+`python -m benchmarks.bench_normalizers`.
+
+The row-wise steps of Normalizers.py/Extractors.py (BofA's `convert_no_call`
+apply, the CIBC underlying split, the MS call/put strike masks, the BBVA
+coupon apply, Swissquote's tenor/first-observation parsing and coupon loop)
+are kept here verbatim as references. Per issuer, each vectorized step must
+give the same values on synthetic RFQ columns; both are timed, and so is
+the whole `normalize()` for that issuer's synthetic table.
+
+tests/test_normalizers.py runs the checks: the steps on these synthetic
+columns, and `normalize()` with the steps of `LEGACY_STEPS` swapped back
+in against the current one on the raw tables saved in tests/fixtures.
+
+Two references are not run on inputs they crash on: MS without a put
+strike column (`df.get(..., pd.NA).astype`) and Swissquote first
+observations that `eval` rejects; the vectorized steps return NaN there.
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+import Normalizers as N
+from app_core.fast_extractors import _swissquote_coupon
+from app_core.normalizers import normalize
+
+
+# ---- references (the former row-wise code) ----
+
+def ref_bofa_no_call(df: pd.DataFrame) -> pd.Series:
+    freq_to_months = {"Monthly": 1, "Quarterly": 3, "Semi-Annual": 6, "Annual": 12}
+
+    def convert_no_call(row):
+        months = row.get("no_call_period", None)
+        freq = row.get("autocall_frequency", "")
+        if pd.isna(months):
+            return pd.NA
+        months_per_period = freq_to_months.get(str(freq).strip().title(), 6)
+        periods_skipped = months / months_per_period
+        return max(round(periods_skipped - 1), 0)
+
+    return df.apply(convert_no_call, axis=1).astype("Int64")
+
+
+def ref_cibc_underlyings(raw: pd.Series) -> pd.DataFrame:
+    split_cols = raw.astype(str).str.split(r"[;,]", expand=True)
+    for i in range(5 - split_cols.shape[1]):
+        split_cols[split_cols.shape[1] + i] = None
+    split_cols = split_cols.iloc[:, :5]
+    return split_cols.apply(
+        lambda col: col.str.strip().str.replace(" Equity", "", regex=False)
+        if col.dtype == "object" else col
+    )
+
+
+def ref_ms_strike(call: pd.Series, put: pd.Series) -> pd.Series:
+    strike = pd.Series(np.nan, index=call.index, dtype=float)
+    both = call.notna() & put.notna()
+    strike[both & (call != 100) & (put == 100)] = call[both & (call != 100) & (put == 100)]
+    strike[both & (put != 100) & (call == 100)] = put[both & (put != 100) & (call == 100)]
+    strike[both & (call != 100) & (put != 100)] = call[both & (call != 100) & (put != 100)]
+    strike[both & (call == 100) & (put == 100)] = 100
+    strike[call.notna() & put.isna()] = call[call.notna() & put.isna()]
+    strike[put.notna() & call.isna()] = put[put.notna() & call.isna()]
+    return strike
+
+
+def ref_bbva_coupon(df: pd.DataFrame) -> pd.Series:
+    annual_factors = {"Monthly": 12, "Quarterly": 4, "Semi-Annual": 2, "Annual": 1}
+    return df.apply(
+        lambda row: row["coupon"] * annual_factors.get(row["autocall_frequency"], 1)
+        if pd.notna(row["coupon"]) else row["coupon"],
+        axis=1
+    )
+
+
+def ref_swissquote_tenor(s: pd.Series) -> pd.Series:
+    def parse_tenor(x):
+        if pd.isna(x):
+            return pd.NA
+        s = str(x).strip().upper()
+        if not s:
+            return pd.NA
+        match = re.match(r"(?:(\d+)\s*Y)?\s*(?:(\d+)\s*M)?", s)
+        if match:
+            years = int(match.group(1)) if match.group(1) else 0
+            months = int(match.group(2)) if match.group(2) else 0
+            total = years * 12 + months
+            return total if total > 0 else pd.NA
+        return pd.NA
+
+    return s.map(parse_tenor)
+
+
+def ref_swissquote_first_obs(s: pd.Series) -> pd.Series:
+    s = s.astype(str).str.replace("M", "", regex=False).str.replace("Y", "*12", regex=False)
+    return s.apply(lambda x: eval(x) if isinstance(x, str) and "*" in x else x)
+
+
+def ref_swissquote_coupon(first_col: pd.Series) -> list:
+    coupons = []
+    for val in first_col:
+        m = re.search(r"([\d\.,]+)\s*\(coupon p\.a\.\)", val, flags=re.I)
+        coupons.append(m.group(1).replace(",", ".") if m else None)
+    return coupons
+
+
+# Normalizers.py helper → its reference, called the same way
+LEGACY_STEPS: Dict[str, Callable] = {
+    "_bofa_no_call_periods": ref_bofa_no_call,
+    "_cibc_underlyings": ref_cibc_underlyings,
+    "_ms_strike": ref_ms_strike,
+    "_bbva_annual_coupon": ref_bbva_coupon,
+    "_tenor_ym_months": ref_swissquote_tenor,
+}
+
+
+# ---- vectorized steps, as called by the normalizers and extractors ----
+
+def new_swissquote_first_obs(s: pd.Series) -> pd.Series:
+    return N.parse_numbers(s, N.MONTHS)
+
+
+def new_swissquote_coupon(first_col: pd.Series) -> pd.Series:
+    return _swissquote_coupon(first_col.to_frame(), None)["Coupon Rate (%)"]
+
+
+# ---- synthetic RFQ columns ----
+
+def _pick(rng: np.random.Generator, pool: list, rows: int) -> pd.Series:
+    values = np.empty(rows, dtype=object)
+    values[:] = [pool[i] for i in rng.integers(0, len(pool), rows)]
+    return pd.Series(values)
+
+
+_FREQS = ["Monthly", "Quarterly", " semi-annual ", "Annual", "weekly", np.nan, None]
+_BASKETS = ["SX5E Equity; SPX Equity", "NKY Index, SMI Index,RTY", "AAPL UW Equity", "A;B;C;D;E;F", "", np.nan]
+_TENORS = ["1Y6M", "2Y", "6M", " 18 m", "3y 3m", "12", "", "abc", np.nan, 12]
+
+
+def synthetic_steps(rows: int, seed: int = 0) -> Dict[str, Dict[str, tuple]]:
+    """issuer → step → (reference call, vectorized call, comparable form)."""
+    rng = np.random.default_rng(seed)
+    months = pd.Series(rng.choice([0, 1, 3, 6, 7.5, 12, 18, np.nan], rows))
+    bofa = pd.DataFrame({"no_call_period": months, "autocall_frequency": _pick(rng, _FREQS, rows)})
+    bofa_nofreq = bofa[["no_call_period"]]
+    baskets = _pick(rng, _BASKETS, rows)
+    call = pd.Series(rng.choice([100.0, 95.0, 80.0, np.nan], rows))
+    put = pd.Series(rng.choice([100.0, 60.0, 100.0, np.nan], rows))
+    bbva = pd.DataFrame({
+        "coupon": pd.Series(rng.choice([0.5, 1.25, 2.0, np.nan], rows)),
+        "autocall_frequency": _pick(rng, ["Monthly", "Quarterly", "Semi-Annual", "Annual", "3M", "nan"], rows),
+    })
+    bbva_int = bbva.assign(coupon=rng.integers(1, 4, rows))
+    tenors = _pick(rng, _TENORS, rows)
+    first_obs = _pick(rng, ["12", "1Y", "2Y", "6M", "nan", "1.5Y", "3Y"], rows)
+    first_col = _pick(rng, ["7.25 (coupon p.a.) Phoenix", "5,5 (Coupon P.A.)", "Reverse Convertible", ""], rows)
+
+    grid = lambda d: d.set_axis(range(d.shape[1]), axis=1).astype(object).where(d.notna(), np.nan)
+    return {
+        "bofa": {
+            "no_call_period": (lambda: ref_bofa_no_call(bofa), lambda: N._bofa_no_call_periods(bofa), None),
+            "no_call_period (no freq)": (
+                lambda: ref_bofa_no_call(bofa_nofreq), lambda: N._bofa_no_call_periods(bofa_nofreq), None
+            ),
+        },
+        "cibc": {
+            "underlyings": (lambda: ref_cibc_underlyings(baskets), lambda: N._cibc_underlyings(baskets), grid),
+        },
+        "ms": {
+            "strike": (lambda: ref_ms_strike(call, put), lambda: N._ms_strike(call, put), None),
+        },
+        "bbva": {
+            "coupon": (lambda: ref_bbva_coupon(bbva), lambda: N._bbva_annual_coupon(bbva), None),
+            "coupon (int)": (lambda: ref_bbva_coupon(bbva_int), lambda: N._bbva_annual_coupon(bbva_int), None),
+        },
+        "swissquote": {
+            "tenor": (lambda: ref_swissquote_tenor(tenors), lambda: N._tenor_ym_months(tenors),
+                      lambda s: pd.Series(s).astype("Int64")),
+            "first observation": (lambda: ref_swissquote_first_obs(first_obs),
+                                  lambda: new_swissquote_first_obs(first_obs),
+                                  lambda s: pd.to_numeric(pd.Series(s), errors="coerce")),
+            "coupon": (lambda: ref_swissquote_coupon(first_col), lambda: new_swissquote_coupon(first_col),
+                       lambda s: pd.Series(list(s), dtype=object)),
+        },
+    }
+
+
+_RAW_HEADERS: Dict[str, Dict[str, list]] = {
+    "bofa": {
+        "Product": ["Phoenix", "Autocall"], "Coupon p.a. (%)": ["8.5", "7,25%"], "Currency": ["EUR", "USD"],
+        "Tenor (m)": ["12", "24"], "Strike": ["100%"], "KI Barrier (%)": ["60"], "Barrier Type": ["Continuous"],
+        "Autocall Barrier": ["100"], "Autocall Frequency": ["Monthly", "Quarterly"],
+        "No Call Period": ["3m", "6m", "12M"], "Reoffer (%)": ["1.5", "98.5"],
+        "Underlyings": ["SX5E Index;SPX Index", "NKY Index;SMI Index;AAPL UW Equity"],
+    },
+    "cibc": {
+        "Client Ref": ["Ref A", "Ref B"], "Pricing Ccy": ["USD", "CAD"], "Term": ["12M", "18M"], "Price": ["99.5%"],
+        "Coupon per Period": ["2,5%", "1.75%"], "Principal Barrier": ["60%"], "Underlying(s)": ["SPX Equity; RTY", "NDX, SX5E Equity"],
+        "Barrier Monitoring": ["European"], "Auto-Call Barrier": ["100%"], "Auto-Call Freq": ["Quarterly", "Annual"],
+        "Auto-Call Start": ["12M", "24M"], "Put Strike": ["100%"],
+    },
+    "ms": {
+        "Product": ["Phoenix"], "Currency": ["EUR", "USD"], "Tenor (m)": ["12", "18"],
+        "Call Strike (%)": ["100", "95%"], "Put Strike (%)": ["100", "60"], "KI Barrier (%)": ["60"],
+        "Coupon p.a. (%)": ["8.5"], "Early Termination Level (%)": ["100"], "Frequency": ["3", "Quarterly"],
+        "BBG Code 1": ["SX5E Index", "NKY.N"],
+    },
+    "bbva": {
+        "Product": ["Phoenix"], "Currency": ["EUR"], "Tenor": ["12m", "24M"], "Strike (%)": ["100"],
+        "KI Barrier (%)": ["60,5"], "Coupon (%)": ["0.5", "1,25"], "Frequency (1m, 3m, 6m, 12m)": ["1M", "3M", "12M"],
+        "Reoffer (%)": ["99"], "BBG Code 1": ["SX5E Index"],
+    },
+    "swissquote": {
+        "Product Type": ["Barrier Reverse Convertible"], "Currency": ["CHF", "EUR"], "Maturity": ["1Y6M", "2Y", "6M"],
+        "Coupon Rate (%)": ["7.25 (coupon p.a.)", "5,5"], "Strike (%)": ["100"], "Barrier level (%)": ["60"],
+        "Frequency": ["Quarterly", "Monthly"], "First Observation": ["1Y", "6M"], "Stock identifier 1": ["NESN SE", "ROG SW"],
+    },
+}
+
+
+def synthetic_table(issuer: str, rows: int, seed: int = 0) -> pd.DataFrame:
+    """Raw extracted RFQ table for `issuer` with `rows` lines."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({h: _pick(rng, pool, rows) for h, pool in _RAW_HEADERS[issuer].items()})
+
+
+# ---- runner ----
+
+def _time(func: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _same(a, b, form) -> Optional[str]:
+    if form is not None:
+        a, b = form(a), form(b)
+    try:
+        if isinstance(a, pd.DataFrame):
+            pd.testing.assert_frame_equal(a, b, check_exact=True)
+        else:
+            pd.testing.assert_series_equal(a, b, check_exact=True, check_names=False)
+    except AssertionError as exc:
+        return str(exc).strip().splitlines()[0]
+    return None
+
+
+def run(sizes: List[int], repeat: int = 3) -> pd.DataFrame:
+    out = []
+    for rows in sizes:
+        for issuer, steps in synthetic_steps(rows).items():
+            for step, (ref, new, form) in steps.items():
+                diff = _same(ref(), new(), form)
+                ref_s, new_s = _time(ref, repeat), _time(new, repeat)
+                out.append({
+                    "issuer": issuer, "step": step, "rows": rows,
+                    "reference ms": round(ref_s * 1000, 2), "vectorized ms": round(new_s * 1000, 2),
+                    "speed-up": round(ref_s / new_s, 1) if new_s else None,
+                    "equal": diff is None, "diff": diff or "",
+                })
+            table = synthetic_table(issuer, rows)
+            out.append({
+                "issuer": issuer, "step": "normalize()", "rows": rows,
+                "vectorized ms": round(_time(lambda: normalize(table, issuer), repeat) * 1000, 2),
+                "equal": normalize(table, issuer) is not None, "diff": "",
+            })
+    return pd.DataFrame(out)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Check and time the vectorized legacy normalizer steps")
+    ap.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 100_000], help="synthetic RFQ sizes")
+    ap.add_argument("--repeat", type=int, default=3, help="timing runs per step (best is kept)")
+    args = ap.parse_args(argv)
+
+    res = run(args.rows, repeat=args.repeat)
+    print(res.to_string(index=False))
+    return 0 if res["equal"].all() else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
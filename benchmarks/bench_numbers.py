@@ -0,0 +1,161 @@
+"""
+Equivalence check and benchmark of `numbers.parse_numbers`: `python -m benchmarks.bench_numbers`.
+
+The string chains the normalizers and the cleanup used to read numbers
+with (`astype(str)`, `str.replace` of "%", "," or "m", `to_numeric`) are
+kept here as references. On synthetic 100k-row columns, per chain:
+
+- every cell the chain read must come out of the kernel unchanged
+- cells the chain left NaN that the kernel reads (comma decimals,
+  thousands separators, unicode minus, "1Y" tenors) are counted
+- both are timed, on columns of a few hundred distinct quotes (what RFQ
+  tables look like) and on all-distinct ones (the kernel's worst case)
+
+Two more rows time what one parse per column saves: a normalizer chain
+followed by the cleanup's former re-parse of its floats, against the
+kernel (whose cleanup call returns the floats as they are), and a column
+parsed twice inside and outside of `number_pass()`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from app_core.columns import by_distinct
+from app_core.numbers import MONTHS, number_pass, parse_numbers
+
+
+# ---- former chains, as the normalizers and the cleanup called them ----
+
+def ref_percent(s: pd.Series) -> pd.Series:
+    return pd.to_numeric(s.astype(str).str.replace("%", "", regex=False), errors="coerce")
+
+
+def ref_percent_comma(s: pd.Series) -> pd.Series:
+    s = s.astype(str).str.replace("%", "", regex=False).str.replace(",", ".", regex=False)
+    return pd.to_numeric(s, errors="coerce")
+
+
+def ref_months(s: pd.Series) -> pd.Series:
+    s = s.astype(str).str.replace("m", "", case=False, regex=False)
+    return pd.to_numeric(s, errors="coerce")
+
+
+def ref_cleanup_percent(s: pd.Series) -> pd.Series:
+    """The cleanup's former `_percent_number`, run again on the normalizer's output."""
+    if isinstance(s.dtype, np.dtype) and s.dtype.kind in "iu" and len(s) > 0:
+        return s
+    return by_distinct(
+        s.astype(str),
+        lambda u: pd.to_numeric(u.str.replace("%", "", regex=False), errors="coerce"),
+    )
+
+
+# ---- synthetic quotes ----
+
+def _column(rng: np.random.Generator, rows: int, distinct: Optional[int], spell: Callable[[float], str],
+            odd: List[str]) -> pd.Series:
+    """`rows` quotes: `spell` of `distinct` random levels (None: one per row), plus a few `odd` spellings."""
+    levels = np.round(rng.uniform(0.5, 120.0, distinct or rows), 2)
+    picks = rng.integers(0, len(levels), rows) if distinct else np.arange(rows)
+    values = np.array([spell(v) for v in levels], dtype=object)[picks]
+    extra = rng.random(rows) < 0.05
+    values[extra] = np.array(odd, dtype=object)[rng.integers(0, len(odd), int(extra.sum()))]
+    return pd.Series(values)
+
+
+_ODD = ["n/a", "", None, "12,5%", "1,250.50", "−1.5", "7,25 %", "1.250,5"]
+_ODD_MONTHS = ["", None, "1Y", "2 y", "1,5Y", "18 M", "abc"]
+
+
+def columns(rows: int, distinct: Optional[int], seed: int = 0) -> Dict[str, tuple]:
+    """Chain name → (raw column, former chain, kernel call)."""
+    rng = np.random.default_rng(seed)
+    percent = _column(rng, rows, distinct, lambda v: f"{v:g}%", _ODD)
+    comma = _column(rng, rows, distinct, lambda v: f"{v:g}".replace(".", ",") + "%", _ODD)
+    months = _column(rng, rows, distinct, lambda v: f"{v:g}m", _ODD_MONTHS)
+    return {
+        "percent": (percent, ref_percent, parse_numbers),
+        "percent, comma": (comma, ref_percent_comma, parse_numbers),
+        "months": (months, ref_months, lambda s: parse_numbers(s, MONTHS)),
+        "percent + cleanup": (
+            percent,
+            lambda s: ref_cleanup_percent(ref_percent(s)),
+            lambda s: parse_numbers(parse_numbers(s)),
+        ),
+    }
+
+
+def _twice(s: pd.Series) -> None:
+    parse_numbers(s)
+    parse_numbers(s)
+
+
+def _twice_in_pass(s: pd.Series) -> None:
+    with number_pass():
+        parse_numbers(s)
+        parse_numbers(s)
+
+
+# ---- check and timing ----
+
+def compare(ref: pd.Series, new: pd.Series) -> tuple:
+    """(cells the chain read that the kernel changed, cells only the kernel read)."""
+    read = ref.notna().to_numpy()
+    changed = int((new.to_numpy(dtype="float64")[read] != ref.to_numpy(dtype="float64")[read]).sum())
+    return changed, int((~read & new.notna().to_numpy()).sum())
+
+
+def _time(func: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(rows: int, repeat: int = 3) -> pd.DataFrame:
+    out = []
+    for label, distinct in (("quotes", 500), ("all distinct", None)):
+        cols = columns(rows, distinct)
+        for name, (s, ref, new) in cols.items():
+            changed, newly_read = compare(ref(s), new(s))
+            ref_s = _time(lambda: ref(s), repeat)
+            new_s = _time(lambda: new(s), repeat)
+            out.append({
+                "column": label, "chain": name, "rows": rows,
+                "chain ms": round(ref_s * 1000, 1), "kernel ms": round(new_s * 1000, 1),
+                "speed-up": round(ref_s / new_s, 1) if new_s else None,
+                "newly read": newly_read, "equal": changed == 0,
+            })
+        s = cols["percent"][0]
+        ref_s = _time(lambda: _twice(s), repeat)
+        new_s = _time(lambda: _twice_in_pass(s), repeat)
+        out.append({
+            "column": label, "chain": "parsed twice, number_pass()", "rows": rows,
+            "chain ms": round(ref_s * 1000, 1), "kernel ms": round(new_s * 1000, 1),
+            "speed-up": round(ref_s / new_s, 1) if new_s else None,
+            "newly read": 0, "equal": True,
+        })
+    return pd.DataFrame(out)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Check and time the numeric parsing kernel against the former chains")
+    ap.add_argument("--rows", type=int, default=100_000, help="column length")
+    ap.add_argument("--repeat", type=int, default=3, help="timing runs per chain (best is kept)")
+    args = ap.parse_args(argv)
+
+    res = run(args.rows, repeat=args.repeat)
+    print(res.to_string(index=False))
+    return 0 if res["equal"].all() else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
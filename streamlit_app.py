@@ -10,13 +10,17 @@ from app_core.extractors import (
     EXTRACTOR_BY_ISSUER,
 )
 from app_core.normalizers import normalize
+from app_core.cleanup import display_frame
 from app_core.email_integration import (
     get_outlook_folder,
     newest_mail_items,
     clean_html_from_mail_item,
     resolve_smtp,
 )
-from app_core.pipeline import run_on_html, run_outlook
+from app_core.pipeline import run_on_html, run_outlook, run_directory, default_workers
+from app_core.cache import get_default_cache
+from app_core.fast_extractors import DEFAULT_ENGINE, ENGINES
+from app_core.preslice import DEFAULT_BUDGET, Preslicer
 
 
 st.set_page_config(page_title="Email Pricer Parser", layout="wide")
@@ -32,6 +36,15 @@ def _build_underlyings_key(row: pd.Series) -> str:
     return "+".join(parts) if parts else "NA"
 
 
+def _key_text(s: pd.Series) -> pd.Series:
+    """Key text of a column as it read before the typed schema: "12.0" and "nan", not "12" and "<NA>"."""
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        s = s.astype(object)
+    elif pd.api.types.is_extension_array_dtype(s.dtype) and pd.api.types.is_numeric_dtype(s.dtype):
+        s = s.astype("float64")
+    return s.astype(str)
+
+
 def _make_key(df: pd.DataFrame, components: List[str]) -> pd.Series:
     cols = []
     for comp in components:
@@ -39,7 +52,7 @@ def _make_key(df: pd.DataFrame, components: List[str]) -> pd.Series:
             cols.append(df.apply(_build_underlyings_key, axis=1))
         else:
             if comp in df.columns:
-                cols.append(df[comp].astype(str).fillna("NA"))
+                cols.append(_key_text(df[comp]).fillna("NA"))
             else:
                 cols.append(pd.Series(["NA"] * len(df), index=df.index))
     if not cols:
@@ -168,7 +181,7 @@ def _best_values_by_issuer(df: pd.DataFrame, column: str, asc: bool) -> dict:
     tmp = pd.concat([df["issuer"], s.rename("val")], axis=1).dropna(subset=["val"])
     if tmp.empty:
         return {}
-    agg = tmp.groupby("issuer")["val"].agg("min" if asc else "max")
+    agg = tmp.groupby("issuer", observed=True)["val"].agg("min" if asc else "max")
     return agg.to_dict()
 
 def _format_var_value(val: Optional[float], var: str) -> str:
@@ -309,11 +322,32 @@ def _build_issuer_compare_table_df(
 
 
 with st.sidebar:
-    st.header("Outlook Folder")
-    st.info("Requires Outlook/pywin32 on this machine.")
-    mailbox = st.text_input("Mailbox SMTP or display name", value="boulbenmeyer@calebocapital.ch")
-    folder_path = st.text_input("Folder path (use '/' for nesting)", value="Pricer")
-    n = st.slider("Fetch newest N emails", 5, 200, 40)
+    source_kind = st.radio("Input source", ["Outlook Folder", "Local Directory"], index=0)
+    if source_kind == "Outlook Folder":
+        st.header("Outlook Folder")
+        st.info("Requires Outlook/pywin32 on this machine.")
+        mailbox = st.text_input("Mailbox SMTP or display name", value="boulbenmeyer@calebocapital.ch")
+        folder_path = st.text_input("Folder path (use '/' for nesting)", value="Pricer")
+        n = st.slider("Fetch newest N emails", 5, 200, 40)
+        incremental = st.checkbox(
+            "Incremental sync",
+            value=True,
+            help="Only fetch mail received since the last sync and append it to the current results",
+        )
+        server_filter = st.checkbox(
+            "Filter in Outlook (known issuer senders only)",
+            value=True,
+            help="Let Outlook restrict the folder to mail items from known issuer domains before enumerating",
+        )
+    else:
+        st.header("Local Directory")
+        archive_dir = st.text_input("Directory with .eml/.html files", value="")
+        default_sender = st.text_input(
+            "Sender for .html files (optional)",
+            value="",
+            help=".eml files carry their own sender; bare .html files use this address",
+        )
+        incremental = False
 
     issuer_keys = [k for k in EXTRACTOR_BY_ISSUER.keys()]
     issuer_override = st.selectbox(
@@ -323,16 +357,123 @@ with st.sidebar:
         help="If set, forces this issuer's extractor/normalizer",
     )
     issuer_override = issuer_override or None
+    cache_available = get_default_cache().enabled
+    use_cache = st.checkbox(
+        "Use parse cache",
+        value=cache_available,
+        disabled=not cache_available,
+        help="Reuse normalized results for emails whose HTML was already parsed by the same code version",
+    )
+    if not cache_available:
+        st.caption("Parse cache is off: it needs pyarrow (`pip install pyarrow`).")
+    workers = st.number_input(
+        "Parse workers",
+        min_value=1,
+        max_value=max(1, os.cpu_count() or 1),
+        value=default_workers(),
+        help="Processes used to parse email HTML in parallel (1 = serial)",
+    )
+    detect_unknown = st.checkbox(
+        "Detect issuer of unknown senders",
+        value=False,
+        help="Identify forwarded pricings from their table headers (loads the body of every unrouted mail; "
+        "combine with the Outlook filter off)",
+    )
+    preslice = st.checkbox(
+        "Pre-slice bodies",
+        value=True,
+        help="Hand only the table regions to the parser: drops inline images, CSS, scripts and reply history",
+    )
+    budget_kb = st.number_input(
+        "Table HTML budget per email (KB)",
+        min_value=16,
+        value=DEFAULT_BUDGET // 1024,
+        step=256,
+        disabled=not preslice,
+    )
+    engine = st.selectbox(
+        "Table engine",
+        list(ENGINES),
+        index=ENGINES.index(DEFAULT_ENGINE),
+        help="lxml streams tables without building a full document (faster); issuers it does not cover use bs4",
+    )
+    multi_table = st.checkbox(
+        "Extract all tables per email",
+        value=False,
+        help="Parse every qualifying pricing table of a mail instead of the first one (rows get a table_index)",
+    )
+    batch_normalize = st.checkbox(
+        "Normalize per issuer in one batch",
+        value=False,
+        help="Normalize the tables of all emails together, once per issuer (rows get their message_id and sender)",
+    )
 
 
 start = st.button("Start Parsing")
 
 if start:
-    df_all = run_outlook(mailbox, [p for p in folder_path.split('/') if p], max_emails=n)
+    previous = st.session_state.get("df_all") if incremental else None
+    run_report: dict = {}
+    if source_kind == "Outlook Folder":
+        df_all = run_outlook(
+            mailbox,
+            [p for p in folder_path.split('/') if p],
+            max_emails=n,
+            incremental=incremental,
+            existing=previous,
+            server_filter=server_filter,
+            report=run_report,
+            cache=get_default_cache() if use_cache else None,
+            workers=int(workers),
+            engine=engine,
+            detect_unknown=detect_unknown,
+            preslicer=Preslicer(budget=int(budget_kb) * 1024) if preslice else None,
+            multi_table=multi_table,
+            batch_normalize=batch_normalize,
+        )
+    else:
+        df_all = run_directory(
+            archive_dir,
+            default_sender=default_sender,
+            issuer_override=issuer_override,
+            report=run_report,
+            cache=get_default_cache() if use_cache else None,
+            workers=int(workers),
+            engine=engine,
+            detect_unknown=detect_unknown,
+            preslicer=Preslicer(budget=int(budget_kb) * 1024) if preslice else None,
+            multi_table=multi_table,
+            batch_normalize=batch_normalize,
+        )
+    skipped = run_report.get("skipped") or {}
+    if skipped:
+        st.caption(
+            f"Skipped {sum(skipped.values())} emails: "
+            + ", ".join(f"{reason}: {cnt}" for reason, cnt in sorted(skipped.items()))
+        )
+    preslice_report = run_report.get("preslice")
+    if preslice_report is not None and not preslice_report.empty:
+        with st.expander(
+            f"Pre-slicing: {preslice_report['kb_in'].sum():,.0f} KB → {preslice_report['kb_out'].sum():,.0f} KB parsed"
+        ):
+            st.dataframe(preslice_report, use_container_width=True)
+    implementations = run_report.get("implementations")
+    if implementations is not None and not implementations.empty:
+        with st.expander("Extractor/normalizer implementation per issuer"):
+            st.dataframe(implementations, use_container_width=True)
+    detections = run_report.get("detected") or []
+    if detections:
+        with st.expander(f"{sum(d['used'] for d in detections)}/{len(detections)} unknown senders detected from headers"):
+            st.dataframe(pd.DataFrame(detections), use_container_width=True)
+    parse_errors = run_report.get("errors") or []
+    if parse_errors:
+        with st.expander(f"{len(parse_errors)} parse errors"):
+            st.dataframe(pd.DataFrame(parse_errors), use_container_width=True)
     if df_all is None or df_all.empty:
-        st.warning("No data parsed from Outlook.")
+        st.warning(f"No data parsed from {source_kind}.")
     else:
-        st.success(f"Parsed {len(df_all)} rows from Outlook.")
+        added = len(df_all) - (len(previous) if isinstance(previous, pd.DataFrame) else 0)
+        st.success(f"Parsed {added} new rows from {source_kind} ({len(df_all)} total).")
         st.session_state["df_all"] = df_all
 
 
@@ -375,9 +516,7 @@ if isinstance(df_all, pd.DataFrame) and not df_all.empty:
 
     # — Choose versions just below key components —
     # Build grouping based on selected key for preview/selection
-    df_view_for_versions = df_all.copy()
-    version_key_series = _make_key(df_view_for_versions, components)
-    df_view_for_versions = df_view_for_versions.assign(_version_key=version_key_series)
+    df_view_for_versions = df_all.assign(_version_key=_make_key(df_all, components))
 
     # Implicit sorting rule based on solve variable
     asc = False if solve_var == "coupon" else True
@@ -454,21 +593,21 @@ if isinstance(df_all, pd.DataFrame) and not df_all.empty:
         issuers_display = []
     issuer_sel = st.multiselect("Filter issuers (optional)", options=issuers_display, default=issuers_display)
 
-    df_view = df_all.copy()
+    df_view = df_all
     if issuer_sel:
-        df_view = df_view[df_view["issuer"].apply(lambda x: _abbr(x) in set(issuer_sel))]
+        df_view = df_view[df_view["issuer"].map(_abbr).isin(issuer_sel)]
 
     # Recompute key on filtered view for final output
     key_series = _make_key(df_view, components)
     df_view = df_view.assign(_version_key=key_series)
 
     if st.button("Confirm Selection"):
-        out = df_view[df_view["_version_key"].isin(selected_versions)].copy()
+        out = df_view[df_view["_version_key"].isin(selected_versions)]
         out = out.sort_values(by=[solve_var], ascending=asc)
         # Replace issuer names by uppercase abbreviations and display NA
         if "issuer" in out.columns:
             out["issuer"] = out["issuer"].apply(_abbr)
-        out_display = out.where(out.notna(), "NA")
+        out_display = display_frame(out)
         # Persist selection to survive reruns triggered by other buttons
         st.session_state["confirmed_out"] = out
         st.session_state["confirmed_out_display"] = out_display
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The app runs from the repository root (Normalizers.py, Extractors.py, app_core)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
@@ -0,0 +1,65 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app_core import cache
+from app_core.diagnostics import collect_errors
+
+
+def test_code_version_does_not_depend_on_imports():
+    cache.code_version.cache_clear()
+    before = cache.code_version()
+    import Normalizers  # noqa: F401
+    from app_core import pipeline  # noqa: F401
+    from app_core.issuers import get_issuer_registry
+
+    get_issuer_registry().normalizer("barclays")
+    cache.code_version.cache_clear()
+    assert cache.code_version() == before
+
+
+def test_every_parsing_module_is_versioned():
+    from app_core import pipeline  # noqa: F401
+
+    versioned = {p.resolve() for p in cache._VERSIONED_FILES}
+    assert all(p.exists() for p in versioned)
+    # Modules that never change what a parse returns
+    unversioned = {"cache", "diagnostics", "sources", "sync_state", "__init__"}
+    loaded = {
+        Path(mod.__file__).resolve()
+        for name, mod in list(sys.modules.items())
+        if name.startswith("app_core.") and "issuers" not in name and getattr(mod, "__file__", None)
+        and Path(mod.__file__).stem not in unversioned
+    }
+    assert loaded <= versioned
+
+
+@pytest.mark.skipif(not cache._safe_import_pyarrow(), reason="pyarrow not installed")
+@pytest.mark.parametrize(
+    "columns",
+    [["Product", "Coupon", "Product"], [0, 1, 2], ["Product", 1, ("Coupon", "p.a.")]],
+    ids=["duplicate", "integer", "mixed"],
+)
+def test_put_get_round_trips_column_labels(tmp_path, columns):
+    store = cache.ParseCache(tmp_path)
+    df = pd.DataFrame([["a", "7.5", np.nan], ["b", np.nan, "x"]], columns=columns)
+    with collect_errors() as errors:
+        store.put("ab12", df)
+        hit, got = store.get("ab12")
+    assert errors == []
+    assert hit
+    pd.testing.assert_frame_equal(got, df)
+
+
+@pytest.mark.skipif(not cache._safe_import_pyarrow(), reason="pyarrow not installed")
+def test_failed_put_is_recorded(tmp_path):
+    store = cache.ParseCache(tmp_path)
+    df = pd.DataFrame({"Product": [object()]})
+    with collect_errors() as errors:
+        store.put("ab12", df)
+    assert [stage for stage, _ in errors] == ["cache.put"]
+    assert store.get("ab12") == (False, None)
+    assert list(tmp_path.glob("*/*")) == []
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app_core import cleanup
+from app_core.cleanup import SCHEMA, apply_schema, universal_cleanup
+from benchmarks.bench_cleanup import (
+    ROUND_TRIP_CASES, _POOLS, assert_same, canonical_input, edge_cases, reference_cleanup, synthetic_frame,
+)
+
+# The reference is the former code as it was, deprecated pandas calls included
+pytestmark = pytest.mark.filterwarnings("ignore:Downcasting behavior:FutureWarning")
+
+
+@pytest.fixture(params=["per-value", "vectorized"])
+def path(request, monkeypatch):
+    """Run the test on both paths of the cleanup, whatever the frame size."""
+    monkeypatch.setattr(cleanup, "SMALL_FRAME_ROWS", 2**62 if request.param == "per-value" else -1)
+    return request.param
+
+
+def _reference(df, issuer):
+    return apply_schema(reference_cleanup(canonical_input(df, issuer), issuer))
+
+
+def _small_frames(count=60):
+    """Frames of a mail's size: a few rows, some of the columns, mixed cell types."""
+    rng = np.random.default_rng(7)
+    names = list(_POOLS)
+    for seed in range(count):
+        df = synthetic_frame(int(rng.integers(1, 40)), seed=seed, missing=rng.random() * 0.6, mixed=bool(seed % 2))
+        yield df[list(rng.choice(names, int(rng.integers(1, len(names))), replace=False))]
+
+
+@pytest.mark.parametrize("name, df, issuer", edge_cases(), ids=lambda v: v if isinstance(v, str) else "")
+def test_matches_the_row_wise_cleanup(path, name, df, issuer):
+    assert_same(universal_cleanup(df, issuer), _reference(df, issuer), exact=name not in ROUND_TRIP_CASES)
+
+
+def test_small_mixed_frames(path):
+    for df in _small_frames():
+        assert_same(universal_cleanup(df, "gs"), _reference(df, "gs"))
+
+
+@pytest.mark.parametrize("mixed", [False, True])
+def test_large_frames(path, mixed):
+    df = synthetic_frame(5000, seed=11, mixed=mixed)
+    assert_same(universal_cleanup(df, "gs"), _reference(df, "gs"))
+
+
+def test_frame_size_picks_the_path():
+    small, large = synthetic_frame(cleanup.SMALL_FRAME_ROWS), synthetic_frame(cleanup.SMALL_FRAME_ROWS + 1)
+    assert_same(universal_cleanup(small), _reference(small, None))
+    assert_same(universal_cleanup(large), _reference(large, None))
+
+
+def test_quotes_keep_their_two_decimal_rounding():
+    # float32 reads these as 5.0450000763, 98.7649993896, 9.8649997711
+    df = pd.DataFrame({"coupon": ["5.045%", "98.765", "9.865"], "strike": ["98.765", None, "1,5"]})
+    out = universal_cleanup(df)
+    assert [f"{v:.2f}" for v in out["coupon"]] == [f"{v:.2f}" for v in (5.045, 98.765, 9.865)]
+    assert out["strike"].tolist()[::2] == [98.765, 1.5]
+    assert all(out[c].dtype == SCHEMA[c] == "float64" for c in ("coupon", "strike", "barrier", "reoffer", "autocall_barrier"))
@@ -0,0 +1,65 @@
+import pandas as pd
+import pytest
+
+import Extractors
+from app_core.email_integration import parse_email_html
+from app_core.extractors import extract_for_issuer
+from app_core.fast_extractors import TABLE_SPECS, extract_fast
+from app_core.html_utils import as_soup
+from app_core.tables import HAVE_LXML, scan_soup, scan_tables
+
+
+GRID = """
+<table>
+  <tr><th>Product</th><th>Product Type</th><th>Currency</th><th>Tenor (m)</th><th>Coupon p.a. (%)</th>
+      <th>Exit Rate</th></tr>
+  <tr><td>Product 7,5 (coupon p.a.)</td><td>BRC</td><td>EUR</td><td>12</td><td>7.5</td><td>100</td></tr>
+  <tr><td colspan="2">Product 6.25 (Coupon p.a.)</td><td>USD</td><td rowspan="2">6</td><td>6.25</td>
+      <td>95</td></tr>
+  <tr><td>Phoenix</td><td>ATP</td><td>CHF</td><td>5</td><td>98</td></tr>
+</table>
+"""
+
+# Metadata, a table before the grid, a layout table around it, a quoted reply
+MAIL = f"""
+<html><body>
+<p>TraceId: AB12 Pricing Reference IDs: PR9 Ref : R-1</p>
+<table><tr><td>Dear client</td></tr></table>
+<table><tr><td>{GRID}</td></tr></table>
+<blockquote><table><tr><th>Product</th></tr><tr><td>old</td></tr></table></blockquote>
+</body></html>
+"""
+
+
+@pytest.mark.parametrize("html", [GRID, MAIL], ids=["grid", "mail"])
+@pytest.mark.parametrize("issuer", sorted(TABLE_SPECS))
+def test_extractor_follows_its_table_spec(issuer, html):
+    df = getattr(Extractors, f"extract_{issuer}")(parse_email_html(html))
+    if html is GRID:
+        # td-only specs (barclays, lukb) take the first data row as header
+        assert len(df) == (2 if TABLE_SPECS[issuer].cells == ("td",) else 3)
+    if not HAVE_LXML:
+        pytest.skip("lxml not installed")
+    fast = extract_fast(html, issuer, clean=True)
+    if df is None:
+        assert fast is None
+    else:
+        pd.testing.assert_frame_equal(df, fast)
+
+
+def test_spec_post_steps_run_on_bs4():
+    df = extract_for_issuer(MAIL, "barclays")
+    assert df[["trace_id", "pricing_ref_id", "ref"]].iloc[0].tolist() == ["AB12", "PR9", "R-1"]
+    df = extract_for_issuer(MAIL, "swissquote")
+    assert df["Coupon Rate (%)"].tolist() == ["7.5", "6.25", None]
+
+
+@pytest.mark.skipif(not HAVE_LXML, reason="lxml not installed")
+def test_soup_tables_match_streamed_tables():
+    streamed = scan_tables(MAIL, skip_blockquotes=False).tables
+    parsed = scan_soup(as_soup(MAIL)).tables
+    assert len(parsed) == len(streamed)
+    for a, b in zip(parsed, streamed):
+        assert (a.index, a.has_nested, a.parent and a.parent.index) == (b.index, b.has_nested, b.parent and b.parent.index)
+        assert [r.spans() for r in a.rows] == [r.spans() for r in b.rows]
+        assert [(c.tag, c.text) for c in a.cells] == [(c.tag, c.text) for c in b.cells]
@@ -0,0 +1,35 @@
+from importlib import import_module
+
+import pandas as pd
+import pytest
+
+import Normalizers
+from app_core import headers
+from app_core.issuers import get_issuer_registry
+
+
+def test_every_legacy_normalizer_has_its_table():
+    issuers = {name[len("normalize_"):] for name in dir(Normalizers) if name.startswith("normalize_")}
+    assert issuers == set(Normalizers.HEADER_TABLES)
+    assert issuers <= set(headers.rename_tables())
+
+
+def test_local_tables_merge_under_legacy():
+    tables = headers.rename_tables()
+    for name in ("bofa", "citi", "natixis", "socgen"):
+        local = import_module(f"app_core.issuers.{name}").HEADERS
+        legacy = headers._entries(Normalizers.HEADER_TABLES[name])
+        for variant, canonical in local.items():
+            expected = legacy[variant][0] if variant in legacy else canonical
+            assert tables[name][variant] == expected
+
+
+def test_normalizer_renames_through_its_table():
+    df = pd.DataFrame({"ccy": ["EUR"], "Coupon\xa0p.a.  (%)": ["5%"], "Strike": ["100"]})
+    out = get_issuer_registry().normalizer("citi")(df)
+    assert {"currency", "coupon", "strike"} <= set(out.columns)
+
+
+def test_bad_table_entry_is_an_error():
+    with pytest.raises(TypeError):
+        headers._entries({"coupon": 5})
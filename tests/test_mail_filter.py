@@ -0,0 +1,114 @@
+import time
+from datetime import datetime
+
+import pytest
+
+from app_core.email_integration import (
+    DASL_DATE_RECEIVED,
+    DASL_FROM_EMAIL,
+    PR_MESSAGE_CLASS,
+    build_mail_filter,
+    newest_mail_items,
+)
+
+
+@pytest.fixture
+def zurich(monkeypatch):
+    """Naive datetimes are local time: pin the local zone (CET/CEST)."""
+    if not hasattr(time, "tzset"):
+        pytest.skip("time.tzset is not available on this platform")
+    monkeypatch.setenv("TZ", "Europe/Zurich")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_filter_converts_since_to_utc(zurich):
+    winter = build_mail_filter(since=datetime(2025, 1, 15, 9, 5), message_class=None)
+    summer = build_mail_filter(since=datetime(2025, 7, 15, 13, 30), message_class=None)
+    assert winter == f"@SQL=\"{DASL_DATE_RECEIVED}\" >= '01/15/2025 08:05 AM'"
+    assert summer == f"@SQL=\"{DASL_DATE_RECEIVED}\" >= '07/15/2025 11:30 AM'"
+
+
+def test_filter_clauses_and_quoting():
+    flt = build_mail_filter(sender_domains=["gs.com", "", "o'brien.com"])
+    assert flt == (
+        f"@SQL=\"{PR_MESSAGE_CLASS}\" LIKE 'IPM.Note%'"
+        f" AND (\"{DASL_FROM_EMAIL}\" LIKE '%gs.com%' OR \"{DASL_FROM_EMAIL}\" LIKE '%o''brien.com%')"
+    )
+    assert build_mail_filter(message_class=None) == ""
+
+
+class _Item:
+    def __init__(self, name: str, received: datetime, cls: int = 43):
+        self.name, self.ReceivedTime, self.Class = name, received, cls
+
+
+class _Items:
+    def __init__(self, items, restrict_error: bool = False):
+        self.items, self.restrict_error, self.filters = list(items), restrict_error, []
+
+    def Restrict(self, flt):
+        self.filters.append(flt)
+        if self.restrict_error:
+            raise RuntimeError("Cannot parse condition")
+        # What Outlook would return for the date window of the tests below
+        return _Items([i for i in self.items if i.name != "old" and i.Class == 43])
+
+    def Sort(self, key, descending):
+        assert key == "[ReceivedTime]"
+        self.items.sort(key=lambda i: i.ReceivedTime, reverse=descending)
+
+    def GetFirst(self):
+        self._pos = 0
+        return self.GetNext()
+
+    def GetNext(self):
+        if self._pos >= len(self.items):
+            return None
+        self._pos += 1
+        return self.items[self._pos - 1]
+
+
+class _Folder:
+    def __init__(self, items: _Items):
+        self._items = items
+
+    @property
+    def Items(self):
+        return self._items
+
+
+def _mail():
+    return [
+        _Item("new", datetime(2025, 1, 15, 10, 0)),
+        _Item("meeting", datetime(2025, 1, 15, 9, 30), cls=26),
+        _Item("edge", datetime(2025, 1, 15, 9, 0)),
+        _Item("old", datetime(2025, 1, 14, 17, 0)),
+    ]
+
+
+def test_restrict_pushes_the_filter_to_outlook():
+    items = _Items(_mail())
+    since = datetime(2025, 1, 15, 9, 0)
+    out = newest_mail_items(_Folder(items), n=10, since=since, restrict=True, sender_domains=["gs.com"])
+    assert [i.name for i in out] == ["new", "edge"]
+    assert items.filters == [build_mail_filter(since=since, sender_domains=["gs.com"])]
+
+
+def test_restrict_error_falls_back_to_the_item_walk():
+    items = _Items(_mail(), restrict_error=True)
+    out = newest_mail_items(_Folder(items), n=10, since=datetime(2025, 1, 15, 9, 0), restrict=True)
+    # Client-side checks: no meeting items, stop before `since`, keep items received at it
+    assert len(items.filters) == 1
+    assert [i.name for i in out] == ["new", "edge"]
+    assert [i.name for i in newest_mail_items(_Folder(_Items(_mail(), True)), n=1, restrict=True)] == ["new"]
+
+
+def test_oldest_first_walk_skips_mail_before_since():
+    since = datetime(2025, 1, 15, 9, 0)
+    out = newest_mail_items(_Folder(_Items(_mail())), n=10, since=since, oldest_first=True)
+    assert [i.name for i in out] == ["edge", "new"]
+    out = newest_mail_items(_Folder(_Items(_mail())), n=1, since=since, oldest_first=True)
+    assert [i.name for i in out] == ["edge"]
@@ -0,0 +1,46 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import Normalizers
+from app_core.normalizers import normalize
+from benchmarks.bench_normalizers import LEGACY_STEPS, synthetic_steps
+
+# Raw extractor tables (cells as the extractors return them, "NaN" missing)
+FIXTURES = Path(__file__).parent / "fixtures" / "normalizers"
+ISSUERS = sorted(p.stem for p in FIXTURES.glob("*.csv"))
+
+
+def _raw(issuer):
+    return pd.read_csv(FIXTURES / f"{issuer}.csv", dtype=str, keep_default_na=False, na_values=["NaN"])
+
+
+def test_every_vectorized_step_has_a_fixture():
+    assert set(ISSUERS) == set(synthetic_steps(1))
+
+
+@pytest.mark.parametrize("issuer", ISSUERS)
+def test_normalize_matches_the_row_wise_steps(issuer, monkeypatch):
+    raw = _raw(issuer)
+    new = normalize(raw, issuer)
+    for name, ref in LEGACY_STEPS.items():
+        monkeypatch.setattr(Normalizers, name, ref)
+    old = normalize(raw, issuer)
+    assert new is not None and len(new) == len(raw)
+    pd.testing.assert_frame_equal(new, old, check_exact=True)
+
+
+@pytest.mark.parametrize(
+    "issuer, step, ref, new, form",
+    [(i, s, *fns) for i, steps in synthetic_steps(500).items() for s, fns in steps.items()],
+    ids=lambda v: v if isinstance(v, str) else "",
+)
+def test_step_matches_the_row_wise_original(issuer, step, ref, new, form):
+    a, b = ref(), new()
+    if form is not None:
+        a, b = form(a), form(b)
+    if isinstance(a, pd.DataFrame):
+        pd.testing.assert_frame_equal(b, a, check_exact=True)
+    else:
+        pd.testing.assert_series_equal(b, a, check_exact=True, check_names=False)
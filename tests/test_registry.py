@@ -0,0 +1,44 @@
+import sys
+
+import pytest
+
+from app_core import issuers
+from app_core.issuers import LOCAL, IssuerRegistry
+
+
+@pytest.fixture
+def issuer_dir(tmp_path, monkeypatch):
+    """A directory of local issuer modules on the package path, unloaded afterwards."""
+    monkeypatch.setattr(issuers, "__path__", [*issuers.__path__, str(tmp_path)])
+    monkeypatch.setattr(sys, "dont_write_bytecode", True)
+    yield tmp_path
+    for name in [n for n in sys.modules if n.startswith("app_core.issuers.zz")]:
+        del sys.modules[name]
+
+
+def _write(directory, name, version):
+    (directory / f"{name}.py").write_text(f"def normalize(df):\n    return {version!r}\n", encoding="utf-8")
+
+
+def test_invalidate_reloads_an_edited_issuer(issuer_dir):
+    registry = IssuerRegistry()
+    _write(issuer_dir, "zzedited", "first")
+    assert registry.resolve("normalizer", "zzedited")[1] == LOCAL
+    assert registry.normalizer("zzedited")(None) == "first"
+
+    _write(issuer_dir, "zzedited", "second, edited")
+    assert registry.normalizer("zzedited")(None) == "first"
+    registry.invalidate("zzedited")
+    assert registry.normalizer("zzedited")(None) == "second, edited"
+
+
+def test_invalidate_finds_an_added_issuer(issuer_dir):
+    registry = IssuerRegistry()
+    assert registry.normalizer("zzadded") is None
+    _write(issuer_dir, "zzadded", "new")
+    registry.invalidate("zzadded")
+    assert registry.normalizer("zzadded")(None) == "new"
+
+    (issuer_dir / "zzadded.py").unlink()
+    registry.invalidate()
+    assert registry.normalizer("zzadded") is None
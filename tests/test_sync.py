@@ -0,0 +1,103 @@
+from datetime import datetime
+
+import pytest
+
+from app_core import pipeline, sources
+from app_core.email_integration import MailHeader
+from app_core.sources import OutlookSource
+from app_core.sync_state import SyncState
+
+
+def _header(i: int, sender: str = "desk@gs.com") -> MailHeader:
+    return MailHeader(
+        entry_id=f"E{i}", sender=sender, subject=f"m{i}",
+        received=datetime(2025, 1, 1, 12, i), internet_id=f"<m{i}@x>",
+    )
+
+
+class _Body:
+    def __init__(self, html: str):
+        self.HTMLBody = html
+
+
+@pytest.fixture
+def outlook(monkeypatch, tmp_path):
+    """OutlookSource over fake headers; bodies: "fetch" fails to load, "parse" fails to parse."""
+    headers = [_header(5), _header(4), _header(3), _header(2, sender="someone@else.com"), _header(1)]
+    bodies = {"E5": "<p>ok</p>", "E4": "fetch", "E3": "parse", "E2": "<p>ok</p>", "E1": "<p>ok</p>"}
+
+    def load(folder, h):
+        if bodies[h.entry_id] == "fetch":
+            raise OSError("item not available")
+        return _Body(bodies[h.entry_id])
+
+    def run_on_html(html, *args, **kwargs):
+        if html == "parse":
+            raise ValueError("bad table")
+        return None
+
+    monkeypatch.setattr(sources, "mail_headers", lambda folder, **kw: list(headers))
+    monkeypatch.setattr(sources, "load_mail_item", load)
+    monkeypatch.setattr(pipeline, "run_on_html", run_on_html)
+
+    state = SyncState(tmp_path / "state.json")
+    state.folders["box/inbox"] = {"last_received": datetime(2025, 1, 1, 11, 0).isoformat(), "entry_ids": {}}
+    return OutlookSource(None, "box/inbox", state=state, merge=True), state
+
+
+def test_only_processed_messages_are_seen(outlook):
+    source, state = outlook
+    report: dict = {}
+    pipeline.run_source(source, report=report)
+
+    assert [state.is_seen("box/inbox", f"E{i}", None) for i in (5, 4, 3, 2, 1)] == [True, False, False, True, True]
+    assert {e["stage"] for e in report["errors"]} == {"fetch", "parse"}
+    # The watermark stops at the oldest failed message, so the next sync fetches it again
+    assert SyncState.load(state.path).watermark("box/inbox") == datetime(2025, 1, 1, 12, 3)
+
+
+def test_nothing_is_seen_before_it_is_parsed(outlook, monkeypatch):
+    source, state = outlook
+
+    def parse_batch(payloads, workers):
+        assert not any(state.is_seen("box/inbox", f"E{i}", None) for i in range(6))
+        raise RuntimeError("worker died")
+
+    monkeypatch.setattr(pipeline, "_parse_batch", parse_batch)
+    with pytest.raises(RuntimeError):
+        pipeline.run_source(source)
+    assert not any(state.is_seen("box/inbox", f"E{i}", None) for i in (5, 3, 1))
+    assert state.watermark("box/inbox") == datetime(2025, 1, 1, 11, 0)
+
+
+def test_every_mail_since_the_watermark_is_processed(monkeypatch, tmp_path):
+    """More mail than one fetch window arrives between two syncs."""
+    inbox = [_header(i) for i in range(1, 9)]
+    parsed = []
+
+    def mail_headers(folder, n, since=None, oldest_first=False, **kw):
+        rows = sorted((h for h in inbox if since is None or h.received >= since), key=lambda h: h.received)
+        return (rows if oldest_first else rows[::-1])[:n]
+
+    def run_on_html(html, *args, **kwargs):
+        parsed.append(html)
+        return None
+
+    monkeypatch.setattr(sources, "mail_headers", mail_headers)
+    monkeypatch.setattr(sources, "load_mail_item", lambda folder, h: _Body(h.entry_id))
+    monkeypatch.setattr(pipeline, "run_on_html", run_on_html)
+
+    def sync():
+        state = SyncState.load(tmp_path / "state.json")
+        pipeline.run_source(OutlookSource(None, "box/inbox", max_emails=3, state=state, merge=state.folders != {}))
+
+    sync()  # first run: the newest window only, which sets the watermark
+    assert parsed == ["E8", "E7", "E6"]
+    inbox += [_header(i) for i in range(9, 17)]
+    parsed.clear()
+    sync()
+    assert parsed == [f"E{i}" for i in range(9, 17)]
+    inbox += [_header(i) for i in range(17, 21)]
+    parsed.clear()
+    sync()
+    assert parsed == [f"E{i}" for i in range(17, 21)]